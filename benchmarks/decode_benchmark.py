@@ -0,0 +1,114 @@
+"""Parse throughput of list_ships and list_waypoints_in_system pages, per JSON backend and into typed records
+
+Run with ``python -m benchmarks.decode_benchmark`` from the repository root.
+"""
+import json
+import timeit
+from typing import Callable
+
+from spacemerchants.models.ship import Ship, ShipPage
+from spacemerchants.models.waypoint import Waypoint, WaypointPage
+from spacetradercore.decoding import JSON_BACKEND, Decoder, _record_builder, record_decoder
+
+PAGE_SIZE = 20
+ROUNDS = 2000
+
+REQUIREMENTS = {"power": 1, "crew": 0, "slots": 1}
+
+
+def ship(index: int) -> dict:
+    part = {"symbol": "PART", "name": "Part", "description": "A part of the ship.", "condition": 100,
+            "requirements": REQUIREMENTS}
+    return {
+        "symbol": f"AGENT-{index}",
+        "registration": {"name": f"AGENT-{index}", "factionSymbol": "COSMIC", "role": "COMMAND"},
+        "nav": {
+            "systemSymbol": "X1-A", "waypointSymbol": "X1-A-1", "status": "DOCKED", "flightMode": "CRUISE",
+            "route": {
+                "origin": {"symbol": "X1-A-1", "type": "PLANET", "systemSymbol": "X1-A", "x": 1, "y": 2},
+                "destination": {"symbol": "X1-A-1", "type": "PLANET", "systemSymbol": "X1-A", "x": 1, "y": 2},
+                "departureTime": "2024-01-28T18:00:00.000Z", "arrival": "2024-01-28T18:00:00.000Z",
+            },
+        },
+        "crew": {"current": 57, "required": 57, "capacity": 80, "rotation": "STRICT", "morale": 100, "wages": 0},
+        "frame": {**part, "moduleSlots": 8, "mountingPoints": 5, "fuelCapacity": 400},
+        "reactor": {**part, "powerOutput": 40},
+        "engine": {**part, "speed": 30},
+        "modules": [{**part, "capacity": 30} for _ in range(5)],
+        "mounts": [{**part, "strength": 10} for _ in range(3)],
+        "cargo": {"capacity": 60, "units": 5,
+                  "inventory": [{"symbol": "IRON_ORE", "name": "Iron Ore", "description": "Ore.", "units": 5}]},
+        "fuel": {"current": 400, "capacity": 400, "consumed": {"amount": 0, "timestamp": "2024-01-28T18:00:00.000Z"}},
+    }
+
+
+def waypoint(index: int) -> dict:
+    trait = {"symbol": "MARKETPLACE", "name": "Marketplace", "description": "A thriving center of commerce."}
+    return {
+        "symbol": f"X1-A-{index}", "type": "PLANET", "systemSymbol": "X1-A", "x": index, "y": -index,
+        "orbitals": [{"symbol": f"X1-A-{index}M"}], "traits": [trait, {**trait, "symbol": "ROCKY"}],
+        "modifiers": [], "isUnderConstruction": False, "faction": {"symbol": "COSMIC"},
+        "chart": {"submittedBy": "COSMIC", "submittedOn": "2024-01-28T18:00:00.000Z"},
+    }
+
+
+def page(items: list[dict]) -> bytes:
+    return json.dumps({"data": items, "meta": {"total": len(items), "page": 1, "limit": PAGE_SIZE}}).encode()
+
+
+def backends() -> dict[str, Decoder]:
+    found: dict[str, Decoder] = {"json": json.loads}
+    try:
+        import orjson
+
+        found["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        found["msgspec"] = msgspec.json.Decoder().decode
+    except ImportError:
+        pass
+    return found
+
+
+def measure(name: str, run: Callable[[], object]) -> None:
+    seconds = timeit.timeit(run, number=ROUNDS)
+    print(f"{name:<64} {ROUNDS * PAGE_SIZE / seconds:>12,.0f} items/s")
+
+
+def main() -> None:
+    ships = page([ship(index) for index in range(PAGE_SIZE)])
+    waypoints = page([waypoint(index) for index in range(PAGE_SIZE)])
+    for name, decode in backends().items():
+        measure(f"{name} | list_ships decode", lambda: decode(ships))
+        measure(f"{name} | list_ships decode + hydrate",
+                lambda: [Ship.from_dict(None, data) for data in decode(ships)["data"]])
+        measure(f"{name} | list_ships decode + lazy hydrate",
+                lambda: [Ship.from_dict(None, data, lazy=True) for data in decode(ships)["data"]])
+        measure(f"{name} | list_waypoints_in_system decode", lambda: decode(waypoints))
+        measure(f"{name} | list_waypoints_in_system decode + hydrate",
+                lambda: [Waypoint.from_dict(None, {**data, "system": "X1-A"}) for data in decode(waypoints)["data"]])
+        measure(f"{name} | list_waypoints_in_system decode + lazy hydrate",
+                lambda: [Waypoint.from_dict(None, {**data, "system": "X1-A"}, lazy=True)
+                         for data in decode(waypoints)["data"]])
+
+    # pages decoded straight into records, by msgspec when installed, and built from stdlib dicts for comparison
+    typed = {JSON_BACKEND: (record_decoder(ShipPage), record_decoder(WaypointPage)),
+             "json": (lambda raw: _record_builder(ShipPage)(json.loads(raw)),
+                      lambda raw: _record_builder(WaypointPage)(json.loads(raw)))}
+    for name, (decode_ships, decode_waypoints) in typed.items():
+        measure(f"{name} records | list_ships decode", lambda: decode_ships(ships))
+        measure(f"{name} records | list_ships decode + hydrate",
+                lambda: [Ship.from_record(None, payload) for payload in decode_ships(ships).data])
+        measure(f"{name} records | list_ships decode + lazy hydrate",
+                lambda: [Ship.from_record(None, payload, lazy=True) for payload in decode_ships(ships).data])
+        measure(f"{name} records | list_waypoints_in_system decode", lambda: decode_waypoints(waypoints))
+        measure(f"{name} records | list_waypoints_in_system decode + lazy hydrate",
+                lambda: [Waypoint.from_record(None, payload, lazy=True)
+                         for payload in decode_waypoints(waypoints).data])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Estimate time of a fleet by destination travel matrix, 50 ships against 200 waypoints
+
+Run with ``python -m benchmarks.estimator_benchmark`` from the repository root.
+"""
+import random
+import timeit
+from datetime import datetime, timezone
+
+from benchmarks.decode_benchmark import ship
+from spacemerchants.models.estimator import TravelEstimator
+from spacemerchants.models.ship import Ship
+from spacemerchants.models.waypoint_table import WaypointTable
+
+SHIPS = 50
+WAYPOINTS = 200
+ROUNDS = 100
+
+
+def main() -> None:
+    generator = random.Random(5)
+    table = WaypointTable(
+        {"symbol": f"X1-A-{index}", "systemSymbol": "X1-A", "type": "PLANET",
+         "x": generator.uniform(-800, 800), "y": generator.uniform(-800, 800)}
+        for index in range(WAYPOINTS)
+    )
+    ships = []
+    for index in range(SHIPS):
+        data = ship(index)
+        data["nav"] = {**data["nav"], "waypointSymbol": f"X1-A-{index}"}
+        ships.append(Ship.from_dict(None, data))
+    estimator = TravelEstimator(table)
+    destinations = table.symbols.tolist()
+    now = datetime.now(timezone.utc)
+    seconds = timeit.timeit(lambda: estimator.estimate(ships, destinations, now=now), number=ROUNDS) / ROUNDS
+    print(f"{'TravelEstimator.estimate':<56} {seconds / (SHIPS * WAYPOINTS) * 1e9:>12,.0f} ns/pair")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Planning time of in-system routes over a system of 100 waypoints, one in five selling fuel
+
+Run with ``python -m benchmarks.route_benchmark`` from the repository root.
+"""
+import timeit
+
+import numpy as np
+
+from spacemerchants.models.route import RoutePlanner
+
+WAYPOINTS = 100
+ROUNDS = 200
+
+
+def main() -> None:
+    generator = np.random.default_rng(3)
+    symbols = [f"X1-A-{index}" for index in range(WAYPOINTS)]
+    planner = RoutePlanner(symbols, generator.uniform(-400, 400, WAYPOINTS), generator.uniform(-400, 400, WAYPOINTS),
+                           fuel_stations=symbols[::5])
+    # the first plan fills the station hop cache, as it would for the rest of a fleet
+    planner.plan(symbols[1], symbols[2], speed=30, fuel=100, capacity=400)
+    seconds = timeit.timeit(lambda: planner.plan(symbols[1], symbols[-1], speed=30, fuel=100, capacity=400),
+                            number=ROUNDS) / ROUNDS
+    print(f"{'RoutePlanner.plan':<56} {seconds * 1e6:>12,.0f} us/route")
+
+
+if __name__ == "__main__":
+    main()
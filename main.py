@@ -2,6 +2,7 @@ import asyncio
 from spacemerchants.models.system import System
 from spacemerchants.spacemerchant import SpaceMerchantCore
 from spacemerchants.spacemerchant import SpaceMerchants
+from spacetradercore.symbols import system_symbol
 
 from loguru import logger
 
@@ -11,7 +12,7 @@ async def tutorial1():
     async with SpaceMerchants(SPACETRADER_KEY) as sm:
         await sm.status()
         agent = await sm.me()
-        system = await System.get(sm.requester, agent.headquarters[:-3])
+        system = await System.get(sm.requester, system_symbol(agent.headquarters))
         print(system)
         # waypoints = await system.waypoints()
         # for waypoint in waypoints:
@@ -1,14 +1,18 @@
 import asyncio
 from datetime import datetime
 from pprint import pprint
+from typing import AsyncIterator
 
 from loguru import logger
 
-from spacemerchants.models.ship import Ship
+from spacemerchants.models.identity import canonical
+from spacemerchants.models.ship import Ship, ShipPage
 from spacetradercore.spacemerchantcore import SpaceMerchantCore
 
 
 class Term:
+    __slots__ = ("deadline", "amount_upfront", "amount_due", "deliver")
+
     deadline: datetime
     amount_upfront: int
     amount_due: int
@@ -25,6 +29,19 @@ class Term:
 
 
 class Contract:
+    __slots__ = (
+        "id",
+        "faction",
+        "type",
+        "term",
+        "accepted",
+        "fulfilled",
+        "expiration",
+        "deadline_to_accept",
+        "_requester",
+        "__weakref__",
+    )
+
     id: str
     faction: str
     type: str
@@ -37,7 +54,8 @@ class Contract:
 
     @classmethod
     def from_dict(cls, requester: SpaceMerchantCore, data: dict) -> "Contract":
-        contract = cls()
+        """Create the contract of a payload, or refresh the live contract with the same id"""
+        contract = canonical(requester, cls, data["id"])
         contract._requester = requester
         contract.id = data["id"]
         contract.faction = data["faction"]
@@ -73,11 +91,13 @@ class Agent:
     faction: str
     ship_count: int
     _requester: SpaceMerchantCore
-    _ships: list[Ship] = []
-    _contracts: list[Contract] = []
+    _ships: list[Ship]
+    _contracts: list[Contract]
 
     def __init__(self, requester: SpaceMerchantCore):
         self._requester = requester
+        self._ships = []
+        self._contracts = []
 
     @classmethod
     async def me(cls):
@@ -86,33 +106,33 @@ class Agent:
 
     @classmethod
     async def from_dict(cls, requester: SpaceMerchantCore, data: dict):
-        """Create a new Agent object from a dictionary"""
-        agent = cls(requester)
-        agent.account_id = data.get("account_id", "")
-        agent.symbol = data.get("symbol", "")
-        agent.headquarters = data.get("headquarters", "")
-        agent.credits = data.get("credits", 0)
-        agent.faction = data.get("faction", "")
-        agent.ship_count = data.get("shipCount", 0)
+        """Create the agent of a dictionary, or refresh the live agent with the same symbol"""
+        agent = canonical(requester, cls, data.get("symbol", ""), requester)
+        agent.update(data)
         return agent
 
-    async def get_ships(self, force: bool = False):
-        """Get the details of the current user's ships"""
+    def update(self, data: dict) -> None:
+        """Refresh the agent in place from a full agent payload or the agent fragment of an action response"""
+        self.account_id = data.get("accountId", "")
+        self.symbol = data.get("symbol", "")
+        self.headquarters = data.get("headquarters", "")
+        self.credits = data.get("credits", 0)
+        self.faction = data.get("startingFaction", "")
+        self.ship_count = data.get("shipCount", 0)
+        logger.debug(f"Agent | update | {self.symbol =:} | {self.credits =:}")
+
+    async def get_ships(self, force: bool = False, lazy: bool = False):
+        """Get the details of the current user's ships
+
+        Args:
+            force (bool, optional): Force a refresh of the ships. Defaults to False.
+            lazy (bool, optional): Build the components of each ship on first access. Defaults to False.
+        """
         if not force and self._ships:
             return self._ships
-        limit = 20
-        page = 1
-        while True:
-            logger.debug(f"Agent | get_ships | {limit =:} | {page =:}")
-            response = await self._requester.list_ships(limit=limit, page=page)
-            logger.debug(f"Agent | get_ships | {response =:}")
-            ships = response.get("data", [])
-            meta = response.get("meta", {})
-            self._ships.extend([Ship.from_dict(self._requester, ship) for ship in ships])
-            logger.debug(f"Agent | get_ships | {len(self._ships) =:} | {meta =:}")
-            if meta.get("total") == len(self._ships):
-                break
-            page += 1
+        ships = await self._requester.paginate(self._requester.list_ships, model=ShipPage)
+        logger.debug(f"Agent | get_ships | {len(ships) =:}")
+        self._ships = [Ship.from_record(self._requester, ship, lazy=lazy) for ship in ships]
         return self._ships
 
     async def contracts(self, force: bool = False):
@@ -123,19 +143,25 @@ class Agent:
         """
         if not force and self._contracts:
             return self._contracts
-        limit = 20
-        page = 1
-        while True:
-            response = await self._requester.list_contracts(limit=limit, page=page)
-            logger.debug(f"Agent | contracts | {response =:}")
-            contracts = response.get("data", [])
-            meta = response.get("meta", {})
-            self._contracts.extend([Contract.from_dict(self._requester, contract) for contract in contracts])
-            if meta.get("total") == len(self._contracts):
-                break
-            page += 1
+        contracts = await self._requester.paginate(self._requester.list_contracts)
+        logger.debug(f"Agent | contracts | {len(contracts) =:}")
+        self._contracts = [Contract.from_dict(self._requester, contract) for contract in contracts]
         return self._contracts
 
+    async def iter_ships(self, lazy: bool = False) -> AsyncIterator[Ship]:
+        """Stream the current user's ships, the next page downloads while earlier ships are handled
+
+        Args:
+            lazy (bool, optional): Build the components of each ship on first access. Defaults to False.
+        """
+        async for ship in self._requester.iter_ships(model=ShipPage):
+            yield Ship.from_record(self._requester, ship, lazy=lazy)
+
+    async def iter_contracts(self) -> AsyncIterator[Contract]:
+        """Stream the contracts of the current user"""
+        async for contract in self._requester.iter_contracts():
+            yield Contract.from_dict(self._requester, contract)
+
     def __str__(self):
         return f"Agent({self.symbol}, {self.faction}, {self.credits}, {self.ship_count}, {self.headquarters})"
 
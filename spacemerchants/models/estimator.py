@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from spacemerchants.models.route import fuel_costs, travel_times
+from spacemerchants.models.ship import Navigation, Ship
+from spacemerchants.models.waypoint_table import WaypointTable
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+
+
+class FleetEstimate(NamedTuple):
+    """Travel time and fuel of every ship to every destination, one row per ship"""
+
+    ships: list[str]
+    destinations: list[str]
+    seconds: np.ndarray  # from now, including the rest of a navigation in progress
+    fuel: np.ndarray
+    reachable: np.ndarray  # the fuel in the tank covers the trip
+
+    def fastest(self) -> np.ndarray:
+        """The row of the ship arriving first at each destination, -1 where no ship can reach it"""
+        seconds = np.where(self.reachable, self.seconds, np.inf)
+        rows = np.argmin(seconds, axis=0)
+        return np.where(np.isfinite(seconds[rows, np.arange(len(self.destinations))]), rows, -1)
+
+
+def estimate_matrix(
+    origin_x: np.ndarray,
+    origin_y: np.ndarray,
+    speed: np.ndarray,
+    destination_x: np.ndarray,
+    destination_y: np.ndarray,
+    flight_mode: str = "CRUISE",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Seconds and fuel of a direct navigation from every origin to every destination
+
+    Args:
+        origin_x (np.ndarray): The x coordinates of the ships
+        origin_y (np.ndarray): The y coordinates of the ships
+        speed (np.ndarray): The engine speed of each ship
+        destination_x (np.ndarray): The x coordinates of the destinations
+        destination_y (np.ndarray): The y coordinates of the destinations
+        flight_mode (str): The flight mode of the navigations
+
+    Returns:
+        The seconds and the fuel, both with a row per origin and a column per destination
+    """
+    distance = np.hypot(origin_x[:, None] - destination_x[None, :], origin_y[:, None] - destination_y[None, :])
+    return travel_times(distance, flight_mode, speed[:, None]), fuel_costs(distance, flight_mode)
+
+
+class TravelEstimator:
+    """Estimates navigations with the game's travel time and fuel formulas, without asking the server
+
+    Ships are placed at their waypoint, or at the end of the navigation they are on, whose remaining time is
+    added to their estimates. Remaining time is measured on the server's clock of the core, given or the ships'
+    own. A whole fleet against every destination is computed in one NumPy call.
+
+    Args:
+        table (WaypointTable): The waypoints ships are at and go to, of a single system
+        requester (SpaceMerchantCore): The core whose server clock estimates start from
+    """
+
+    def __init__(self, table: WaypointTable, requester: SpaceMerchantCore | None = None) -> None:
+        self.table = table
+        self.requester = requester
+
+    def _now(self, ships: list[Ship]) -> datetime:
+        """The current time on the server, the local time when no core is known"""
+        requester = self.requester or next((ship._requester for ship in ships if ship._requester), None)
+        return requester.clock.now() if requester is not None else datetime.now(timezone.utc)
+
+    def _positions(self, symbols: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        rows = self.table.rows(symbols)
+        return self.table.x[rows], self.table.y[rows]
+
+    def estimate(
+        self,
+        ships: Iterable[Ship],
+        destinations: Iterable[str],
+        flight_mode: str = "CRUISE",
+        now: datetime | None = None,
+    ) -> FleetEstimate:
+        """Travel time and fuel of every ship to every destination
+
+        Args:
+            ships (Iterable[Ship]): The ships, all in the system of the table
+            destinations (Iterable[str]): The waypoints to go to
+            flight_mode (str): The flight mode of the navigations
+            now (datetime): The time the estimate starts at, the current server time by default
+        """
+        ships, destinations = list(ships), list(destinations)
+        now = now or self._now(ships)
+        # a ship on its way can only set off once it has arrived
+        remaining = np.array([
+            max(0.0, (ship.navigation.arrival_time - now).total_seconds())
+            if ship.navigation.status == "IN_TRANSIT" else 0.0
+            for ship in ships
+        ])
+        origin_x, origin_y = self._positions([ship.navigation.waypoint_symbol for ship in ships])
+        destination_x, destination_y = self._positions(destinations)
+        speed = np.array([ship.engine.speed for ship in ships], dtype=np.float64)
+        tank = np.array([ship.fuel.current for ship in ships], dtype=np.float64)
+        capacity = np.array([ship.fuel.capacity for ship in ships], dtype=np.float64)
+
+        seconds, fuel = estimate_matrix(origin_x, origin_y, speed, destination_x, destination_y, flight_mode)
+        # ships without a tank, such as probes, burn no fuel
+        fuel = np.where(capacity[:, None] == 0, 0.0, fuel)
+        return FleetEstimate(
+            ships=[ship.symbol for ship in ships],
+            destinations=destinations,
+            seconds=seconds + remaining[:, None],
+            fuel=fuel,
+            reachable=fuel <= tank[:, None],
+        )
+
+    def residual(self, navigation: Navigation, speed: int) -> float:
+        """Recorded minus estimated seconds of a finished or ongoing navigation, 0 when the formulas hold
+
+        Args:
+            navigation (Navigation): The navigation as the server returned it
+            speed (int): The engine speed of the ship that flew it
+        """
+        origin_x, origin_y = self._positions([navigation.departure_location])
+        destination_x, destination_y = self._positions([navigation.arrival_location])
+        speeds = np.array([speed], dtype=np.float64)
+        seconds, _ = estimate_matrix(origin_x, origin_y, speeds, destination_x, destination_y, navigation.flight_mode)
+        recorded = (navigation.arrival_time - navigation.departure_time).total_seconds()
+        return recorded - float(seconds[0, 0])
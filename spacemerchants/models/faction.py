@@ -1,23 +1,36 @@
+from spacemerchants.models.identity import canonical
+from spacemerchants.models.waypoint import Trait
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+
+
 class Faction:
     """Faction class for SpaceTrader game."""
 
+    __slots__ = ("symbol", "name", "description", "headquarters", "traits", "is_recruiting", "__weakref__")
+
     symbol: str
     name: str
     description: str
     headquarters: str
-    traits: list[dict[str, str]]
+    traits: tuple[Trait, ...]
     is_recruiting: bool
 
     @classmethod
-    def from_dict(cls, data: dict[str, str]) -> "Faction":
-        """Create a Faction object from a dictionary"""
-        faction = cls()
+    def from_dict(cls, data: dict[str, str], requester: SpaceMerchantCore | None = None) -> "Faction":
+        """Create a Faction object from a dictionary, or refresh the live faction with the same symbol
+
+        Systems only list the symbols of their factions, the other fields are empty for those and a live faction
+        keeps its own.
+        """
+        faction = canonical(requester, cls, data["symbol"])
+        if "name" not in data and hasattr(faction, "name"):
+            return faction
         faction.symbol = data["symbol"]
-        faction.name = data["name"]
-        faction.description = data["description"]
-        faction.headquarters = data["headquarters"]
-        faction.traits = data["traits"]
-        faction.is_recruiting = data["isRecruiting"]
+        faction.name = data.get("name", "")
+        faction.description = data.get("description", "")
+        faction.headquarters = data.get("headquarters", "")
+        faction.traits = tuple(Trait.from_dict(trait) for trait in data.get("traits", []))
+        faction.is_recruiting = data.get("isRecruiting", False)
         return faction
 
     def __str__(self):
@@ -0,0 +1,15 @@
+from typing import TypeVar
+
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+
+T = TypeVar("T")
+
+
+def canonical(requester: SpaceMerchantCore | None, cls: type[T], key: str, *args) -> T:
+    """The live model of a type and key in the requester's identity map, new models are created with ``cls(*args)``
+
+    Without a requester, e.g. for payloads parsed offline, every call returns a new model.
+    """
+    if requester is None:
+        return cls(*args)
+    return requester.identity_map.canonical(cls, key, *args)
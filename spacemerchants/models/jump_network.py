@@ -0,0 +1,293 @@
+import heapq
+import math
+import sys
+from collections import OrderedDict
+from typing import Callable, Iterable, NamedTuple
+
+from loguru import logger
+
+from spacemerchants.models.route import NAVIGATION_OVERHEAD, fuel_cost
+from spacemerchants.models.system_index import SystemIndex
+from spacetradercore.store import JUMPGATE, SYSTEM, WAYPOINT, UniverseStore
+from spacetradercore.symbols import symbol_table, system_symbol
+
+# seconds per unit of distance at engine speed 1 when warping
+WARP_MODES = {
+    "BURN": 25.0,
+    "CRUISE": 50.0,
+    "STEALTH": 50.0,
+    "DRIFT": 300.0,
+}
+
+
+def warp_time(distance: float, flight_mode: str, speed: int) -> int:
+    """Seconds a warp takes, rounded as the server rounds them"""
+    return round(round(max(1.0, distance)) * (WARP_MODES[flight_mode] / speed) + NAVIGATION_OVERHEAD)
+
+
+def jump_cooldown(distance: float) -> float:
+    """Seconds of cooldown a jump leaves, the server grows it with the distance between the systems"""
+    return 60.0 + distance / 10.0
+
+
+class Hop(NamedTuple):
+    """One jump or warp between two systems"""
+
+    kind: str  # JUMP or WARP
+    origin: str
+    destination: str
+    distance: float
+    seconds: float
+
+
+class JumpRoute(NamedTuple):
+    """The hops taking a ship from one system to another"""
+
+    hops: list[Hop]
+    seconds: float
+
+
+class JumpNetwork:
+    """Graph of the systems linked by jump gates, answering fastest path queries over jumps and warps
+
+    Gates are added as the crawler charts them and gates still under construction are left out. Connections are
+    treated as two way. Queries run A* over the graph: with jumps only the heuristic comes from exact distances to
+    a few landmark systems, with warps allowed from the straight line distance. Landmarks and answers are cached
+    until the graph changes.
+
+    Args:
+        landmarks (int): Systems whose distance to every other system is precomputed for the heuristic
+        jump_seconds (Callable[[float], float]): The cost of a jump over a distance
+        cache_size (int): Most answers kept
+    """
+
+    def __init__(self,
+                 landmarks: int = 8,
+                 jump_seconds: Callable[[float], float] = jump_cooldown,
+                 cache_size: int = 4096) -> None:
+        self.landmark_count = landmarks
+        self.jump_seconds = jump_seconds
+        self.cache_size = cache_size
+        self.index = SystemIndex()
+        self._gates: dict[int, str] = {}  # system id to its gate waypoint
+        self._links: dict[int, set[int]] = {}  # gate system id to the gate systems it lists
+        self._listed_by: dict[int, set[int]] = {}  # system id to the gate systems listing it
+        self._building: set[int] = set()  # systems whose gate is under construction
+        self._landmarks: list[dict[int, float]] | None = None
+        self._answers: OrderedDict[tuple, JumpRoute | None] = OrderedDict()
+        self.version = 0
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._landmarks = None
+        self._answers.clear()
+
+    def add_system(self, payload: dict) -> None:
+        """Place a system payload, fits the crawler's ``on_system`` callback"""
+        self.index.add_payload(payload)
+        self._changed()
+
+    def _link(self, payload: dict) -> None:
+        system = symbol_table.id(system_symbol(payload["symbol"]))
+        for other in self._links.get(system, ()):
+            self._listed_by[other].discard(system)
+        self._gates[system] = payload["symbol"]
+        self._links[system] = {symbol_table.id(system_symbol(connection)) for connection in payload["connections"]}
+        for other in self._links[system]:
+            self._listed_by.setdefault(other, set()).add(system)
+
+    def add_jumpgate(self, payload: dict) -> None:
+        """Add or update a jump gate payload, fits the crawler's ``on_jumpgate`` callback"""
+        self._link(payload)
+        self._changed()
+
+    def set_under_construction(self, gate_symbol: str, under_construction: bool) -> None:
+        """Leave a gate out of routes until its construction is complete"""
+        system = symbol_table.id(system_symbol(gate_symbol))
+        if under_construction:
+            self._building.add(system)
+        else:
+            self._building.discard(system)
+        self._changed()
+
+    def add_construction_site(self, payload: dict) -> None:
+        """Apply a ``get_construction_site`` payload of a gate"""
+        self.set_under_construction(payload["symbol"], not payload.get("isComplete", False))
+
+    @classmethod
+    def from_store(cls, store: UniverseStore, **kwargs) -> "JumpNetwork":
+        """Build the network of everything crawled into the universe store"""
+        network = cls(**kwargs)
+        for payload in store.entries(SYSTEM):
+            network.index.add_payload(payload)
+        for payload in store.entries(JUMPGATE):
+            network._link(payload)
+        for payload in store.entries(WAYPOINT):
+            if payload.get("type") == "JUMP_GATE" and payload.get("isUnderConstruction"):
+                network._building.add(symbol_table.id(system_symbol(payload["symbol"])))
+        network._changed()
+        logger.debug(f"JumpNetwork | from_store | {len(network.index) =:} | {len(network._gates) =:}")
+        return network
+
+    def gate(self, system: str) -> str | None:
+        """The gate waypoint of a system, None without a charted gate"""
+        return self._gates.get(symbol_table.id(system))
+
+    def _active(self, system: int) -> bool:
+        """Whether a system has a gate known to work, gates only listed by others are taken to work"""
+        return (system in self._gates or system in self._listed_by) and system not in self._building
+
+    def neighbours(self, system: int) -> Iterable[int]:
+        """The ids of the systems one jump away, through gates that work at both ends"""
+        if not self._active(system):
+            return ()
+        linked = self._links.get(system, set()) | self._listed_by.get(system, set())
+        return [other for other in linked if self._active(other)]
+
+    def _distance(self, first: int, second: int) -> float:
+        """The distance between two systems, 0 when either was never placed"""
+        first, second = symbol_table.symbol(first), symbol_table.symbol(second)
+        if first not in self.index or second not in self.index:
+            return 0.0
+        first_x, first_y = self.index.position(first)
+        second_x, second_y = self.index.position(second)
+        return math.hypot(first_x - second_x, first_y - second_y)
+
+    def _jump_cost(self, first: int, second: int) -> float:
+        return self.jump_seconds(self._distance(first, second))
+
+    def _dijkstra(self, source: int) -> dict[int, float]:
+        """Jump only seconds from a system to every system it can reach"""
+        best = {source: 0.0}
+        queue = [(0.0, source)]
+        while queue:
+            cost, system = heapq.heappop(queue)
+            if cost > best[system]:
+                continue
+            for other in self.neighbours(system):
+                candidate = cost + self._jump_cost(system, other)
+                if candidate < best.get(other, math.inf):
+                    best[other] = candidate
+                    heapq.heappush(queue, (candidate, other))
+        return best
+
+    def _landmark_distances(self) -> list[dict[int, float]]:
+        """Jump distances from landmarks spread over the graph, each the farthest from those picked before"""
+        if self._landmarks is not None:
+            return self._landmarks
+        systems = [system for system in self._gates if self._active(system)]
+        self._landmarks = []
+        if not systems:
+            return self._landmarks
+        landmark = systems[0]
+        nearest = {system: math.inf for system in systems}
+        for _ in range(min(self.landmark_count, len(systems))):
+            distances = self._dijkstra(landmark)
+            self._landmarks.append(distances)
+            for system in systems:
+                nearest[system] = min(nearest[system], distances.get(system, math.inf))
+            # the next landmark is the reachable system farthest from every landmark so far
+            reachable = [system for system in systems if math.isfinite(nearest[system])]
+            landmark = max(reachable, key=nearest.__getitem__)
+            if nearest[landmark] == 0:
+                break
+        return self._landmarks
+
+    def shortest_path(self,
+                      origin: str,
+                      destination: str,
+                      warp_range: float = 0.0,
+                      speed: int = 30,
+                      warp_mode: str = "CRUISE") -> JumpRoute | None:
+        """The fastest way between two systems, None when they are not connected
+
+        Args:
+            origin (str): The system the ship is in
+            destination (str): The system to go to
+            warp_range (float): Longest warp the ship can make on a tank, 0 to only jump
+            speed (int): The speed of the ship's engine, used for warps
+            warp_mode (str): The flight mode warps are made in
+        """
+        key = (origin, destination, warp_range, speed, warp_mode)
+        if key in self._answers:
+            self._answers.move_to_end(key)
+            return self._answers[key]
+        route = self._search(symbol_table.id(origin), symbol_table.id(destination), warp_range, speed, warp_mode)
+        self._answers[key] = route
+        if len(self._answers) > self.cache_size:
+            self._answers.popitem(last=False)
+        return route
+
+    def _search(self, start: int, end: int, warp_range: float, speed: int, warp_mode: str) -> JumpRoute | None:
+        if start == end:
+            return JumpRoute([], 0.0)
+        can_warp = warp_range > 0 and symbol_table.symbol(end) in self.index
+        if math.isinf(warp_range):
+            # drifting warps reach anywhere, a radius wider than the galaxy keeps the grid arithmetic finite
+            warp_range = sys.float_info.max / 4
+
+        if can_warp:
+            # nothing covers a distance faster than the cheaper of a jump or a warp over it, less a unit the
+            # server's rounding of warp distances may save
+            per_unit = min(1 / 10.0, WARP_MODES[warp_mode] / speed)
+            end_x, end_y = self.index.position(symbol_table.symbol(end))
+
+            def heuristic(system: int) -> float:
+                symbol = symbol_table.symbol(system)
+                if symbol not in self.index:
+                    return 0.0
+                x, y = self.index.position(symbol)
+                return max(0.0, math.hypot(x - end_x, y - end_y) - 1.0) * per_unit
+        else:
+            landmarks = self._landmark_distances()
+
+            def heuristic(system: int) -> float:
+                bound = 0.0
+                for distances in landmarks:
+                    to_end, to_system = distances.get(end), distances.get(system)
+                    if to_end is not None and to_system is not None:
+                        bound = max(bound, abs(to_end - to_system))
+                return bound
+
+        best = {start: 0.0}
+        previous: dict[int, tuple[int, str]] = {}
+        queue = [(heuristic(start), 0.0, start)]
+        while queue:
+            _, cost, system = heapq.heappop(queue)
+            if system == end:
+                break
+            if cost > best[system]:
+                continue
+            edges = [(other, "JUMP", self._jump_cost(system, other)) for other in self.neighbours(system)]
+            if can_warp and symbol_table.symbol(system) in self.index:
+                x, y = self.index.position(symbol_table.symbol(system))
+                for symbol, distance in self.index.within(x, y, warp_range):
+                    if distance > 0:
+                        edges.append((symbol_table.id(symbol), "WARP", warp_time(distance, warp_mode, speed)))
+            for other, kind, seconds in edges:
+                candidate = cost + seconds
+                if candidate < best.get(other, math.inf):
+                    best[other] = candidate
+                    previous[other] = (system, kind)
+                    heapq.heappush(queue, (candidate + heuristic(other), candidate, other))
+        if end not in best:
+            return None
+
+        hops = []
+        system = end
+        while system != start:
+            before, kind = previous[system]
+            distance = self._distance(before, system)
+            seconds = self._jump_cost(before, system) if kind == "JUMP" else warp_time(distance, warp_mode, speed)
+            hops.append(Hop(kind, symbol_table.symbol(before), symbol_table.symbol(system), distance, seconds))
+            system = before
+        hops.reverse()
+        return JumpRoute(hops, best[end])
+
+
+def max_warp_distance(fuel_capacity: int, warp_mode: str = "CRUISE") -> float:
+    """The longest warp a full tank allows in a flight mode"""
+    if fuel_capacity == 0 or warp_mode == "DRIFT":
+        return math.inf
+    per_unit = fuel_cost(100.0, warp_mode) / 100.0
+    return fuel_capacity / per_unit
@@ -0,0 +1,73 @@
+from typing import Any, Callable
+
+
+class lazy:
+    """A model attribute built from the model's raw payload the first time it is read
+
+    The payload is kept in the model's ``_data`` slot and the built value in a slot named after the attribute with a
+    leading underscore, which the model must declare. Assigning the attribute replaces the value like any other.
+
+    Args:
+        build (Callable[[dict], Any]): Builds the value from the raw payload
+    """
+
+    def __init__(self, build: Callable[[dict], Any]) -> None:
+        self.build = build
+        self.name = ""
+        self.slot = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.slot = f"_{name}"
+
+    def __get__(self, instance, owner: type | None = None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value = self.build(instance._data)
+            setattr(instance, self.slot, value)
+            return value
+
+    def __set__(self, instance, value) -> None:
+        setattr(instance, self.slot, value)
+
+
+def _lazy_attributes(cls: type) -> tuple[lazy, ...]:
+    attributes = _attributes.get(cls)
+    if attributes is None:
+        attributes = _attributes[cls] = tuple(
+            attribute for klass in cls.__mro__ for attribute in vars(klass).values() if isinstance(attribute, lazy)
+        )
+    return attributes
+
+
+_attributes: dict[type, tuple[lazy, ...]] = {}
+
+
+def load(model, data: dict, lazy: bool = False) -> None:
+    """Give a model a new raw payload, dropping whatever was built from the previous one
+
+    Args:
+        model: The model to update in place
+        data (dict): The new payload
+        lazy (bool): Build the lazy attributes on first access instead of now
+    """
+    for attribute in _lazy_attributes(type(model)):
+        try:
+            delattr(model, attribute.slot)
+        except AttributeError:
+            pass
+    model._data = data
+    if not lazy:
+        hydrate(model)
+
+
+def hydrate(model) -> None:
+    """Build every lazy attribute of a model now and let go of its raw payload"""
+    data = model._data
+    for attribute in _lazy_attributes(type(model)):
+        if not hasattr(model, attribute.slot):
+            setattr(model, attribute.slot, attribute.build(data))
+    model._data = None
@@ -0,0 +1,273 @@
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from loguru import logger
+
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+
+SUPPLY_LEVELS = ["SCARCE", "LIMITED", "MODERATE", "HIGH", "ABUNDANT"]
+ACTIVITY_LEVELS = ["WEAK", "GROWING", "STRONG", "RESTRICTED"]
+
+# one array per column and good, every row one observation of the good at a market
+COLUMNS = {
+    "time": np.float64,  # epoch seconds
+    "waypoint": np.int32,  # code in the history's waypoint list
+    "purchase": np.int32,
+    "sell": np.int32,
+    "volume": np.int32,
+    "supply": np.int8,  # index in SUPPLY_LEVELS, -1 when unknown
+    "activity": np.int8,  # index in ACTIVITY_LEVELS, -1 when unknown
+}
+
+
+def _level(levels: list[str], value: str | None) -> int:
+    return levels.index(value) if value in levels else -1
+
+
+class PricePoint(NamedTuple):
+    """One observation of a good at a market"""
+
+    time: datetime
+    waypoint: str
+    purchase_price: int
+    sell_price: int
+    trade_volume: int
+    supply: str | None
+    activity: str | None
+
+
+class PriceSeries(NamedTuple):
+    """Observations of a good over a time window, oldest first"""
+
+    time: np.ndarray
+    waypoints: np.ndarray
+    purchase_price: np.ndarray
+    sell_price: np.ndarray
+    trade_volume: np.ndarray
+
+
+class _Series:
+    """The growable columns of one good, memory-mapped columns are copied on the first append"""
+
+    __slots__ = ("columns", "size")
+
+    def __init__(self, columns: dict[str, np.ndarray] | None = None) -> None:
+        self.columns = columns or {name: np.empty(16, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self.size = len(self.columns["time"]) if columns else 0
+
+    def append(self, row: tuple) -> None:
+        time = self.columns["time"]
+        if self.size == len(time) or not time.flags.writeable:
+            capacity = max(16, 2 * self.size)
+            grown = {}
+            for name, dtype in COLUMNS.items():
+                grown[name] = np.empty(capacity, dtype=dtype)
+                grown[name][:self.size] = self.columns[name][:self.size]
+            self.columns = grown
+        for name, value in zip(COLUMNS, row):
+            self.columns[name][self.size] = value
+        self.size += 1
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.size]
+
+
+class MarketHistory:
+    """Every market observation, kept in compact per good columns for fast price queries
+
+    ``record`` appends the trade goods of a market payload, one row per good, and ``attach`` does so for every
+    market a core reads. Each good keeps a column per field, so a query over thousands of observations is a few
+    NumPy operations. ``save`` writes every column to a ``.npy`` file and ``load`` memory-maps them, so a large
+    history opens instantly and is only copied into memory once it grows.
+
+    Args:
+        directory (str | Path): Where ``save`` writes the history by default
+    """
+
+    def __init__(self, directory: str | Path | None = None) -> None:
+        self.directory = Path(directory) if directory else None
+        self.waypoints: list[str] = []
+        self._waypoint_codes: dict[str, int] = {}
+        self._series: dict[str, _Series] = {}
+        # the payload last recorded for each market, cached and shared responses come back as the same object
+        self._recorded: dict[str, dict] = {}
+
+    def _code(self, waypoint: str) -> int:
+        code = self._waypoint_codes.get(waypoint)
+        if code is None:
+            code = self._waypoint_codes[waypoint] = len(self.waypoints)
+            self.waypoints.append(waypoint)
+        return code
+
+    def record(self, payload: dict, observed: datetime | None = None) -> int:
+        """Append the trade goods of a ``get_market`` payload, fits the crawler's ``on_market`` callback
+
+        Markets only list trade goods while one of our ships is there, payloads without them add nothing, and
+        a payload already recorded, such as a cached response read again, is not recorded twice.
+
+        Args:
+            payload (dict): The market
+            observed (datetime): When the market was read, now by default
+
+        Returns:
+            int: The number of goods recorded
+        """
+        goods = payload.get("tradeGoods") or []
+        if not goods or self._recorded.get(payload["symbol"]) is payload:
+            return 0
+        self._recorded[payload["symbol"]] = payload
+        time = (observed or datetime.now(timezone.utc)).timestamp()
+        waypoint = self._code(payload["symbol"])
+        for good in goods:
+            series = self._series.get(good["symbol"])
+            if series is None:
+                series = self._series[good["symbol"]] = _Series()
+            series.append((
+                time,
+                waypoint,
+                good["purchasePrice"],
+                good["sellPrice"],
+                good["tradeVolume"],
+                _level(SUPPLY_LEVELS, good.get("supply")),
+                _level(ACTIVITY_LEVELS, good.get("activity")),
+            ))
+        return len(goods)
+
+    def attach(self, requester: SpaceMerchantCore) -> None:
+        """Record every market the core reads from now on"""
+        requester.market_listeners.append(self.record)
+
+    @property
+    def goods(self) -> list[str]:
+        return sorted(self._series)
+
+    def __len__(self) -> int:
+        return sum(series.size for series in self._series.values())
+
+    def _point(self, series: _Series, row: int) -> PricePoint:
+        supply, activity = int(series["supply"][row]), int(series["activity"][row])
+        return PricePoint(
+            time=datetime.fromtimestamp(float(series["time"][row]), timezone.utc),
+            waypoint=self.waypoints[series["waypoint"][row]],
+            purchase_price=int(series["purchase"][row]),
+            sell_price=int(series["sell"][row]),
+            trade_volume=int(series["volume"][row]),
+            supply=SUPPLY_LEVELS[supply] if supply >= 0 else None,
+            activity=ACTIVITY_LEVELS[activity] if activity >= 0 else None,
+        )
+
+    def _mask(self, series: _Series, waypoint: str | None) -> np.ndarray | None:
+        """The rows of a waypoint, None when it was never observed"""
+        if waypoint is None:
+            return np.ones(series.size, dtype=bool)
+        code = self._waypoint_codes.get(waypoint)
+        if code is None:
+            return None
+        return series["waypoint"] == code
+
+    def latest(self, good: str, waypoint: str | None = None) -> PricePoint | None:
+        """The newest observation of a good, at one market or at any
+
+        Args:
+            good (str): The trade good
+            waypoint (str): The market, every market when not given
+        """
+        series = self._series.get(good)
+        if series is None:
+            return None
+        mask = self._mask(series, waypoint)
+        if mask is None or not mask.any():
+            return None
+        rows = np.flatnonzero(mask)
+        return self._point(series, int(rows[np.argmax(series["time"][rows])]))
+
+    def latest_prices(self, good: str) -> dict[str, PricePoint]:
+        """The newest observation of a good at every market it was seen at"""
+        series = self._series.get(good)
+        if series is None:
+            return {}
+        # sorted by market then time, the last row of each market is its newest
+        order = np.lexsort((series["time"], series["waypoint"]))
+        waypoints = series["waypoint"][order]
+        last = order[np.flatnonzero(np.append(waypoints[1:] != waypoints[:-1], True))]
+        return {self.waypoints[series["waypoint"][row]]: self._point(series, int(row)) for row in last}
+
+    def window(
+        self, good: str, start: datetime, end: datetime | None = None, waypoint: str | None = None
+    ) -> PriceSeries:
+        """The observations of a good between two times, oldest first
+
+        Args:
+            good (str): The trade good
+            start (datetime): The earliest observation to include
+            end (datetime): The latest observation to include, now by default
+            waypoint (str): The market, every market when not given
+        """
+        series = self._series.get(good)
+        mask = self._mask(series, waypoint) if series is not None else None
+        if mask is None:
+            empty = np.empty(0)
+            return PriceSeries(empty, np.empty(0, dtype=object), empty, empty, empty)
+        time = series["time"]
+        mask &= (time >= start.timestamp()) & (time <= (end or datetime.now(timezone.utc)).timestamp())
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(time[rows], kind="stable")]
+        return PriceSeries(
+            time=time[rows],
+            waypoints=np.array(self.waypoints, dtype=object)[series["waypoint"][rows]],
+            purchase_price=series["purchase"][rows],
+            sell_price=series["sell"][rows],
+            trade_volume=series["volume"][rows],
+        )
+
+    def staleness(self, waypoint: str, good: str | None = None, now: datetime | None = None) -> float:
+        """Seconds since a market, or one good at it, was last observed, infinite if it never was"""
+        goods = [good] if good is not None else list(self._series)
+        newest = -np.inf
+        for symbol in goods:
+            series = self._series.get(symbol)
+            mask = self._mask(series, waypoint) if series is not None else None
+            if mask is not None and mask.any():
+                newest = max(newest, float(series["time"][mask].max()))
+        return (now or datetime.now(timezone.utc)).timestamp() - newest
+
+    def save(self, directory: str | Path | None = None) -> Path:
+        """Write the history, one ``.npy`` file per column and good
+
+        Files are written beside the old ones and then moved over them, so histories memory-mapping the old
+        files keep reading them safely.
+        """
+        directory = Path(directory or self.directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for good, series in self._series.items():
+            (directory / good).mkdir(exist_ok=True)
+            for name in COLUMNS:
+                path = directory / good / f"{name}.npy"
+                temporary = path.with_suffix(".tmp")
+                with open(temporary, "wb") as file:
+                    np.save(file, series[name])
+                os.replace(temporary, path)
+        temporary = directory / "waypoints.tmp"
+        temporary.write_text(json.dumps(self.waypoints))
+        os.replace(temporary, directory / "waypoints.json")
+        logger.debug(f"MarketHistory | save | {directory =:} | {len(self) =:}")
+        return directory
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "MarketHistory":
+        """Open a saved history, memory-mapping its columns unless ``mmap`` is False"""
+        history = cls(directory)
+        directory = Path(directory)
+        for waypoint in json.loads((directory / "waypoints.json").read_text()):
+            history._code(waypoint)
+        for path in sorted(directory.iterdir()):
+            if path.is_dir():
+                history._series[path.name] = _Series({
+                    name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None) for name in COLUMNS
+                })
+        logger.debug(f"MarketHistory | load | {directory =:} | {len(history) =:}")
+        return history
@@ -0,0 +1,239 @@
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from spacemerchants.models.waypoint_table import WaypointTable
+
+# seconds per unit of distance at engine speed 1, the SpaceTraders travel time formula
+FLIGHT_MODES = {
+    "BURN": 12.5,
+    "CRUISE": 25.0,
+    "STEALTH": 30.0,
+    "DRIFT": 250.0,
+}
+
+# seconds every navigation takes on top of the distance
+NAVIGATION_OVERHEAD = 15
+
+
+def travel_time(distance: float, flight_mode: str, speed: int) -> int:
+    """Seconds a navigation takes, rounded as the server rounds them"""
+    return round(round(max(1.0, distance)) * (FLIGHT_MODES[flight_mode] / speed) + NAVIGATION_OVERHEAD)
+
+
+def fuel_cost(distance: float, flight_mode: str) -> int:
+    """Fuel a navigation burns, nothing between waypoints at the same coordinates"""
+    if distance == 0:
+        return 0
+    if flight_mode == "DRIFT":
+        return 1
+    if flight_mode == "BURN":
+        return max(2, 2 * round(distance))
+    return max(1, round(distance))
+
+
+def travel_times(distance: np.ndarray, flight_mode: str, speed: int | np.ndarray) -> np.ndarray:
+    """``travel_time`` over arrays of distances and engine speeds"""
+    return np.round(np.round(np.maximum(1.0, distance)) * (FLIGHT_MODES[flight_mode] / speed) + NAVIGATION_OVERHEAD)
+
+
+def fuel_costs(distance: np.ndarray, flight_mode: str) -> np.ndarray:
+    """``fuel_cost`` over an array of distances"""
+    if flight_mode == "DRIFT":
+        cost = np.ones_like(distance)
+    elif flight_mode == "BURN":
+        cost = np.maximum(2.0, 2 * np.round(distance))
+    else:
+        cost = np.maximum(1.0, np.round(distance))
+    return np.where(distance == 0, 0.0, cost)
+
+
+class Leg(NamedTuple):
+    """One navigation of a route"""
+
+    origin: str
+    destination: str
+    flight_mode: str
+    distance: float
+    fuel: int
+    seconds: int
+    refuel: bool  # refuel on arrival before the next leg
+
+
+class Route(NamedTuple):
+    """The legs taking a ship from one waypoint to another"""
+
+    legs: list[Leg]
+    seconds: float  # travel time plus refuel stops
+    refuel_first: bool = False  # fill the tank at the origin before the first leg
+
+    @property
+    def fuel(self) -> int:
+        return sum(leg.fuel for leg in self.legs)
+
+    @property
+    def stops(self) -> list[str]:
+        """The waypoints the ship refuels at, the origin first when the route starts with a refuel"""
+        stops = [leg.destination for leg in self.legs if leg.refuel]
+        if self.refuel_first and self.legs:
+            stops.insert(0, self.legs[0].origin)
+        return stops
+
+
+class RoutePlanner:
+    """Plans the fastest route between the waypoints of a system within a ship's fuel
+
+    A route is a shortest path over the origin, the destination and the fuel stations, where a ship fills its tank
+    at every station it stops at. Each hop uses the fastest flight mode the fuel in the tank allows, so a ship with
+    too little fuel for a cruise drifts instead of stranding. The distance matrix is computed once and the hops
+    between stations are cached per engine speed and tank size, so planning for a whole fleet stays cheap.
+
+    Args:
+        symbols (list[str]): The waypoints of the system
+        x (np.ndarray): Their x coordinates
+        y (np.ndarray): Their y coordinates
+        fuel_stations (Iterable[str]): The waypoints that sell fuel
+        flight_modes (Iterable[str]): The flight modes routes may use
+        refuel_seconds (float): Time charged for every refuel stop, docking and buying fuel take requests too
+    """
+
+    def __init__(self,
+                 symbols: list[str],
+                 x: np.ndarray,
+                 y: np.ndarray,
+                 fuel_stations: Iterable[str],
+                 flight_modes: Iterable[str] = tuple(FLIGHT_MODES),
+                 refuel_seconds: float = 5.0) -> None:
+        self.symbols = list(symbols)
+        self._rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+        self.distance = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+        self._station_rows = {self._rows[symbol] for symbol in fuel_stations if symbol in self._rows}
+        self.stations = np.array(sorted(self._station_rows), dtype=np.intp)
+        self.flight_modes = [mode for mode in FLIGHT_MODES if mode in set(flight_modes)]
+        if not self.flight_modes:
+            raise ValueError('at least one flight mode is required')
+        self.refuel_seconds = refuel_seconds
+        self._station_hops: dict[tuple[int, int], tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_table(
+        cls, table: WaypointTable, system: str | None = None, fuel_stations: Iterable[str] | None = None, **kwargs
+    ) -> "RoutePlanner":
+        """Plan over the waypoints of a table, limited to one system when the table spans several
+
+        Args:
+            table (WaypointTable): The waypoints
+            system (str): The system to plan in
+            fuel_stations (Iterable[str]): The waypoints that sell fuel, every marketplace when not known
+        """
+        rows = np.flatnonzero(table.filter(system=system)) if system else np.arange(len(table))
+        if fuel_stations is None:
+            fuel_stations = table.select(traits=["MARKETPLACE"], system=system)
+        return cls(table.symbols[rows].tolist(), table.x[rows], table.y[rows], fuel_stations, **kwargs)
+
+    def _hops(self, distance: np.ndarray, fuel: float | np.ndarray, speed: int, capacity: int):
+        """Seconds, fuel and flight mode of the fastest feasible hop over each distance"""
+        best_seconds = np.full(distance.shape, np.inf)
+        best_fuel = np.zeros(distance.shape)
+        best_mode = np.zeros(distance.shape, dtype=np.int8)
+        for index, mode in enumerate(self.flight_modes):
+            seconds = travel_times(distance, mode, speed)
+            cost = fuel_costs(distance, mode)
+            # ships without a tank, such as probes, burn no fuel
+            feasible = (cost <= fuel) if capacity else np.ones(distance.shape, dtype=bool)
+            better = feasible & (seconds < best_seconds)
+            best_seconds = np.where(better, seconds, best_seconds)
+            best_fuel = np.where(better, cost if capacity else 0.0, best_fuel)
+            best_mode = np.where(better, index, best_mode)
+        return best_seconds, best_fuel, best_mode
+
+    def _station_hops_for(self, speed: int, capacity: int):
+        key = (speed, capacity)
+        hops = self._station_hops.get(key)
+        if hops is None:
+            hops = self._station_hops[key] = self._hops(
+                self.distance[np.ix_(self.stations, self.stations)], capacity, speed, capacity
+            )
+        return hops
+
+    def plan(self, origin: str, destination: str, speed: int, fuel: int, capacity: int) -> Route | None:
+        """The fastest route from one waypoint to another, None when the fuel cannot get the ship there
+
+        Args:
+            origin (str): The waypoint the ship is at
+            destination (str): The waypoint to go to
+            speed (int): The speed of the ship's engine
+            fuel (int): The fuel in the tank
+            capacity (int): The size of the tank, 0 for ships that need no fuel
+        """
+        if speed < 1:
+            raise ValueError('speed must be non zero positive number')
+        start, end = self._rows[origin], self._rows[destination]
+        if start == end:
+            return Route([], 0.0)
+
+        # nodes: the origin, every fuel station, then the destination
+        stations = self.stations[(self.stations != start) & (self.stations != end)]
+        nodes = np.concatenate(([start], stations, [end]))
+        size = len(nodes)
+        seconds = np.full((size, size), np.inf)
+        fuels = np.zeros((size, size))
+        modes = np.zeros((size, size), dtype=np.int8)
+
+        # from the origin with the fuel the ship has
+        seconds[0], fuels[0], modes[0] = self._hops(self.distance[start, nodes], fuel, speed, capacity)
+        refuel_first = np.zeros(size, dtype=bool)
+        if capacity and start in self._station_rows:
+            # or with a full tank after refueling at the origin, when it sells fuel
+            full = self._hops(self.distance[start, nodes], capacity, speed, capacity)
+            refuel_first = full[0] + self.refuel_seconds < seconds[0]
+            seconds[0] = np.where(refuel_first, full[0] + self.refuel_seconds, seconds[0])
+            fuels[0] = np.where(refuel_first, full[1], fuels[0])
+            modes[0] = np.where(refuel_first, full[2], modes[0])
+        if len(stations):
+            # between stations and on to the destination with a full tank
+            station_seconds, station_fuels, station_modes = self._station_hops_for(speed, capacity)
+            positions = np.searchsorted(self.stations, stations)
+            inner = np.ix_(positions, positions)
+            seconds[1:-1, 1:-1] = station_seconds[inner] + self.refuel_seconds
+            fuels[1:-1, 1:-1] = station_fuels[inner]
+            modes[1:-1, 1:-1] = station_modes[inner]
+            last = self._hops(self.distance[stations, end], capacity, speed, capacity)
+            seconds[1:-1, -1] = last[0] + self.refuel_seconds
+            fuels[1:-1, -1], modes[1:-1, -1] = last[1], last[2]
+        np.fill_diagonal(seconds, np.inf)
+        seconds[:, 0] = np.inf
+
+        # dense Dijkstra, the graph is small and complete
+        total = np.full(size, np.inf)
+        total[0] = 0.0
+        previous = np.full(size, -1)
+        done = np.zeros(size, dtype=bool)
+        for _ in range(size):
+            node = int(np.argmin(np.where(done, np.inf, total)))
+            if done[node] or not np.isfinite(total[node]) or node == size - 1:
+                break
+            done[node] = True
+            candidate = total[node] + seconds[node]
+            better = (candidate < total) & ~done
+            total = np.where(better, candidate, total)
+            previous = np.where(better, node, previous)
+        if not np.isfinite(total[-1]):
+            return None
+
+        path = [size - 1]
+        while path[-1] != 0:
+            path.append(int(previous[path[-1]]))
+        path.reverse()
+        legs = []
+        for hop, (source, target) in enumerate(zip(path, path[1:])):
+            legs.append(Leg(
+                origin=self.symbols[nodes[source]],
+                destination=self.symbols[nodes[target]],
+                flight_mode=self.flight_modes[modes[source, target]],
+                distance=float(self.distance[nodes[source], nodes[target]]),
+                fuel=int(fuels[source, target]),
+                seconds=int(seconds[source, target] - (self.refuel_seconds if source or refuel_first[target] else 0)),
+                refuel=hop < len(path) - 2,
+            ))
+        return Route(legs, float(total[-1]), refuel_first=bool(refuel_first[path[1]]))
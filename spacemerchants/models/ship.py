@@ -1,29 +1,164 @@
 from datetime import datetime
+from typing import NamedTuple
 
+from loguru import logger
+
+from spacemerchants.models.identity import canonical
+from spacemerchants.models.lazy import lazy, load
+from spacemerchants.models.route import Route, RoutePlanner
+from spacetradercore.decoding import PageMeta, Record, convert
+from spacetradercore.errors import SpaceTradersError
 from spacetradercore.spacemerchantcore import SpaceMerchantCore
 
 
+class RouteEndpoint(Record):
+    symbol: str
+
+
+class NavRoute(Record):
+    origin: RouteEndpoint
+    destination: RouteEndpoint
+    departure_time: str
+    arrival: str
+
+
+class NavPayload(Record):
+    """The ``nav`` of a ship as the server sends it, timestamps are kept as text until they are read"""
+
+    system_symbol: str
+    waypoint_symbol: str
+    route: NavRoute
+    status: str
+    flight_mode: str
+
+
+class CooldownPayload(Record):
+    ship_symbol: str = ""
+    total_seconds: int = 0
+    remaining_seconds: int = 0
+    expiration: str | None = None
+
+
+class Registration(Record):
+    name: str
+    faction_symbol: str
+    role: str
+
+
+class ShipPayload(Record):
+    """A ship as the server sends it
+
+    The registration, navigation and cooldown are typed. The other components are left as decoded and built into
+    their models by the ship on first access.
+    """
+
+    symbol: str
+    registration: Registration
+    nav: NavPayload
+    crew: dict = {}
+    frame: dict = {}
+    reactor: dict = {}
+    engine: dict = {}
+    modules: list[dict] = []
+    mounts: list[dict] = []
+    cargo: dict = {}
+    fuel: dict = {}
+    cooldown: CooldownPayload | None = None
+
+
+class ShipPage(Record):
+    """A page of ``list_ships``, decoded straight into ship payloads"""
+
+    data: list[ShipPayload]
+    meta: PageMeta
+
+
+class InventoryItem(NamedTuple):
+    """One kind of good in a cargo hold"""
+
+    symbol: str
+    name: str
+    description: str
+    units: int
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "InventoryItem":
+        return cls(data["symbol"], data.get("name", ""), data.get("description", ""), data["units"])
+
+
 class Cargo:
-    capacity: int = 0
-    inventory: list = []  # TODO: define the type of the inventory
-    units: int = 0
+    __slots__ = ("capacity", "inventory", "units")
+
+    capacity: int
+    inventory: list[InventoryItem]
+    units: int
 
     @classmethod
     def from_dict(cls, data: dict) -> "Cargo":
         cargo = cls()
         cargo.capacity = data["capacity"]
-        cargo.inventory = data["inventory"]
+        cargo.inventory = [InventoryItem.from_dict(item) for item in data["inventory"]]
         cargo.units = data["units"]
         return cargo
 
+    def units_of(self, symbol: str) -> int:
+        """Units of a good held in the cargo"""
+        return sum(item.units for item in self.inventory if item.symbol == symbol)
+
+    def add(self, symbol: str, units: int, name: str = "", description: str = "") -> None:
+        """Add units of a good to the cargo, negative units take them out"""
+        inventory = []
+        found = False
+        for item in self.inventory:
+            if item.symbol == symbol:
+                item = item._replace(units=item.units + units)
+                found = True
+            if item.units > 0:
+                inventory.append(item)
+        if not found and units > 0:
+            inventory.append(InventoryItem(symbol, name, description, units))
+        self.inventory = inventory
+        self.units = sum(item.units for item in inventory)
+
+
+class Cooldown:
+    """How long a ship must wait before its next extraction, survey or jump, the expiration is parsed when read"""
+
+    __slots__ = ("ship_symbol", "total_seconds", "remaining_seconds", "_expiration", "_data")
+
+    ship_symbol: str
+    total_seconds: int
+    remaining_seconds: int
+    expiration: datetime | None = lazy(
+        lambda payload: datetime.fromisoformat(payload.expiration) if payload.expiration else None
+    )
+    _data: CooldownPayload | None
+
+    @classmethod
+    def from_record(cls, payload: CooldownPayload | None) -> "Cooldown":
+        """Create a cooldown from its payload, no payload means no cooldown"""
+        payload = payload or CooldownPayload()
+        cooldown = cls()
+        cooldown.ship_symbol = payload.ship_symbol
+        cooldown.total_seconds = payload.total_seconds
+        cooldown.remaining_seconds = payload.remaining_seconds
+        load(cooldown, payload, lazy=True)
+        return cooldown
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Cooldown":
+        return cls.from_record(convert(data, CooldownPayload))
+
 
 class Crew:
-    capacity: int = 0
-    current: int = 0
-    morale: int = 0
-    required: int = 0
-    rotation: str = ""
-    wages: int = 0
+    __slots__ = ("capacity", "current", "morale", "required", "rotation", "wages")
+
+    capacity: int
+    current: int
+    morale: int
+    required: int
+    rotation: str
+    wages: int
 
     @classmethod
     def from_dict(cls, data: dict) -> "Crew":
@@ -38,6 +173,8 @@ class Crew:
 
 
 class Engine:
+    __slots__ = ("condition", "description", "name", "requirements", "speed", "symbol")
+
     condition: int
     description: str
     name: str
@@ -58,6 +195,17 @@ class Engine:
 
 
 class Frame:
+    __slots__ = (
+        "condition",
+        "description",
+        "name",
+        "requirements",
+        "symbol",
+        "fuel_capacity",
+        "module_slots",
+        "mounting_points",
+    )
+
     condition: int
     description: str
     name: str
@@ -82,6 +230,8 @@ class Frame:
 
 
 class Fuel:
+    __slots__ = ("capacity", "consumed", "current")
+
     capacity: int
     consumed: dict[str, int | datetime]
     current: int
@@ -96,6 +246,8 @@ class Fuel:
 
 
 class Module:
+    __slots__ = ("capacity", "description", "name", "requirements", "symbol")
+
     capacity: int
     description: str
     name: str
@@ -114,6 +266,8 @@ class Module:
 
 
 class Mount:
+    __slots__ = ("description", "name", "requirements", "strength", "symbol")
+
     description: str
     name: str
     requirements: dict[str, int]
@@ -132,32 +286,51 @@ class Mount:
 
 
 class Navigation:
+    """Where a ship is or is going, the departure and arrival times are parsed the first time they are read"""
+
+    __slots__ = (
+        "flight_mode",
+        "_arrival_time",
+        "arrival_location",
+        "_departure_time",
+        "departure_location",
+        "status",
+        "system_symbol",
+        "waypoint_symbol",
+        "_data",
+    )
+
     flight_mode: str
-    arrival_time: datetime
-    arrival_location: dict[str, int | str]  # TODO:
-    departure_time: datetime
-    departure_location: dict[str, int | str]
+    arrival_time: datetime = lazy(lambda route: datetime.fromisoformat(route.arrival))
+    arrival_location: str
+    departure_time: datetime = lazy(lambda route: datetime.fromisoformat(route.departure_time))
+    departure_location: str
     status: str
     system_symbol: str
     waypoint_symbol: str
+    _data: NavRoute | None
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Navigation":
+    def from_record(cls, payload: NavPayload) -> "Navigation":
         navigation = cls()
-        navigation.flight_mode = data["flightMode"]
-        navigation.arrival_time = datetime.fromisoformat(data["route"]["arrival"])
-        navigation.arrival_location = data["route"]["origin"]["symbol"]
-        navigation.departure_time = datetime.fromisoformat(
-            data["route"]["departureTime"]
-        )
-        navigation.departure_location = data["route"]["destination"]["symbol"]
-        navigation.status = data["status"]
-        navigation.system_symbol = data["systemSymbol"]
-        navigation.waypoint_symbol = data["waypointSymbol"]
+        route = payload.route
+        navigation.flight_mode = payload.flight_mode
+        navigation.arrival_location = route.destination.symbol
+        navigation.departure_location = route.origin.symbol
+        navigation.status = payload.status
+        navigation.system_symbol = payload.system_symbol
+        navigation.waypoint_symbol = payload.waypoint_symbol
+        load(navigation, route, lazy=True)
         return navigation
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "Navigation":
+        return cls.from_record(convert(data, NavPayload))
+
 
 class Reactor:
+    __slots__ = ("condition", "description", "name", "power_output", "requirements", "symbol")
+
     condition: int
     description: str
     name: str
@@ -178,60 +351,240 @@ class Reactor:
 
 
 class Ship:
-    cargo: Cargo
-    crew: Crew
-    engine: Engine
-    frame: Frame
-    fuel: Fuel
-    modules: list[Module]
-    mounts: list[Mount]
-    navigation: Navigation
-    reactor: Reactor
+    """A ship of the agent
+
+    Built lazily, the ship keeps its payload and only builds a component such as the crew or the engine the first
+    time it is read, so refreshing a large fleet skips the components nobody looks at. Listings read with
+    ``ShipPage`` are decoded straight into payloads, dicts are converted into one. Every requester keeps one live
+    ship per symbol, parsing a ship again updates it in place.
+
+    Actions merge the navigation, fuel, cargo, cooldown and agent fragments of their response into the ship and the
+    live agent, so the ship stays current without being fetched again.
+    """
+
+    __slots__ = (
+        "faction",
+        "name",
+        "role",
+        "symbol",
+        "_data",
+        "_cargo",
+        "_cooldown",
+        "_crew",
+        "_engine",
+        "_frame",
+        "_fuel",
+        "_modules",
+        "_mounts",
+        "_navigation",
+        "_reactor",
+        "_requester",
+        "__weakref__",
+    )
+
+    cargo: Cargo = lazy(lambda payload: Cargo.from_dict(payload.cargo))
+    cooldown: Cooldown = lazy(lambda payload: Cooldown.from_record(payload.cooldown))
+    crew: Crew = lazy(lambda payload: Crew.from_dict(payload.crew))
+    engine: Engine = lazy(lambda payload: Engine.from_dict(payload.engine))
+    frame: Frame = lazy(lambda payload: Frame.from_dict(payload.frame))
+    fuel: Fuel = lazy(lambda payload: Fuel.from_dict(payload.fuel))
+    modules: list[Module] = lazy(lambda payload: [Module.from_dict(module) for module in payload.modules])
+    mounts: list[Mount] = lazy(lambda payload: [Mount.from_dict(mount) for mount in payload.mounts])
+    navigation: Navigation = lazy(lambda payload: Navigation.from_record(payload.nav))
+    reactor: Reactor = lazy(lambda payload: Reactor.from_dict(payload.reactor))
     faction: str
     name: str
     role: str
     symbol: str
+    _data: ShipPayload | None
     _requester: SpaceMerchantCore
 
-    # create a ship object from a dictionary
     @classmethod
-    def from_dict(cls, requester:SpaceMerchantCore, data: dict) -> "Ship":
-        ship = cls()
+    def from_record(cls, requester: SpaceMerchantCore, payload: ShipPayload, lazy: bool = False) -> "Ship":
+        """Create the ship of a payload, or refresh the live ship with the same symbol
+
+        Args:
+            requester (SpaceMerchantCore): The core the ship sends its requests with
+            payload (ShipPayload): The ship, e.g. an item of a ``ShipPage``
+            lazy (bool): Build the components on first access instead of now
+        """
+        ship = canonical(requester, cls, payload.symbol)
         ship._requester = requester
-        cargo_data = data["cargo"]
-        crew_data = data["crew"]
-        engine_data = data["engine"]
-        frame_data = data["frame"]
-        fuel_data = data["fuel"]
-        navigation_data = data["nav"]
-        reactor_data = data["reactor"]
-
-        ship.cargo = Cargo.from_dict(cargo_data)
-        ship.crew = Crew.from_dict(crew_data)
-        ship.engine = Engine.from_dict(engine_data)
-        ship.frame = Frame.from_dict(frame_data)
-        ship.fuel = Fuel.from_dict(fuel_data)
-        ship.navigation = Navigation.from_dict(navigation_data)
-        ship.reactor = Reactor.from_dict(reactor_data)
-
-        ship.modules = [Module.from_dict(module) for module in data["modules"]]
-        ship.mounts = [Mount.from_dict(mount) for mount in data["mounts"]]
-        ship.faction = data["registration"]["factionSymbol"]
-        ship.name = data["registration"]["name"]
-        ship.role = data["registration"]["role"]
-        ship.symbol = data["symbol"]
-
+        ship.faction = payload.registration.faction_symbol
+        ship.name = payload.registration.name
+        ship.role = payload.registration.role
+        ship.symbol = payload.symbol
+        load(ship, payload, lazy=lazy)
         return ship
 
+    @classmethod
+    def from_dict(cls, requester: SpaceMerchantCore, data: dict, lazy: bool = False) -> "Ship":
+        """Create the ship of a decoded payload, or refresh the live ship with the same symbol, see ``from_record``"""
+        return cls.from_record(requester, convert(data, ShipPayload), lazy=lazy)
+
+    def apply(self, response: dict) -> dict:
+        """Merge the fragments of an action response into the ship and the live agent
+
+        Args:
+            response (dict): The response of an action of this ship
+
+        Returns:
+            dict: The data of the response, e.g. with the transaction or the extraction
+
+        Raises:
+            SpaceTradersError: The server refused the action
+        """
+        if "error" in response:
+            raise SpaceTradersError(response["error"].get("code", 0), response)
+        data = response.get("data") or {}
+        if "nav" in data:
+            self.navigation = Navigation.from_dict(data["nav"])
+        if "fuel" in data:
+            self.fuel = Fuel.from_dict(data["fuel"])
+        if "cargo" in data:
+            self.cargo = Cargo.from_dict(data["cargo"])
+        if "cooldown" in data:
+            self.cooldown = Cooldown.from_dict(data["cooldown"])
+        if "agent" in data and self._requester is not None:
+            # agent imports ship, so the agent class is only looked up here
+            from spacemerchants.models.agent import Agent
+
+            agent = self._requester.identity_map.get(Agent, data["agent"]["symbol"])
+            if agent is not None:
+                agent.update(data["agent"])
+        logger.debug(f"Ship | apply | {self.symbol =:} | {list(data) =:}")
+        return data
+
     async def navigate(self, waypoint: str) -> Navigation:
-        """Navigate to a waypoint"""
+        """Navigate to a waypoint of the current system"""
         if self.navigation.status == "DOCKED":  # TODO: define the status
             raise ValueError("The ship is currently docked and cannot navigate")
-        
-        flight_plan = await self._requester.navigate_ship(self.symbol, {"waypointSymbol": waypoint})
-        self.navigation = Navigation.from_dict(flight_plan.get("nav", {}))
+
+        self.apply(await self._requester.navigate_ship(self.symbol, {"waypointSymbol": waypoint}))
+        return self.navigation
+
+    def plan_route(self, planner: RoutePlanner, destination: str) -> Route | None:
+        """The fastest route from the ship's waypoint to another within its fuel, None if there is none"""
+        return planner.plan(
+            self.navigation.waypoint_symbol, destination, self.engine.speed, self.fuel.current, self.fuel.capacity
+        )
+
+    async def wait_for_arrival(self) -> Navigation:
+        """Sleep until the ship arrives at the end of its current navigation, by the server's clock"""
+        if self.navigation.status != "IN_TRANSIT":
+            return self.navigation
+        await self._requester.timers.sleep_until(self.navigation.arrival_time, key=self.symbol)
+        self.navigation.status = "IN_ORBIT"
         return self.navigation
 
+    async def wait_for_cooldown(self) -> None:
+        """Sleep until the ship's cooldown expires, by the server's clock"""
+        if self.cooldown.expiration is not None:
+            await self._requester.timers.sleep_until(self.cooldown.expiration, key=self.symbol)
+
+    async def travel(self, route: Route) -> Navigation:
+        """Fly a planned route leg by leg, refueling at its stops"""
+        if route.refuel_first and route.legs:
+            if self.navigation.status != "DOCKED":
+                await self.dock()
+            await self.refuel()
+        for leg in route.legs:
+            if self.navigation.status == "DOCKED":
+                await self.orbit()
+            if self.navigation.flight_mode != leg.flight_mode:
+                await self.set_flight_mode(leg.flight_mode)
+            await self.navigate(leg.destination)
+            await self.wait_for_arrival()
+            if leg.refuel:
+                await self.dock()
+                await self.refuel()
+        return self.navigation
+
+    async def warp(self, waypoint: str) -> Navigation:
+        """Warp to a waypoint of another system"""
+        self.apply(await self._requester.warp_ship(self.symbol, {"waypointSymbol": waypoint}))
+        return self.navigation
+
+    async def jump(self, waypoint: str) -> dict:
+        """Jump to a connected jump gate, returns the transaction"""
+        return self.apply(await self._requester.jump_ship(self.symbol, {"waypointSymbol": waypoint}))
+
+    async def set_flight_mode(self, flight_mode: str) -> Navigation:
+        """Change the flight mode used by the next navigation"""
+        response = await self._requester.patch_ship_nav(self.symbol, {"flightMode": flight_mode})
+        # the response data is the navigation itself
+        self.apply({**response, "data": {"nav": response["data"]}} if "data" in response else response)
+        return self.navigation
+
+    async def orbit(self) -> Navigation:
+        """Move into orbit of the current waypoint"""
+        self.apply(await self._requester.orbit_ship(self.symbol))
+        return self.navigation
+
+    async def dock(self) -> Navigation:
+        """Dock at the current waypoint"""
+        self.apply(await self._requester.dock_ship(self.symbol))
+        return self.navigation
+
+    async def refuel(self, units: int | None = None, from_cargo: bool = False) -> dict:
+        """Refuel the ship, the whole tank unless units are given
+
+        Args:
+            units (int, optional): Units of fuel to buy
+            from_cargo (bool, optional): Take the fuel from the cargo instead of the market
+        """
+        data: dict = {"fromCargo": from_cargo}
+        if units is not None:
+            data["units"] = units
+        return self.apply(await self._requester.refuel_ship(self.symbol, data))
+
+    async def extract(self, survey: dict | None = None) -> dict:
+        """Extract resources at the current waypoint, returns the extraction
+
+        Args:
+            survey (dict, optional): A survey of the waypoint to target its deposits
+        """
+        if survey is None:
+            return self.apply(await self._requester.extract_resources(self.symbol, {}))
+        return self.apply(await self._requester.extract_resources_with_survey(self.symbol, survey))
+
+    async def siphon(self) -> dict:
+        """Siphon gas at the current waypoint, returns the siphon"""
+        return self.apply(await self._requester.siphon_resources(self.symbol))
+
+    async def survey(self) -> list[dict]:
+        """Survey the current waypoint"""
+        return self.apply(await self._requester.create_survey(self.symbol)).get("surveys", [])
+
+    async def refine(self, produce: str) -> dict:
+        """Refine raw goods in the cargo into the given good"""
+        return self.apply(await self._requester.ship_refine(self.symbol, {"produce": produce}))
+
+    async def sell(self, symbol: str, units: int) -> dict:
+        """Sell cargo at the market of the current waypoint, returns the transaction"""
+        return self.apply(await self._requester.sell_cargo(self.symbol, {"symbol": symbol, "units": units}))
+
+    async def purchase(self, symbol: str, units: int) -> dict:
+        """Buy cargo at the market of the current waypoint, returns the transaction"""
+        return self.apply(await self._requester.purchase_cargo(self.symbol, {"symbol": symbol, "units": units}))
+
+    async def jettison(self, symbol: str, units: int) -> Cargo:
+        """Throw cargo overboard"""
+        self.apply(await self._requester.jettison_cargo(self.symbol, {"symbol": symbol, "units": units}))
+        return self.cargo
+
+    async def transfer(self, symbol: str, units: int, ship_symbol: str) -> Cargo:
+        """Move cargo to another ship at the same waypoint, the live receiving ship is updated as well"""
+        item = next((item for item in self.cargo.inventory if item.symbol == symbol), None)
+        self.apply(await self._requester.transfer_cargo(
+            self.symbol, {"tradeSymbol": symbol, "units": units, "shipSymbol": ship_symbol}
+        ))
+        receiver = self._requester.identity_map.get(Ship, ship_symbol)
+        if receiver is not None:
+            name, description = (item.name, item.description) if item else ("", "")
+            receiver.cargo.add(symbol, units, name, description)
+        return self.cargo
+
     def __str__(self):
         return f"{self.name} ({self.role})"
 
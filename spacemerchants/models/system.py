@@ -1,22 +1,44 @@
+from typing import AsyncIterator
+
 from loguru import logger
 from spacemerchants.models.faction import Faction
-from spacemerchants.models.waypoint import Waypoint
+from spacemerchants.models.identity import canonical
+from spacemerchants.models.route import RoutePlanner
+from spacemerchants.models.waypoint import Waypoint, WaypointPage
+from spacemerchants.models.waypoint_table import WaypointTable
 from spacetradercore.spacemerchantcore import SpaceMerchantCore
 
 
 class System:
+    __slots__ = (
+        "symbol",
+        "sector_symbol",
+        "type",
+        "x",
+        "y",
+        "factions",
+        "_waypoints",
+        "_table",
+        "_planner",
+        "_requester",
+        "__weakref__",
+    )
+
     symbol: str
     sector_symbol: str
     type: str
     x: int
     y: int
-    factions: list[Faction] = []
+    factions: list[Faction]
     _waypoints: list[Waypoint]  # TODO: define the type of the waypoints
+    _table: WaypointTable | None
+    _planner: RoutePlanner | None
     _requester: SpaceMerchantCore
 
     @classmethod
     def from_dict(cls, requester: SpaceMerchantCore, data: dict) -> "System":
-        system = cls()
+        """Create the system of a payload, or refresh the live system with the same symbol"""
+        system = canonical(requester, cls, data["symbol"])
         system._requester = requester
         system.symbol = data["symbol"]
         system.sector_symbol = data["sectorSymbol"]
@@ -26,53 +48,101 @@ class System:
         system_dict = {"system": system.symbol}
         waypoints = [{**waypoint, **system_dict} for waypoint in data.get("waypoints", [])]
         system._waypoints = [Waypoint.from_dict(requester, waypoint) for waypoint in waypoints]
+        system._table = None
+        system._planner = None
         system.factions = [
-            Faction.from_dict(faction) for faction in data.get("factions", [])
+            Faction.from_dict(faction, requester) for faction in data.get("factions", [])
         ]
         return system
 
-    async def waypoints(self, force: bool = False) -> list[Waypoint]:
-        """Get the waypoints for the system"""
+    async def waypoints(self, force: bool = False, lazy: bool = False) -> list[Waypoint]:
+        """Get the waypoints for the system
+
+        Args:
+            force (bool): Fetch the waypoints from the server even when they are known
+            lazy (bool): Build the traits, modifiers, chart and orbitals of each waypoint on first access
+        """
         if not force and self._waypoints:
             return self._waypoints
 
-        limit = 20
-        page = 1
-        while True:
-            response = await self._requester.list_waypoints_in_system(
-                self.symbol, limit=limit, page=page
-            )
-            waypoints = response.get("data", [])
-            meta = response.get("meta", {})
-            self._waypoints.extend([Waypoint.from_dict(self._requester, waypoint) for waypoint in waypoints])
-            if meta.get("total") == len(self._waypoints):
-                break
-            page += 1
+        waypoints = await self._listing(force)
+        system_dict = {"system": self.symbol}
+        self._waypoints = [
+            Waypoint.from_dict(self._requester, {**waypoint, **system_dict}, lazy=lazy) for waypoint in waypoints
+        ]
         return self._waypoints
 
+    async def _listing(self, force: bool = False) -> list[dict]:
+        """The payloads of every waypoint, from the universe store when it holds them"""
+        store = self._requester.store
+        waypoints = store.get_waypoints(self.symbol) if store and not force else None
+        if waypoints is None:
+            waypoints = await self._requester.paginate(self._requester.list_waypoints_in_system, self.symbol)
+            if store:
+                store.put_waypoints(self.symbol, waypoints)
+        return waypoints
+
+    async def table(self, force: bool = False) -> WaypointTable:
+        """The waypoints of the system as a table for vectorized queries, e.g. the nearest marketplaces
+
+        Args:
+            force (bool): Fetch the waypoints from the server even when they are known
+        """
+        if force or self._table is None:
+            self._table = WaypointTable(await self._listing(force))
+            logger.debug(f"System | table | {self.symbol =:} | {len(self._table) =:}")
+        return self._table
+
+    async def route_planner(self, fuel_stations: list[str] | None = None, force: bool = False) -> RoutePlanner:
+        """A route planner over the waypoints of the system, kept so its cached distances are reused
+
+        Args:
+            fuel_stations (list[str]): The waypoints that sell fuel, every marketplace when not known
+            force (bool): Fetch the waypoints from the server even when they are known
+        """
+        if force or fuel_stations is not None or self._planner is None:
+            self._planner = RoutePlanner.from_table(await self.table(force), fuel_stations=fuel_stations)
+        return self._planner
+
+    async def iter_waypoints(
+        self, traits: list[str] = [], type: str = "", lazy: bool = False
+    ) -> AsyncIterator[Waypoint]:
+        """Stream the waypoints of the system, the next page downloads while earlier waypoints are handled
+
+        Args:
+            traits (list[str]): Only waypoints with these traits
+            type (str): Only waypoints of this type
+            lazy (bool): Build the traits, modifiers, chart and orbitals of each waypoint on first access
+        """
+        async for waypoint in self._requester.iter_waypoints_in_system(
+            self.symbol, traits=traits, type=type, model=WaypointPage
+        ):
+            yield Waypoint.from_record(self._requester, waypoint, lazy=lazy)
+
     async def shipyard(self) -> list[dict]:
         """Get the shipyard for the system"""
-        limit = 20
-        page = 1
-        shipyards = []
-        while True:
-            response = await self._requester.list_waypoints_in_system(
-                self.symbol, limit=limit, page=page, traits=["SHIPYARD"]
-            )
-            logger.debug(f"System | shipyard | {response =:}")
-            ships = response.get("data", [])
-            meta = response.get("meta", {})
-            shipyards.extend(ships)
-            if meta.get("total") == len(ships):
-                break
-            page += 1
+        shipyards = await self._requester.paginate(
+            self._requester.list_waypoints_in_system, self.symbol, traits=["SHIPYARD"]
+        )
+        logger.debug(f"System | shipyard | {len(shipyards) =:}")
         return shipyards
 
     @classmethod
     async def get(cls, requester: SpaceMerchantCore, symbol: str) -> "System":
-        """Get the details of a system"""
-        response = await requester.get_system(symbol)
-        return cls.from_dict(requester, response.get("data", {}))
+        """Get the details of a system, from the universe store when it holds the system"""
+        data = requester.store.get_system(symbol) if requester.store else None
+        if data is None:
+            response = await requester.get_system(symbol)
+            data = response.get("data", {})
+            if requester.store and data:
+                requester.store.put_system(data)
+        return cls.from_dict(requester, data)
     
+    @classmethod
+    async def iter_all(cls, requester: SpaceMerchantCore) -> AsyncIterator["System"]:
+        """Stream every system in the universe"""
+        async for system in requester.iter_systems():
+            yield cls.from_dict(requester, system)
+
     def __str__(self):
         return f"System({self.symbol}, {self.sector_symbol}, {self.type}, {self.x}, {self.y})"
\ No newline at end of file
@@ -0,0 +1,168 @@
+import heapq
+import math
+from typing import Iterable, Iterator
+
+from spacemerchants.models.system import System
+from spacetradercore.store import SYSTEM, UniverseStore
+
+
+class SystemIndex:
+    """Uniform grid over the galaxy for nearest, radius and bounding box queries on systems
+
+    Systems are bucketed into square cells of ``cell_size`` units, so a query only looks at the cells it overlaps
+    instead of every system. Systems can be added one at a time, e.g. as the crawler finds them, and adding a
+    known system again moves it.
+
+    Args:
+        cell_size (float): The side of a grid cell, about the radius of the usual query works best
+    """
+
+    def __init__(self, cell_size: float = 500.0) -> None:
+        if cell_size <= 0:
+            raise ValueError('cell size must be non zero positive number')
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], dict[str, tuple[float, float]]] = {}
+        self._positions: dict[str, tuple[float, float]] = {}
+        # cells every system lies within, only ever grown so removals keep it a safe bound
+        self._bounds: tuple[int, int, int, int] | None = None
+
+    @classmethod
+    def from_systems(cls, systems: Iterable[System], cell_size: float = 500.0) -> "SystemIndex":
+        """Index system models"""
+        index = cls(cell_size)
+        for system in systems:
+            index.add(system.symbol, system.x, system.y)
+        return index
+
+    @classmethod
+    def from_store(cls, store: UniverseStore, cell_size: float = 500.0) -> "SystemIndex":
+        """Index every system in the universe store, e.g. after a crawl"""
+        index = cls(cell_size)
+        for payload in store.entries(SYSTEM):
+            index.add_payload(payload)
+        return index
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def add(self, symbol: str, x: float, y: float) -> None:
+        """Add a system, or move it if it is already indexed"""
+        self.remove(symbol)
+        cell_x, cell_y = self._cell(x, y)
+        self._cells.setdefault((cell_x, cell_y), {})[symbol] = (x, y)
+        self._positions[symbol] = (x, y)
+        if self._bounds is None:
+            self._bounds = (cell_x, cell_y, cell_x, cell_y)
+        else:
+            low_x, low_y, high_x, high_y = self._bounds
+            self._bounds = (min(low_x, cell_x), min(low_y, cell_y), max(high_x, cell_x), max(high_y, cell_y))
+
+    def add_payload(self, payload: dict) -> None:
+        """Add a system payload as the API returns it, fits the crawler's ``on_system`` callback"""
+        self.add(payload["symbol"], payload["x"], payload["y"])
+
+    def remove(self, symbol: str) -> None:
+        position = self._positions.pop(symbol, None)
+        if position is None:
+            return None
+        cell = self._cell(*position)
+        members = self._cells[cell]
+        del members[symbol]
+        if not members:
+            del self._cells[cell]
+        return None
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._positions
+
+    def position(self, symbol: str) -> tuple[float, float]:
+        """The coordinates of an indexed system"""
+        return self._positions[symbol]
+
+    def _cells_between(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Iterator[dict]:
+        """The members of every occupied cell overlapping a box"""
+        low_x, low_y = self._cell(min_x, min_y)
+        high_x, high_y = self._cell(max_x, max_y)
+        if (high_x - low_x + 1) * (high_y - low_y + 1) > len(self._cells):
+            # a box wider than the occupied grid is cheaper to answer cell by cell
+            for (cell_x, cell_y), members in self._cells.items():
+                if low_x <= cell_x <= high_x and low_y <= cell_y <= high_y:
+                    yield members
+            return
+        for cell_x in range(low_x, high_x + 1):
+            for cell_y in range(low_y, high_y + 1):
+                members = self._cells.get((cell_x, cell_y))
+                if members:
+                    yield members
+
+    def box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> list[str]:
+        """The systems inside a bounding box, edges included"""
+        return [
+            symbol
+            for members in self._cells_between(min_x, min_y, max_x, max_y)
+            for symbol, (x, y) in members.items()
+            if min_x <= x <= max_x and min_y <= y <= max_y
+        ]
+
+    def within(self, x: float, y: float, radius: float) -> list[tuple[str, float]]:
+        """The systems within a radius of a point, nearest first
+
+        Args:
+            x (float): The x coordinate of the point
+            y (float): The y coordinate of the point
+            radius (float): The largest distance to include, e.g. a ship's warp or jump range
+        """
+        found = []
+        for members in self._cells_between(x - radius, y - radius, x + radius, y + radius):
+            for symbol, (other_x, other_y) in members.items():
+                distance = math.hypot(other_x - x, other_y - y)
+                if distance <= radius:
+                    found.append((symbol, distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def nearest(self, x: float, y: float, k: int = 1) -> list[tuple[str, float]]:
+        """The k systems nearest to a point, nearest first
+
+        Rings of cells around the point are searched outwards until no unsearched cell can hold a nearer system.
+
+        Args:
+            x (float): The x coordinate of the point
+            y (float): The y coordinate of the point
+            k (int): How many systems to return at most
+        """
+        if k < 1 or not self._cells:
+            return []
+        center_x, center_y = self._cell(x, y)
+        # the farthest ring that can still hold a system
+        low_x, low_y, high_x, high_y = self._bounds
+        last_ring = max(abs(low_x - center_x), abs(high_x - center_x), abs(low_y - center_y), abs(high_y - center_y))
+        best: list[tuple[float, str]] = []
+        for ring in range(last_ring + 1):
+            for cell in self._ring(center_x, center_y, ring):
+                for symbol, (other_x, other_y) in self._cells.get(cell, {}).items():
+                    item = (-math.hypot(other_x - x, other_y - y), symbol)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+            # every system outside this ring is at least ring cells away
+            if len(best) == k and -best[0][0] <= ring * self.cell_size:
+                break
+        return [(symbol, -distance) for distance, symbol in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _ring(center_x: int, center_y: int, ring: int) -> Iterator[tuple[int, int]]:
+        """The cells exactly ``ring`` cells away from the center cell"""
+        if ring == 0:
+            yield center_x, center_y
+            return
+        for offset in range(-ring, ring + 1):
+            yield center_x + offset, center_y - ring
+            yield center_x + offset, center_y + ring
+        for offset in range(-ring + 1, ring):
+            yield center_x - ring, center_y + offset
+            yield center_x + ring, center_y + offset
@@ -1,48 +1,224 @@
 from datetime import datetime
+from typing import NamedTuple
 
+from spacemerchants.models.identity import canonical
+from spacemerchants.models.lazy import lazy, load
+from spacetradercore.decoding import PageMeta, Record, convert
 from spacetradercore.spacemerchantcore import SpaceMerchantCore
 
 
+class TraitPayload(Record):
+    symbol: str
+    name: str = ""
+    description: str = ""
+
+
+class ModifierPayload(Record):
+    symbol: str
+    name: str = ""
+    description: str = ""
+
+
+class OrbitalPayload(Record):
+    symbol: str
+
+
+class ChartPayload(Record):
+    waypoint_symbol: str = ""
+    submitted_by: str = ""
+    submitted_on: str | None = None
+
+
+class WaypointPayload(Record):
+    """A waypoint as the server sends it, system summaries leave out the traits, modifiers and chart"""
+
+    symbol: str
+    type: str
+    x: int
+    y: int
+    system_symbol: str = ""
+    orbitals: list[OrbitalPayload] = []
+    orbits: str = ""
+    traits: list[TraitPayload] | None = None
+    modifiers: list[ModifierPayload] = []
+    chart: ChartPayload | None = None
+    is_under_construction: bool = False
+
+
+class WaypointPage(Record):
+    """A page of ``list_waypoints_in_system``, decoded straight into waypoint payloads"""
+
+    data: list[WaypointPayload]
+    meta: PageMeta
+
+
+class Trait(NamedTuple):
+    """A trait of a waypoint or faction, e.g. ``MARKETPLACE``"""
+
+    symbol: str
+    name: str
+    description: str
+
+    @classmethod
+    def shared(cls, symbol: str, name: str, description: str) -> "Trait":
+        """The one record of a trait, every waypoint with the same trait shares it"""
+        key = (symbol, name, description)
+        trait = _traits.get(key)
+        if trait is None:
+            trait = _traits[key] = cls(*key)
+        return trait
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Trait":
+        """Create a Trait from a dictionary, every waypoint with the same trait shares one record"""
+        return cls.shared(data["symbol"], data.get("name", ""), data.get("description", ""))
+
+    @classmethod
+    def from_record(cls, payload: TraitPayload) -> "Trait":
+        return cls.shared(payload.symbol, payload.name, payload.description)
+
+
+# traits repeat across thousands of waypoints, the records are immutable so one of each is enough
+_traits: dict[tuple[str, str, str], Trait] = {}
+
+
+class Modifier(NamedTuple):
+    """A temporary condition of a waypoint, e.g. ``UNSTABLE``"""
+
+    symbol: str
+    name: str
+    description: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Modifier":
+        return cls(data["symbol"], data.get("name", ""), data.get("description", ""))
+
+    @classmethod
+    def from_record(cls, payload: ModifierPayload) -> "Modifier":
+        return cls(payload.symbol, payload.name, payload.description)
+
+
+class Chart:
+    """Who charted a waypoint and when, the time is parsed the first time it is read"""
+
+    __slots__ = ("waypoint_symbol", "submitted_by", "_submitted_on", "_data")
+
+    waypoint_symbol: str
+    submitted_by: str
+    submitted_on: datetime | None = lazy(
+        lambda payload: datetime.fromisoformat(payload.submitted_on) if payload.submitted_on else None
+    )
+    _data: ChartPayload | None
+
+    @classmethod
+    def from_record(cls, payload: ChartPayload) -> "Chart":
+        chart = cls()
+        chart.waypoint_symbol = payload.waypoint_symbol
+        chart.submitted_by = payload.submitted_by
+        load(chart, payload, lazy=True)
+        return chart
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Chart":
+        return cls.from_record(convert(data, ChartPayload))
+
+
 class Waypoint:
+    """A waypoint of a system
+
+    Built lazily, the waypoint keeps its payload and builds its orbitals, traits, modifiers and chart the first time
+    they are read, which keeps loading a crawled universe cheap. Listings read with ``WaypointPage`` are decoded
+    straight into payloads, dicts are converted into one. Every requester keeps one live waypoint per symbol,
+    parsing a waypoint again updates it in place.
+    """
+
+    __slots__ = (
+        "symbol",
+        "type",
+        "system_symbol",
+        "x",
+        "y",
+        "orbits",
+        "is_under_construction",
+        "_data",
+        "_orbitals",
+        "_traits",
+        "_modifiers",
+        "_chart",
+        "_requester",
+        "__weakref__",
+    )
+
     symbol: str
     type: str
     system_symbol: str
     x: int
     y: int
-    orbitals: list[str] = []
+    orbitals: list[str] = lazy(lambda payload: [orbital.symbol for orbital in payload.orbitals])
     orbits: str
-    traits: list[str] = []  # TODO: define the type of the traits
-    modifiers: list[str] = []  # TODO: define the type of the modifiers
-    chart: dict[str, str | datetime] = {}  # TODO: define the type of the chart
+    traits: tuple[Trait, ...] = lazy(lambda payload: tuple(Trait.from_record(trait) for trait in payload.traits or ()))
+    modifiers: tuple[Modifier, ...] = lazy(
+        lambda payload: tuple(Modifier.from_record(modifier) for modifier in payload.modifiers)
+    )
+    chart: Chart | None = lazy(lambda payload: Chart.from_record(payload.chart) if payload.chart else None)
     is_under_construction: bool
+    _data: WaypointPayload | None
     _requester: SpaceMerchantCore
 
     @classmethod
-    def from_dict(cls, requester: SpaceMerchantCore, data: dict) -> "Waypoint":
-        waypoint = cls()
+    def from_record(cls, requester: SpaceMerchantCore, payload: WaypointPayload, lazy: bool = False) -> "Waypoint":
+        """Create the waypoint of a payload, or refresh the live waypoint with the same symbol
+
+        Systems only list a summary of their waypoints without traits. A summary leaves the traits, modifiers and
+        chart of a live waypoint as they are.
+
+        Args:
+            requester (SpaceMerchantCore): The core the waypoint sends its requests with
+            payload (WaypointPayload): The waypoint, e.g. an item of a ``WaypointPage``
+            lazy (bool): Build the orbitals, traits, modifiers and chart on first access instead of now
+        """
+        waypoint = canonical(requester, cls, payload.symbol)
+        summary = payload.traits is None and hasattr(waypoint, "_requester")
         waypoint._requester = requester
-        waypoint.symbol = data["symbol"]
-        waypoint.type = data["type"]
-        waypoint.system_symbol = data["system"]
-        waypoint.x = data["x"]
-        waypoint.y = data["y"]
-        waypoint.orbitals = data["orbitals"]
-        waypoint.orbits = data.get("orbits", "")
-        waypoint.traits = data.get("traits", [])
-        waypoint.modifiers = data.get("modifiers", [])
-        waypoint.chart = data.get("chart", {})
-        waypoint.is_under_construction = data.get("isUnderConstruction", False)
+        waypoint.symbol = payload.symbol
+        waypoint.type = payload.type
+        waypoint.system_symbol = payload.system_symbol
+        waypoint.x = payload.x
+        waypoint.y = payload.y
+        waypoint.orbits = payload.orbits
+        if summary:
+            waypoint.orbitals = [orbital.symbol for orbital in payload.orbitals]
+            return waypoint
+        waypoint.is_under_construction = payload.is_under_construction
+        load(waypoint, payload, lazy=lazy)
         return waypoint
 
+    @classmethod
+    def from_dict(cls, requester: SpaceMerchantCore, data: dict, lazy: bool = False) -> "Waypoint":
+        """Create the waypoint of a decoded payload, see ``from_record``
+
+        Args:
+            requester (SpaceMerchantCore): The core the waypoint sends its requests with
+            data (dict): The waypoint payload, with the symbol of its system under ``system``
+            lazy (bool): Build the orbitals, traits, modifiers and chart on first access instead of now
+        """
+        payload = convert(data, WaypointPayload)
+        payload.system_symbol = data["system"]
+        return cls.from_record(requester, payload, lazy=lazy)
+
+    def has_trait(self, symbol: str) -> bool:
+        """Whether the waypoint has the trait with the given symbol"""
+        return any(trait.symbol == symbol for trait in self.traits)
+
     def __str__(self):
         return f"Waypoint({self.symbol}, {self.type}, {self.system_symbol}, {self.x}, {self.y})"
 
     async def shipyard(self):
-        if "SHIPYARD" not in self.traits:
+        if not self.has_trait("SHIPYARD"):
             raise ValueError("This waypoint does not have a shipyard")
         return await self._requester.get_shipyard(self.system_symbol, self.symbol)
 
     async def purchase_ship(self, ship_type: str):
-        if "SHIPYARD" not in self.traits:
+        if not self.has_trait("SHIPYARD"):
             raise ValueError("This waypoint does not have a shipyard")
         pass
@@ -0,0 +1,189 @@
+from typing import Iterable
+
+import numpy as np
+
+from spacemerchants.models.waypoint import Waypoint
+from spacetradercore.store import WAYPOINT, UniverseStore
+from spacetradercore.symbols import symbol_table
+
+WORD_BITS = 64
+
+
+class WaypointTable:
+    """Waypoints stored column by column for vectorized filter, distance and nearest queries
+
+    Coordinates, interned system and type codes and a bitmask of traits are kept in NumPy arrays, one row per
+    waypoint. Traits are numbered as they are first seen and packed 64 to a word, so any number of traits fits.
+    Coordinates are local to a system, distance queries over a table spanning several systems should name one.
+
+    Args:
+        payloads (Iterable[dict]): Waypoint payloads as the API returns them
+    """
+
+    def __init__(self, payloads: Iterable[dict]) -> None:
+        self.systems: list[str] = []
+        self.types: list[str] = []
+        self.traits: list[str] = []
+        self._system_codes: dict[str, int] = {}
+        self._type_codes: dict[str, int] = {}
+        self._trait_codes: dict[str, int] = {}
+
+        symbols, systems, types, xs, ys = [], [], [], [], []
+        trait_rows, trait_codes = [], []
+        for row, payload in enumerate(payloads):
+            symbols.append(payload["symbol"])
+            systems.append(self._intern(self.systems, self._system_codes, payload["systemSymbol"]))
+            types.append(self._intern(self.types, self._type_codes, payload["type"]))
+            xs.append(payload["x"])
+            ys.append(payload["y"])
+            for trait in payload.get("traits", []):
+                trait_rows.append(row)
+                trait_codes.append(self._intern(self.traits, self._trait_codes, trait["symbol"]))
+
+        self.symbols = np.array(symbols, dtype=object)
+        # ids in the shared symbol table, for planners and caches keyed on ids
+        self.ids = np.array(symbol_table.ids(symbols), dtype=np.int32)
+        self.system_codes = np.array(systems, dtype=np.int32)
+        self.type_codes = np.array(types, dtype=np.int16)
+        self.x = np.array(xs, dtype=np.float64)
+        self.y = np.array(ys, dtype=np.float64)
+        self.trait_bits = np.zeros((len(symbols), max(1, -(-len(self.traits) // WORD_BITS))), dtype=np.uint64)
+        if trait_codes:
+            codes = np.array(trait_codes, dtype=np.uint64)
+            np.bitwise_or.at(
+                self.trait_bits,
+                (np.array(trait_rows), (codes // WORD_BITS).astype(np.intp)),
+                np.left_shift(np.uint64(1), codes % np.uint64(WORD_BITS)),
+            )
+        self._rows = {symbol: row for row, symbol in enumerate(symbols)}
+
+    @staticmethod
+    def _intern(values: list[str], codes: dict[str, int], value: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    @classmethod
+    def from_waypoints(cls, waypoints: Iterable[Waypoint]) -> "WaypointTable":
+        """Build the table of waypoint models"""
+        return cls(
+            {
+                "symbol": waypoint.symbol,
+                "systemSymbol": waypoint.system_symbol,
+                "type": waypoint.type,
+                "x": waypoint.x,
+                "y": waypoint.y,
+                "traits": [{"symbol": trait.symbol} for trait in waypoint.traits],
+            }
+            for waypoint in waypoints
+        )
+
+    @classmethod
+    def from_store(cls, store: UniverseStore) -> "WaypointTable":
+        """Build the table of every waypoint in the universe store, e.g. after a crawl"""
+        return cls(store.entries(WAYPOINT))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    def rows(self, symbols: Iterable[str]) -> np.ndarray:
+        """The rows of many waypoints at once"""
+        return np.array([self._rows[symbol] for symbol in symbols], dtype=np.intp)
+
+    def position(self, symbol: str) -> tuple[float, float]:
+        """The coordinates of a waypoint"""
+        row = self._rows[symbol]
+        return float(self.x[row]), float(self.y[row])
+
+    def _trait_mask(self, traits: Iterable[str]) -> np.ndarray | None:
+        """The bitmask words of the given traits, None when a trait is unknown to the table"""
+        words = np.zeros(self.trait_bits.shape[1], dtype=np.uint64)
+        for trait in traits:
+            code = self._trait_codes.get(trait)
+            if code is None:
+                return None
+            words[code // WORD_BITS] |= np.uint64(1 << (code % WORD_BITS))
+        return words
+
+    def filter(
+        self,
+        type: str | None = None,
+        traits: Iterable[str] = (),
+        any_traits: Iterable[str] = (),
+        system: str | None = None,
+    ) -> np.ndarray:
+        """The rows matching every given condition as a boolean mask
+
+        Args:
+            type (str): Only waypoints of this type
+            traits (Iterable[str]): Only waypoints with all of these traits
+            any_traits (Iterable[str]): Only waypoints with at least one of these traits
+            system (str): Only waypoints of this system
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if type is not None:
+            code = self._type_codes.get(type)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.type_codes == code
+        if system is not None:
+            code = self._system_codes.get(system)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.system_codes == code
+        traits = list(traits)
+        if traits:
+            words = self._trait_mask(traits)
+            if words is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= ((self.trait_bits & words) == words).all(axis=1)
+        any_traits = [trait for trait in any_traits if trait in self._trait_codes]
+        if any_traits:
+            mask &= (self.trait_bits & self._trait_mask(any_traits)).any(axis=1)
+        return mask
+
+    def select(self, **conditions) -> list[str]:
+        """The symbols of the waypoints matching the conditions of ``filter``"""
+        return self.symbols[self.filter(**conditions)].tolist()
+
+    def distances(self, x: float, y: float) -> np.ndarray:
+        """The straight line distance from a point to every waypoint"""
+        return np.hypot(self.x - x, self.y - y)
+
+    def within(self, x: float, y: float, radius: float, **conditions) -> list[tuple[str, float]]:
+        """The waypoints within a radius of a point, nearest first
+
+        Args:
+            x (float): The x coordinate of the point
+            y (float): The y coordinate of the point
+            radius (float): The largest distance to include
+            conditions: The conditions of ``filter`` the waypoints must match as well
+        """
+        distances = self.distances(x, y)
+        rows = np.flatnonzero(self.filter(**conditions) & (distances <= radius))
+        rows = rows[np.argsort(distances[rows], kind="stable")]
+        return list(zip(self.symbols[rows].tolist(), distances[rows].tolist()))
+
+    def nearest(self, x: float, y: float, k: int = 1, **conditions) -> list[tuple[str, float]]:
+        """The k waypoints nearest to a point, nearest first
+
+        Args:
+            x (float): The x coordinate of the point
+            y (float): The y coordinate of the point
+            k (int): How many waypoints to return at most
+            conditions: The conditions of ``filter`` the waypoints must match
+        """
+        rows = np.flatnonzero(self.filter(**conditions))
+        if k < 1 or not len(rows):
+            return []
+        distances = self.distances(x, y)[rows]
+        if k < len(rows):
+            nearest = np.argpartition(distances, k - 1)[:k]
+            rows, distances = rows[nearest], distances[nearest]
+        order = np.argsort(distances, kind="stable")
+        return list(zip(self.symbols[rows[order]].tolist(), distances[order].tolist()))
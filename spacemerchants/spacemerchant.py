@@ -3,13 +3,17 @@ import asyncio
 from datetime import datetime
 
 from pprint import pprint
+from typing import AsyncIterator
 
 from loguru import logger
 from spacemerchants.models.agent import Agent
 
 from spacemerchants.models.faction import Faction
+from spacemerchants.models.system import System
 
+from spacetradercore.session import SessionPool
 from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from spacetradercore.store import UniverseStore
 
 logger.add("spacemerchants.log", level="TRACE", rotation="1 day", retention="14 days")
 
@@ -18,30 +22,49 @@ SPACETRADER_KEY = "eyJhbGciOiJSUzI1NiIsInR5cCI6IkpXVCJ9.eyJpZGVudGlmaWVyIjoiUkhZ
 
 
 class SpaceMerchants:
-    """A class to interact with the SpaceTraders API"""
+    """A class to interact with the SpaceTraders API
+
+    Args:
+        key (str): The agent's API key
+        pool (SessionPool, optional): The session pool to borrow from. Defaults to the shared pool.
+        store_path (str, optional): A SQLite file that keeps the universe between runs. Defaults to None.
+    """
 
     last_reset: datetime
     next_reset: datetime
     frequency: str
     version: str
-    _factions: list[Faction] = []
+    _factions: list[Faction]
+    requester: SpaceMerchantCore
+    store: UniverseStore | None
 
     _headers = {
         "Content-Type": "application/json",
     }
 
-    def __init__(self, key: str):
+    def __init__(self, key: str, pool: SessionPool | None = None, store_path: str | None = None):
         self.key = key
+        self.pool = pool
+        self.store_path = store_path
+        self.store = None
+        self._factions = []
 
     async def __aenter__(self):
-        # create a new session
-        self.requester = SpaceMerchantCore(key=self.key)
+        # borrow the shared session
+        if self.store_path:
+            self.store = UniverseStore(self.store_path)
+        self.requester = SpaceMerchantCore(key=self.key, pool=self.pool, store=self.store)
         await self.requester.__aenter__()
+        if self.store:
+            # the store only serves data fetched under the current server reset
+            await self.status()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        # close the session
+        # hand the session back
         await self.requester.close()
+        if self.store:
+            self.store.close()
 
     async def register(self, callsign: str, faction: str, email: str = ""):
         """Register a new user with the SpaceTrader API
@@ -78,12 +101,29 @@ class SpaceMerchants:
         """Get the list of factions available"""
         if self._factions:
             return self._factions
-        async with SpaceMerchantCore(key=self.key) as requester:
-            response = await requester.get_factions()
-        logger.debug(f"SpaceMerchant | factions | {response}")
-        self._factions = [Faction.from_dict(faction) for faction in response.get("data", [])]
+        factions = self.store.get_factions() if self.store else None
+        if factions is None:
+            factions = await self.requester.paginate(self.requester.get_factions)
+            if self.store:
+                self.store.put_factions(factions)
+        logger.debug(f"SpaceMerchant | factions | {len(factions) =:}")
+        self._factions = [Faction.from_dict(faction, self.requester) for faction in factions]
         return self._factions
 
+    async def iter_factions(self) -> AsyncIterator[Faction]:
+        """Stream the factions, the next page downloads while earlier factions are handled"""
+        async for faction in self.requester.iter_factions():
+            yield Faction.from_dict(faction, self.requester)
+
+    async def iter_agents(self) -> AsyncIterator[Agent]:
+        """Stream every public agent"""
+        async for agent in self.requester.iter_agents():
+            yield await Agent.from_dict(self.requester, agent)
+
+    def iter_systems(self) -> AsyncIterator[System]:
+        """Stream every system in the universe"""
+        return System.iter_all(self.requester)
+
     def __str__(self):
         return (
             f"SpaceTraders API Status: {self.status_message}\nLast Reset: {self.last_reset}\nNext Reset: "
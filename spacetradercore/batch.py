@@ -0,0 +1,68 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Iterable, NamedTuple
+
+from loguru import logger
+
+from spacetradercore.errors import SpaceTradersError
+
+
+class BatchResult(NamedTuple):
+    """The outcome of one item of a batch, either its data or the error it failed with"""
+
+    key: str
+    data: dict | None
+    error: Exception | None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def _settle(key: str, call: Callable[[], Awaitable[dict]]) -> BatchResult:
+    try:
+        response = await call()
+    except Exception as e:
+        logger.warning(f"batch | {key} | {e!r}")
+        return BatchResult(key, None, e)
+    if "error" in response:
+        error = SpaceTradersError(response["error"].get("code", 0), response)
+        logger.warning(f"batch | {key} | {error!r}")
+        return BatchResult(key, None, error)
+    return BatchResult(key, response.get("data"), None)
+
+
+async def as_completed(
+    calls: Iterable[tuple[str, Callable[[], Awaitable[dict]]]], window: int
+) -> AsyncIterator[BatchResult]:
+    """Run keyed calls with at most ``window`` started at once and yield their results as they finish
+
+    A failed item is yielded with its error and does not stop the others. Leaving the iteration early cancels the
+    calls still running.
+
+    Args:
+        calls (Iterable[tuple[str, Callable]]): The key of each item and the call that fetches it
+        window (int): Most calls started and not yet finished
+    """
+    if window < 1:
+        raise ValueError('window must be non zero positive number')
+    calls = iter(calls)
+    running: set[asyncio.Task] = set()
+
+    def start() -> bool:
+        for key, call in calls:
+            running.add(asyncio.ensure_future(_settle(key, call)))
+            return True
+        return False
+
+    try:
+        while len(running) < window and start():
+            pass
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                running.discard(task)
+                start()
+                yield task.result()
+    finally:
+        for task in running:
+            task.cancel()
@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Hashable
+
+
+class Freshness(Enum):
+    """How long a GET response stays valid"""
+
+    NEVER = "never"  # agent state and anything an action can change, always fetched
+    SHORT = "short"  # markets, shipyards and construction sites, kept for the short TTL
+    STATIC = "static"  # the shape of the universe, kept until the server resets
+
+
+class ResponseCache:
+    """Bounded cache of GET responses with LRU eviction and per-entry expiry
+
+    Static entries never expire on their own, they are dropped when the server reports a new reset date. Cached
+    responses are shared objects and should be treated as read only.
+
+    Args:
+        max_entries (int): Most responses kept, the least recently used are evicted first
+        short_ttl (float): Seconds a short lived response stays valid
+    """
+
+    def __init__(self, max_entries: int = 4096, short_ttl: float = 30.0) -> None:
+        if max_entries < 1:
+            raise ValueError('max entries must be non zero positive number')
+        self.max_entries = max_entries
+        self.short_ttl = short_ttl
+        self.reset_date: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Freshness, dict]] = OrderedDict()
+
+    def get(self, key: Hashable) -> dict | None:
+        """The cached response for ``key``, None when it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, _, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, freshness: Freshness, value: dict) -> None:
+        """Cache a response for as long as its freshness class allows"""
+        if freshness is Freshness.NEVER:
+            return None
+        expires = float("inf") if freshness is Freshness.STATIC else time.monotonic() + self.short_ttl
+        self._entries[key] = (expires, freshness, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return None
+
+    def invalidate(self, freshness: Freshness | None = None) -> None:
+        """Drop every entry, or only the entries of one freshness class"""
+        if freshness is None:
+            self._entries.clear()
+            return None
+        for key in [key for key, (_, entry_freshness, _) in self._entries.items() if entry_freshness is freshness]:
+            del self._entries[key]
+        return None
+
+    def observe_reset(self, reset_date: str | None) -> None:
+        """Record the server's reset date, static entries are dropped when it changes"""
+        if not reset_date:
+            return None
+        if self.reset_date is not None and reset_date != self.reset_date:
+            self.invalidate(Freshness.STATIC)
+        self.reset_date = reset_date
+        return None
+
+    def stats(self) -> dict[str, int]:
+        """Hit, miss and eviction counters along with the current size"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,52 @@
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+from loguru import logger
+
+
+class ServerClock:
+    """Estimates how far the server's clock is ahead of the local one from the ``Date`` header of responses
+
+    ``Date`` is truncated to the second and read once the response has travelled back, so every sample is at
+    most the true offset. The largest recent sample is the tightest of those bounds and is taken as the offset,
+    it never runs the clock ahead of the server. Arrival and cooldown times are server times, wait for them with
+    ``delay``.
+
+    Args:
+        samples (int): Recent responses the estimate is taken over
+    """
+
+    def __init__(self, samples: int = 32) -> None:
+        if samples < 1:
+            raise ValueError('samples must be non zero positive number')
+        self._samples: deque[float] = deque(maxlen=samples)
+        self.offset = 0.0
+
+    def observe(self, date: str | None, received: float | None = None) -> None:
+        """Take a sample from the ``Date`` header of a response
+
+        Args:
+            date (str): The header, ignored when missing or malformed
+            received (float): The local epoch time the response arrived at, now by default
+        """
+        if not date:
+            return
+        try:
+            server = parsedate_to_datetime(date).timestamp()
+        except (TypeError, ValueError):
+            return
+        self._samples.append(server - (time.time() if received is None else received))
+        offset = max(self._samples)
+        if abs(offset - self.offset) >= 1.0:
+            logger.debug(f"ServerClock | observe | {offset =:}")
+        self.offset = offset
+
+    def now(self) -> datetime:
+        """The current time on the server"""
+        return datetime.now(timezone.utc) + timedelta(seconds=self.offset)
+
+    def delay(self, deadline: datetime) -> float:
+        """Seconds to wait locally until the server reaches a time, 0 once it has passed"""
+        return max(0.0, deadline.timestamp() - time.time() - self.offset)
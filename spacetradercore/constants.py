@@ -5,4 +5,12 @@ SPACETRADER_API_KEY = ("eyJhbGciOiJSUzI1NiIsInR5cCI6IkpXVCJ9.eyJpZGVudGlmaWVyIjo
                        "Sd3ZLM6QvP6QuhV7qj0EFR7IncIZ-TxnosmrU5ZFyccI9CVZ9DKHwQUFCY9Zz2W46qSP-ovZAQhiP8bs_G9IXkmjmrrdpED"
                        "uC-oQTlk9m1L-rfaVaI4v8cy61yUhZBwR5V0nzOqUPPkfJWq2Hnk-JIMWx4PzmsJs_-UKJ742n2hs52jiWF3NuiEnUUwNE-"
                        "h8aPleUUkP55cLMaswtv9WTbasU27WH5Wgi5_pu71en9sYR1CcAAl0DEVj6ekciqmsRBM7KwvH6RwDsXpo9VjAhXEy_kua2"
-                       "YqzgzsvAfr-aFLSsPF7WiRDOYzV3wgLgeITq_W8UoUxnRm7ZAPIw")
\ No newline at end of file
+                       "YqzgzsvAfr-aFLSsPF7WiRDOYzV3wgLgeITq_W8UoUxnRm7ZAPIw")
+
+# https://docs.spacetraders.io/api-guide/rate-limits
+RATE_LIMIT_PER_SECOND = 2
+RATE_LIMIT_BURST = 30
+RATE_LIMIT_BURST_WINDOW = 60
+
+# largest page size the list endpoints accept
+MAX_PAGE_SIZE = 20
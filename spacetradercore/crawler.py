@@ -0,0 +1,224 @@
+import asyncio
+import math
+import time
+from typing import Awaitable, Callable, Iterable
+
+from loguru import logger
+
+from spacetradercore.constants import MAX_PAGE_SIZE
+from spacetradercore.errors import SpaceTradersError
+from spacetradercore.scheduler import Priority, lane
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from spacetradercore.store import JUMPGATE, MARKET, SHIPYARD, SYSTEM, WAYPOINT, UniverseStore
+
+# checkpoint task of the system listing pages that were stored
+SYSTEM_PAGES = "crawl_system_pages"
+
+Listener = Callable[[dict], None]
+
+
+class CrawlProgress:
+    """Progress of one crawl phase with an ETA from the throughput of the current run
+
+    Args:
+        phase (str): The name of the phase
+        total (int): Items in the phase, including those finished by an earlier run
+        resumed (int): Items an earlier run already finished
+    """
+
+    def __init__(self, phase: str, total: int, resumed: int = 0) -> None:
+        self.phase = phase
+        self.total = total
+        self.resumed = resumed
+        self.done = resumed
+        self.failed = 0
+        self.started = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """Items finished per second by this run"""
+        elapsed = time.monotonic() - self.started
+        return (self.done - self.resumed) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float | None:
+        """Seconds until the phase is finished at the current rate, None before anything finished"""
+        remaining = self.total - self.done - self.failed
+        if remaining <= 0:
+            return 0.0
+        rate = self.rate
+        return remaining / rate if rate > 0 else None
+
+    def __str__(self):
+        eta = "?" if self.eta is None else f"{self.eta:.0f}s"
+        return (f"{self.phase} | {self.done}/{self.total} | failed {self.failed} | {self.rate:.2f}/s | "
+                f"eta {eta}")
+
+
+class GalaxyCrawler:
+    """Walks the whole universe and streams what it finds into the universe store
+
+    The crawl lists every system, then the waypoints of every system, then fetches every market, shipyard and jump
+    gate. Everything finished is checkpointed in the store, so a crawl that stops picks up where it left off as
+    long as the server has not reset since. Items that fail are logged and left for the next run.
+
+    Requests run in the background lane of the shared scheduler, at most ``concurrency`` at once.
+
+    Args:
+        requester (SpaceMerchantCore): The core to send requests with
+        store (UniverseStore): The store results and checkpoints go to, bound to the current reset
+        concurrency (int): Most items being fetched at once
+        progress_interval (float): Seconds between progress reports
+        on_system, on_waypoint, on_market, on_shipyard, on_jumpgate (Callable): Called with every payload found
+        on_progress (Callable): Called with the CrawlProgress of the running phase at every report
+    """
+
+    def __init__(self,
+                 requester: SpaceMerchantCore,
+                 store: UniverseStore,
+                 concurrency: int = 4,
+                 progress_interval: float = 10.0,
+                 on_system: Listener | None = None,
+                 on_waypoint: Listener | None = None,
+                 on_market: Listener | None = None,
+                 on_shipyard: Listener | None = None,
+                 on_jumpgate: Listener | None = None,
+                 on_progress: Callable[[CrawlProgress], None] | None = None) -> None:
+        if concurrency < 1:
+            raise ValueError('concurrency must be non zero positive number')
+        self.requester = requester
+        self.store = store
+        self.concurrency = concurrency
+        self.progress_interval = progress_interval
+        self.on_progress = on_progress
+        self._listeners: dict[str, Listener | None] = {
+            SYSTEM: on_system,
+            WAYPOINT: on_waypoint,
+            MARKET: on_market,
+            SHIPYARD: on_shipyard,
+            JUMPGATE: on_jumpgate,
+        }
+        self._reported = 0.0
+
+    async def run(self) -> None:
+        """Crawl every phase, skipping whatever an earlier run already finished"""
+        if not self.store.bound:
+            raise ValueError("The store must be bound to the current server reset before crawling")
+        with lane(Priority.BACKGROUND):
+            await self.crawl_systems()
+            await self.crawl_waypoints()
+            await self.crawl_details()
+
+    def _emit(self, kind: str, payloads: Iterable[dict]) -> None:
+        listener = self._listeners[kind]
+        if listener is not None:
+            for payload in payloads:
+                listener(payload)
+
+    def _report(self, progress: CrawlProgress, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._reported < self.progress_interval:
+            return None
+        self._reported = now
+        logger.info(f"GalaxyCrawler | {progress}")
+        if self.on_progress is not None:
+            self.on_progress(progress)
+        return None
+
+    async def _work(self, progress: CrawlProgress, items: list, handle: Callable[..., Awaitable[None]]) -> None:
+        """Run ``handle`` over the items with a fixed number of workers"""
+        pending = iter(items)
+
+        async def worker():
+            for item in pending:
+                try:
+                    await handle(item)
+                    progress.done += 1
+                except Exception as e:
+                    progress.failed += 1
+                    logger.warning(f"GalaxyCrawler | {progress.phase} | {item} | {e!r}")
+                self._report(progress)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        self._report(progress, force=True)
+
+    @staticmethod
+    def _data(response: dict):
+        if "error" in response:
+            raise SpaceTradersError(response["error"].get("code", 0), response)
+        return response.get("data", [])
+
+    def _store_systems(self, page: int, response: dict) -> None:
+        systems = self._data(response)
+        self.store.put_many(SYSTEM, ((system["symbol"], system["sectorSymbol"], system) for system in systems))
+        self.store.mark_done(SYSTEM_PAGES, str(page))
+        self._emit(SYSTEM, systems)
+
+    async def crawl_systems(self) -> None:
+        """List every system, page by page"""
+        if self.store.has_listing(SYSTEM):
+            return None
+        # the first page is always fetched again, it tells how many pages there are
+        first = await self.requester.list_systems(limit=MAX_PAGE_SIZE, page=1)
+        self._store_systems(1, first)
+        pages = math.ceil(first.get("meta", {}).get("total", 0) / MAX_PAGE_SIZE)
+        done = self.store.done(SYSTEM_PAGES)
+        remaining = [page for page in range(2, pages + 1) if str(page) not in done]
+        progress = CrawlProgress("systems", max(pages, 1), resumed=max(pages, 1) - len(remaining))
+
+        async def fetch(page: int):
+            self._store_systems(page, await self.requester.list_systems(limit=MAX_PAGE_SIZE, page=page))
+
+        await self._work(progress, remaining, fetch)
+        if not progress.failed:
+            self.store.complete_listing(SYSTEM)
+        return None
+
+    async def crawl_waypoints(self) -> None:
+        """List the waypoints of every stored system"""
+        systems = self.store.symbols(SYSTEM)
+        remaining = [symbol for symbol in systems if not self.store.has_listing(WAYPOINT, symbol)]
+        progress = CrawlProgress("waypoints", len(systems), resumed=len(systems) - len(remaining))
+
+        async def fetch(system_symbol: str):
+            waypoints = await self.requester.paginate(self.requester.list_waypoints_in_system, system_symbol)
+            self.store.put_waypoints(system_symbol, waypoints)
+            self._emit(WAYPOINT, waypoints)
+
+        await self._work(progress, remaining, fetch)
+        return None
+
+    def _details(self) -> list[tuple[str, str, str]]:
+        """The market, shipyard and jump gate behind every stored waypoint"""
+        details = []
+        for waypoint in self.store.entries(WAYPOINT):
+            traits = {trait["symbol"] for trait in waypoint.get("traits", [])}
+            targets = []
+            if "MARKETPLACE" in traits:
+                targets.append(MARKET)
+            if "SHIPYARD" in traits:
+                targets.append(SHIPYARD)
+            if waypoint.get("type") == "JUMP_GATE":
+                targets.append(JUMPGATE)
+            details.extend((kind, waypoint["systemSymbol"], waypoint["symbol"]) for kind in targets)
+        return details
+
+    async def crawl_details(self) -> None:
+        """Fetch every market, shipyard and jump gate of the stored waypoints"""
+        details = self._details()
+        remaining = [detail for detail in details if not self.store.has(detail[0], detail[2])]
+        progress = CrawlProgress("details", len(details), resumed=len(details) - len(remaining))
+        fetchers = {
+            MARKET: self.requester.get_market,
+            SHIPYARD: self.requester.get_shipyard,
+            JUMPGATE: self.requester.get_jumpgate,
+        }
+
+        async def fetch(detail: tuple[str, str, str]):
+            kind, system_symbol, waypoint_symbol = detail
+            payload = self._data(await fetchers[kind](system_symbol, waypoint_symbol))
+            self.store.put(kind, waypoint_symbol, payload, parent=system_symbol)
+            self._emit(kind, [payload])
+
+        await self._work(progress, remaining, fetch)
+        return None
@@ -0,0 +1,230 @@
+import copy
+import json
+import types
+import typing
+from typing import Any, Callable, Union
+
+from loguru import logger
+
+from spacetradercore.errors import SpaceTradersError
+
+# turns a response body into python objects
+Decoder = Callable[[bytes], Any]
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if msgspec is not None:
+    _msgspec_decoder = msgspec.json.Decoder()
+
+    def loads(raw: bytes) -> Any:
+        try:
+            return _msgspec_decoder.decode(raw)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    JSON_BACKEND = "msgspec"
+elif orjson is not None:
+    loads = orjson.loads
+    JSON_BACKEND = "orjson"
+else:
+    loads = json.loads
+    JSON_BACKEND = "json"
+
+logger.debug(f"decoding | {JSON_BACKEND =:}")
+
+
+def decode_body(raw: bytes, decoder: Decoder = loads, status: int = 200) -> Any:
+    """Decode a response body
+
+    Empty bodies decode to an empty dict. An error response that is not JSON decodes to an error body carrying
+    its text, proxies in front of the API answer some failures with an html page.
+
+    Args:
+        raw (bytes): The body as it came off the wire
+        decoder (Decoder): Turns the bytes into python objects, the fastest installed JSON library by default
+        status (int): The HTTP status of the response
+
+    Raises:
+        SpaceTradersError: A successful response whose body is not valid JSON, e.g. a truncated one
+    """
+    if not raw:
+        return {}
+    try:
+        return decoder(raw)
+    except ValueError as e:
+        text = raw[:200].decode(errors="replace")
+        if status < 400:
+            raise SpaceTradersError(status, {"error": {"code": status, "message": f"malformed body: {text}"}}) from e
+        return {"error": {"code": status, "message": text}}
+
+
+def _camel(name: str) -> str:
+    first, *rest = name.split("_")
+    return first + "".join(word.title() for word in rest)
+
+
+if msgspec is not None:
+
+    class Record(msgspec.Struct, rename="camel", kw_only=True):
+        """A typed and slotted JSON object, decoded straight from the response body
+
+        Fields are named after the camel case keys of the object in snake case, e.g. ``flight_mode`` for
+        ``flightMode``. Keys without a field are skipped while decoding. Declared with annotations and defaults,
+        records are msgspec structs when msgspec is installed and plain slotted classes otherwise.
+        """
+
+else:
+
+    class _RecordType(type):
+        """Turns the annotations of a record class into its slots and keeps their defaults aside"""
+
+        def __new__(mcs, name: str, bases: tuple, namespace: dict):
+            annotations = namespace.get("__annotations__", {})
+            defaults = {field: namespace.pop(field) for field in annotations if field in namespace}
+            namespace["__slots__"] = tuple(annotations)
+            cls = super().__new__(mcs, name, bases, namespace)
+            cls.__record_fields__ = (*getattr(cls, "__record_fields__", ()), *annotations)
+            cls.__record_defaults__ = {**getattr(cls, "__record_defaults__", {}), **defaults}
+            return cls
+
+    class Record(metaclass=_RecordType):
+        """A typed and slotted JSON object, decoded straight from the response body
+
+        Fields are named after the camel case keys of the object in snake case, e.g. ``flight_mode`` for
+        ``flightMode``. Keys without a field are skipped while decoding. Declared with annotations and defaults,
+        records are msgspec structs when msgspec is installed and plain slotted classes otherwise.
+        """
+
+        def __init__(self, **fields) -> None:
+            for name in self.__record_fields__:
+                if name in fields:
+                    value = fields.pop(name)
+                elif name in self.__record_defaults__:
+                    # empty lists and dicts are defaults too, every record gets its own
+                    value = copy.copy(self.__record_defaults__[name])
+                else:
+                    raise TypeError(f"Missing required argument '{name}'")
+                setattr(self, name, value)
+            if fields:
+                raise TypeError(f"Unexpected keyword argument '{next(iter(fields))}'")
+
+        def __eq__(self, other) -> bool:
+            if type(self) is not type(other):
+                return NotImplemented
+            return all(getattr(self, name) == getattr(other, name) for name in self.__record_fields__)
+
+        def __repr__(self) -> str:
+            fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__record_fields__)
+            return f"{type(self).__name__}({fields})"
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _builder(annotation: Any) -> Callable[[Any], Any]:
+    """Builds the value of a field from decoded JSON, scalars and plain dicts are taken as they are"""
+    if isinstance(annotation, type) and issubclass(annotation, Record):
+        return _record_builder(annotation)
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        (item,) = typing.get_args(annotation)
+        build_item = _builder(item)
+        if build_item is _identity:
+            return _identity
+        return lambda value: [build_item(entry) for entry in value]
+    if origin in (Union, types.UnionType):
+        options = [option for option in typing.get_args(annotation) if option is not type(None)]
+        build_option = _builder(options[0]) if len(options) == 1 else _identity
+        if build_option is _identity:
+            return _identity
+        return lambda value: None if value is None else build_option(value)
+    return _identity
+
+
+def _record_builder(cls: type) -> Callable[[Any], Any]:
+    """Builds a record from a decoded JSON object, the stdlib path of ``record_decoder`` and ``convert``"""
+    build = _builders.get(cls)
+    if build is not None:
+        return build
+    fields: list[tuple[str, str, Callable[[Any], Any]]] = []
+
+    def build(value: Any) -> Any:
+        if not isinstance(value, dict):
+            raise ValueError(f"Expected an object for {cls.__name__}, got {type(value).__name__}")
+        try:
+            return cls(**{name: build_field(value[key]) for name, key, build_field in fields if key in value})
+        except TypeError as e:
+            raise ValueError(f"{cls.__name__}: {e}") from e
+
+    # registered before the fields are resolved, so records can nest themselves
+    _builders[cls] = build
+    fields.extend(
+        (name, _camel(name), _builder(annotation)) for name, annotation in typing.get_type_hints(cls).items()
+    )
+    return build
+
+
+_builders: dict[type, Callable[[Any], Any]] = {}
+
+
+def record_decoder(cls: type) -> Decoder:
+    """A decoder of response bodies into a record type, e.g. a page of ships
+
+    With msgspec the bytes are decoded into the records directly. Without it they are decoded by the installed
+    JSON library and the records built from the result.
+
+    Raises:
+        ValueError: The body is not JSON or does not fit the record
+    """
+    decoder = _record_decoders.get(cls)
+    if decoder is None:
+        if msgspec is not None:
+            typed = msgspec.json.Decoder(cls)
+
+            def decoder(raw: bytes) -> Any:
+                try:
+                    return typed.decode(raw)
+                except msgspec.DecodeError as e:
+                    raise ValueError(str(e)) from e
+        else:
+            build = _record_builder(cls)
+
+            def decoder(raw: bytes) -> Any:
+                return build(loads(raw))
+
+        _record_decoders[cls] = decoder
+    return decoder
+
+
+_record_decoders: dict[type, Decoder] = {}
+
+
+def convert(value: Any, cls: type) -> Any:
+    """Build a record from an already decoded JSON object, e.g. a payload read from the universe store
+
+    Raises:
+        ValueError: The object does not fit the record
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.convert(value, cls)
+        except msgspec.ValidationError as e:
+            raise ValueError(str(e)) from e
+    return _record_builder(cls)(value)
+
+
+class PageMeta(Record):
+    """Where a page sits in a paginated listing"""
+
+    total: int
+    page: int = 1
+    limit: int = 10
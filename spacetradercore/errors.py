@@ -0,0 +1,15 @@
+class SpaceTradersError(Exception):
+    """An error response the SpaceTraders API kept returning after every retry allowed
+
+    Args:
+        status (int): The HTTP status of the last response
+        body (dict): The decoded body of the last response
+    """
+
+    def __init__(self, status: int, body: dict) -> None:
+        error = body.get("error", {}) if isinstance(body, dict) else {}
+        self.status = status
+        self.code = error.get("code", status)
+        self.message = error.get("message", "")
+        self.data = error.get("data", {})
+        super().__init__(f"{self.status} | {self.code} | {self.message}")
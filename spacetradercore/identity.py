@@ -0,0 +1,33 @@
+from typing import Any, TypeVar
+from weakref import WeakValueDictionary
+
+T = TypeVar("T")
+
+
+class IdentityMap:
+    """One live object per type and key, e.g. one Ship per ship symbol
+
+    Parsing code asks the map for the canonical object and updates it in place, so every part of the program holds
+    the same current view. Objects are held weakly and leave the map once nothing else uses them, which keeps
+    memory flat across refreshes. The classes must support weak references.
+    """
+
+    def __init__(self) -> None:
+        self._objects: WeakValueDictionary[tuple[type, str], Any] = WeakValueDictionary()
+
+    def get(self, cls: type[T], key: str) -> T | None:
+        """The live object of a type with the given key, None if there is none"""
+        return self._objects.get((cls, key))
+
+    def canonical(self, cls: type[T], key: str, *args) -> T:
+        """The live object of a type with the given key, created with ``cls(*args)`` if there is none yet"""
+        obj = self._objects.get((cls, key))
+        if obj is None:
+            obj = self._objects[(cls, key)] = cls(*args)
+        return obj
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def clear(self) -> None:
+        self._objects.clear()
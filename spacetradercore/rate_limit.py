@@ -1,97 +1,167 @@
 import asyncio
-import math
 import time
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
 
 class AsyncRateLimiter:
+    """Token bucket rate limiter with a sustained rate and a separate burst pool
+
+    Requests draw from the sustained bucket first. It holds at most ``rate_limit`` tokens and refills at
+    ``rate_limit`` tokens per second. Once it is empty, requests fall back to the burst pool, which holds
+    ``burst`` tokens and refills completely over ``burst_window`` seconds. A waiter sleeps until the moment
+    the next token is due instead of polling, so an idle limiter costs nothing.
+    """
+
     def __init__(self,
-                 rate_limit: int,
-                 concurrency_limit: int) -> None:
-        if not rate_limit or rate_limit < 1:
+                 rate_limit: float,
+                 concurrency_limit: int,
+                 burst: int = 0,
+                 burst_window: float = 60.0) -> None:
+        if not rate_limit or rate_limit <= 0:
             raise ValueError('rate limit must be non zero positive number')
         if not concurrency_limit or concurrency_limit < 1:
             raise ValueError('concurrent limit must be non zero positive number')
+        if burst < 0:
+            raise ValueError('burst must be a positive number or zero')
+        if burst and burst_window <= 0:
+            raise ValueError('burst window must be non zero positive number')
 
         self.rate_limit = rate_limit
-        self.tokens_queue = asyncio.Queue(rate_limit)
-        self.tokens_consumer_task = asyncio.create_task(self.consume_tokens())
+        self.burst = burst
+        self.burst_window = burst_window
         self.semaphore = asyncio.Semaphore(concurrency_limit)
-
-    async def add_token(self) -> None:
-        await self.tokens_queue.put(1)
-        return None
-
-    async def consume_tokens(self):
-        try:
-            consumption_rate = 1 / self.rate_limit
-            last_consumption_time = 0
-
+        self.headers: dict = {}
+        self._lock = asyncio.Lock()
+        self._tokens = float(rate_limit)
+        self._burst_tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Credit both buckets with the tokens earned since the last refill"""
+        if now <= self._updated:
+            return
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.rate_limit, self._tokens + elapsed * self.rate_limit)
+        if self.burst:
+            self._burst_tokens = min(self.burst, self._burst_tokens + elapsed * self.burst / self.burst_window)
+
+    def _next_token_delay(self) -> float:
+        """Seconds until either bucket holds a whole token again"""
+        delay = (1 - self._tokens) / self.rate_limit
+        if self.burst:
+            delay = min(delay, (1 - self._burst_tokens) * self.burst_window / self.burst)
+        return max(delay, 0.0)
+
+    def _take_token(self) -> bool:
+        # a small tolerance keeps float rounding from costing an extra wake-up
+        if self._tokens >= 1 - 1e-9:
+            self._tokens -= 1
+            return True
+        if self._burst_tokens >= 1 - 1e-9:
+            self._burst_tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """Wait until a request slot is available and take it
+
+        Waiters queue on a lock so slots are handed out in arrival order.
+        """
+        async with self._lock:
             while True:
-                if self.tokens_queue.empty():
-                    await asyncio.sleep(consumption_rate)
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
                     continue
-
-                current_consumption_time = time.monotonic()
-                total_tokens = self.tokens_queue.qsize()
-                tokens_to_consume = self.get_tokens_amount_to_consume(
-                    consumption_rate,
-                    current_consumption_time,
-                    last_consumption_time,
-                    total_tokens
-                )
-
-                for i in range(0, tokens_to_consume):
-                    self.tokens_queue.get_nowait()
-
-                last_consumption_time = time.monotonic()
-
-                await asyncio.sleep(consumption_rate)
-        except asyncio.CancelledError:
-            # you can ignore the error here and deal with closing this task later but this is not advised
-            raise
-        except Exception as e:
-            # do something with the error and re-raise
-            raise e
-
-    @staticmethod
-    def get_tokens_amount_to_consume(consumption_rate, current_consumption_time, last_consumption_time, total_tokens):
-        time_from_last_consumption = current_consumption_time - last_consumption_time
-        calculated_tokens_to_consume = math.floor(time_from_last_consumption / consumption_rate)
-        tokens_to_consume = min(total_tokens, calculated_tokens_to_consume)
-        return tokens_to_consume
+                self._refill(now)
+                if self._take_token():
+                    return None
+                await asyncio.sleep(self._next_token_delay())
 
     @asynccontextmanager
     async def throttle(self):
-        await self.semaphore.acquire()
-        await self.add_token()
-        try:
+        async with self.semaphore:
+            await self.acquire()
             yield
-        finally:
-            self.semaphore.release()
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if exc_type:
-            # log error here and safely close the class
-            pass
-
         await self.close()
 
     async def close(self) -> None:
-        if self.tokens_consumer_task and not self.tokens_consumer_task.cancelled():
-            try:
-                self.tokens_consumer_task.cancel()
-                await self.tokens_consumer_task
-            except asyncio.CancelledError:
-                # we ignore this exception but it is good to log and signal the task was cancelled
-                pass
-            except Exception as e:
-                # log here and deal with the exception
-                raise e
+        """Nothing runs in the background, kept so callers can manage the limiter as a resource"""
+        return None
+
+    def pause(self, seconds: float) -> None:
+        """Hold every queued and future request for ``seconds``
+
+        Both buckets are emptied so requests resume at the sustained rate once the pause is over.
+        """
+        if seconds <= 0:
+            return None
+        resume_at = time.monotonic() + seconds
+        if resume_at <= self._paused_until:
+            return None
+        self._paused_until = resume_at
+        self._tokens = 0.0
+        self._burst_tokens = 0.0
+        self._updated = resume_at
+        return None
 
     async def update(self, headers: dict) -> None:
+        """Adjust pacing to the rate limit state reported in a response's headers
+
+        Args:
+            headers (dict): The response headers, ``x-ratelimit-*`` and ``retry-after`` are used
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
         self.headers = headers
+
+        per_second = _to_float(headers.get("x-ratelimit-limit-per-second"))
+        if per_second and per_second > 0 and per_second != self.rate_limit:
+            self.rate_limit = per_second
+            self._tokens = min(self._tokens, per_second)
+
+        burst = _to_float(headers.get("x-ratelimit-limit-burst"))
+        if burst is not None and burst >= 0 and burst != self.burst:
+            self.burst = int(burst)
+            self._burst_tokens = min(self._burst_tokens, self.burst)
+        burst_window = _to_float(headers.get("x-ratelimit-burst-time"))
+        if burst_window and burst_window > 0:
+            self.burst_window = burst_window
+
+        remaining = _to_float(headers.get("x-ratelimit-remaining"))
+        if remaining is not None:
+            self._burst_tokens = min(self._burst_tokens, max(remaining, 0.0))
+            if remaining <= 0:
+                self.pause(_seconds_until(headers.get("x-ratelimit-reset")))
+
+        retry_after = _to_float(headers.get("retry-after"))
+        if retry_after:
+            self.pause(retry_after)
         return None
+
+
+def _to_float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _seconds_until(timestamp: str | None) -> float:
+    """Seconds from now until an ISO timestamp sent by the server, zero if it is missing or past"""
+    if not timestamp:
+        return 0.0
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return 0.0
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,99 @@
+import asyncio
+import random
+
+from aiohttp import ClientConnectorError, ClientError
+
+# failures that happened before the request reached the server, safe to retry for any verb
+NOT_SENT_ERRORS: tuple[type[BaseException], ...] = (ClientConnectorError,)
+# failures that may have happened after the server received the request
+TRANSPORT_ERRORS: tuple[type[BaseException], ...] = (ClientError, asyncio.TimeoutError)
+
+
+class RetryPolicy:
+    """How a failed request is retried
+
+    Retries back off exponentially with full jitter. A policy that is not idempotent only retries failures that
+    prove the server never saw the request: connection errors and 429s. Anything else could repeat a purchase or
+    a jump.
+
+    Args:
+        max_attempts (int): Attempts allowed including the first one
+        base_delay (float): Backoff ceiling in seconds for the first retry, it doubles with every retry
+        max_delay (float): Largest backoff ceiling in seconds
+        retry_statuses (frozenset[int]): Server error statuses worth retrying
+        idempotent (bool): Whether sending the request twice is harmless
+    """
+
+    def __init__(self,
+                 max_attempts: int = 4,
+                 base_delay: float = 0.5,
+                 max_delay: float = 8.0,
+                 retry_statuses: frozenset[int] = frozenset({500, 502, 503, 504}),
+                 idempotent: bool = True) -> None:
+        if max_attempts < 1:
+            raise ValueError('max attempts must be non zero positive number')
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self.idempotent = idempotent
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after the given failed attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def retries_error(self, error: BaseException) -> bool:
+        """Whether a request that raised this error may be sent again"""
+        if isinstance(error, NOT_SENT_ERRORS):
+            return True
+        return self.idempotent and isinstance(error, TRANSPORT_ERRORS)
+
+    def retries_status(self, status: int) -> bool:
+        """Whether a request answered with this status may be sent again"""
+        if status == 429:
+            return True
+        return self.idempotent and status in self.retry_statuses
+
+    def __repr__(self):
+        return f"RetryPolicy({self.max_attempts}, idempotent={self.idempotent})"
+
+
+class RetryBudget:
+    """Caps retries at a share of the requests sent, so retries cannot pile onto an overloaded server
+
+    Every request deposits ``ratio`` of a token, up to ``max_tokens``, and every retry withdraws a whole one. The
+    budget starts with ``reserve`` tokens so a quiet process can still retry.
+
+    Args:
+        ratio (float): Retries allowed per request sent
+        reserve (float): Tokens available before any request was sent
+        max_tokens (float): Most tokens the budget saves up
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10, max_tokens: float = 50) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = float(reserve)
+        self.retries = 0
+        self.denied = 0
+
+    def deposit(self) -> None:
+        """Credit the budget for a request about to be sent"""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend a token on a retry, False when the budget is exhausted"""
+        if self.tokens < 1:
+            self.denied += 1
+            return False
+        self.tokens -= 1
+        self.retries += 1
+        return True
+
+
+DEFAULT_RETRY_POLICIES = {
+    "GET": RetryPolicy(max_attempts=5),
+    "PATCH": RetryPolicy(),
+    "DELETE": RetryPolicy(),
+    "POST": RetryPolicy(max_attempts=3, idempotent=False),
+}
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+
+from loguru import logger
+
+from spacetradercore.rate_limit import AsyncRateLimiter
+
+
+class Priority(IntEnum):
+    """Request lanes, lower values are served first"""
+
+    CRITICAL = 0  # ship actions that earn money or move the fleet
+    NORMAL = 1  # contract, market and ship status reads
+    BACKGROUND = 2  # bulk refreshes of the universe
+
+
+# lane forced on every request made in the current context, see ``lane``
+current_lane: ContextVar[Priority | None] = ContextVar("current_lane", default=None)
+
+
+@contextmanager
+def lane(priority: Priority):
+    """Send every request made inside the block, including from tasks it starts, in the given lane
+
+    Args:
+        priority (Priority): The lane to use instead of each request's own
+    """
+    token = current_lane.set(priority)
+    try:
+        yield
+    finally:
+        current_lane.reset(token)
+
+
+DEFAULT_LANE_WEIGHTS = {
+    Priority.CRITICAL: 8,
+    Priority.NORMAL: 3,
+    Priority.BACKGROUND: 1,
+}
+
+
+class RequestScheduler:
+    """Hands out rate limiter slots to requests waiting in priority lanes
+
+    Lanes share the limiter's budget by weighted round robin. In every round each lane may take as many slots
+    as its weight, and higher priority lanes go first. A request that has waited longer than ``max_wait``
+    seconds is served next whatever its lane, so background traffic is delayed but never starved. The
+    dispatcher only runs while requests are queued.
+    """
+
+    def __init__(self,
+                 rate_limiter: AsyncRateLimiter,
+                 weights: dict[Priority, int] | None = None,
+                 max_wait: float = 10.0) -> None:
+        weights = {**DEFAULT_LANE_WEIGHTS, **(weights or {})}
+        if any(weight < 1 for weight in weights.values()):
+            raise ValueError('lane weights must be non zero positive numbers')
+        if max_wait < 0:
+            raise ValueError('max wait must be a positive number or zero')
+
+        self.rate_limiter = rate_limiter
+        self.weights = weights
+        self.max_wait = max_wait
+        self._lanes: dict[Priority, deque[tuple[float, asyncio.Future]]] = {lane: deque() for lane in Priority}
+        self._credits = dict(weights)
+        self._dispatcher: asyncio.Task | None = None
+
+    def _discard_abandoned(self, lane: Priority) -> None:
+        """Drop waiters at the head of a lane that were cancelled before they got a slot"""
+        queue = self._lanes[lane]
+        while queue and queue[0][1].done():
+            queue.popleft()
+
+    def _pending(self) -> bool:
+        for lane in Priority:
+            self._discard_abandoned(lane)
+            if self._lanes[lane]:
+                return True
+        return False
+
+    def _next_lane(self) -> Priority | None:
+        """Pick the lane that gets the next slot"""
+        waiting = [lane for lane in Priority if self._lanes[lane]]
+        if not waiting:
+            return None
+
+        now = time.monotonic()
+        oldest = min(waiting, key=lambda lane: self._lanes[lane][0][0])
+        if now - self._lanes[oldest][0][0] >= self.max_wait:
+            return oldest
+
+        for _ in range(2):
+            for lane in waiting:
+                if self._credits[lane] > 0:
+                    self._credits[lane] -= 1
+                    return lane
+            # every waiting lane spent its share of this round
+            self._credits = dict(self.weights)
+        return waiting[0]
+
+    def _grant(self) -> bool:
+        """Wake the waiter chosen for the slot that was just acquired"""
+        if not self._pending():
+            return False
+        lane = self._next_lane()
+        _, future = self._lanes[lane].popleft()
+        future.set_result(None)
+        return True
+
+    async def _dispatch(self) -> None:
+        semaphore = self.rate_limiter.semaphore
+        try:
+            while self._pending():
+                await semaphore.acquire()
+                try:
+                    await self.rate_limiter.acquire()
+                except BaseException:
+                    semaphore.release()
+                    raise
+                if not self._grant():
+                    semaphore.release()
+        except Exception as e:
+            logger.exception(f"RequestScheduler | _dispatch | {e}")
+            for lane in Priority:
+                while self._lanes[lane]:
+                    _, future = self._lanes[lane].popleft()
+                    if not future.done():
+                        future.set_exception(e)
+        finally:
+            self._dispatcher = None
+
+    @asynccontextmanager
+    async def throttle(self, priority: Priority = Priority.NORMAL):
+        """Wait for a slot in the given lane and hold it for the duration of the block
+
+        Args:
+            priority (Priority): The lane the request waits in
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._lanes[priority].append((time.monotonic(), future))
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was granted just as the waiter was cancelled
+                self.rate_limiter.semaphore.release()
+            raise
+        try:
+            yield
+        finally:
+            self.rate_limiter.semaphore.release()
+
+    def queued(self) -> dict[Priority, int]:
+        """Number of requests waiting in each lane"""
+        return {lane: sum(not future.done() for _, future in self._lanes[lane]) for lane in Priority}
+
+    async def close(self) -> None:
+        """Stop the dispatcher, waiters still queued are cancelled"""
+        dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.cancel()
+            try:
+                await dispatcher
+            except asyncio.CancelledError:
+                pass
+        for lane in Priority:
+            while self._lanes[lane]:
+                self._lanes[lane].popleft()[1].cancel()
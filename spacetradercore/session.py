@@ -0,0 +1,151 @@
+import asyncio
+from weakref import WeakKeyDictionary
+
+from aiohttp import ClientSession, TCPConnector
+from loguru import logger
+
+from spacetradercore.cache import ResponseCache
+from spacetradercore.clock import ServerClock
+from spacetradercore.constants import (
+    RATE_LIMIT_PER_SECOND,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_BURST_WINDOW,
+)
+from spacetradercore.rate_limit import AsyncRateLimiter
+from spacetradercore.retry import RetryBudget
+from spacetradercore.scheduler import Priority, RequestScheduler
+from spacetradercore.singleflight import SingleFlight
+from spacetradercore.timers import TimerService
+
+
+class _LoopResources:
+    """The session, limiter, scheduler, timers and in-flight requests of one event loop"""
+
+    def __init__(self, pool: "SessionPool") -> None:
+        self.rate_limiter = AsyncRateLimiter(
+            pool.rate_limit, pool.max_in_flight, burst=pool.burst, burst_window=pool.burst_window
+        )
+        self.scheduler = RequestScheduler(self.rate_limiter, weights=pool.lane_weights, max_wait=pool.max_lane_wait)
+        self.single_flight = SingleFlight()
+        self.timers = TimerService(pool.clock)
+        self.session: ClientSession | None = None
+        self.users = 0
+
+
+class SessionPool:
+    """Connection pool, rate limiter and request scheduler shared by every SpaceMerchantCore
+
+    The first core to enter opens the session and the last one to leave closes it, so every core reuses the same
+    keep-alive connections, draws from the same rate and retry budgets and reads the same response cache. asyncio
+    objects cannot outlive their event loop, so each running loop gets its own set. Settings apply to sessions
+    opened after they are changed.
+
+    aiohttp already enables TCP_NODELAY on every connection it opens.
+
+    Args:
+        pool_size (int): Most connections open at once, 0 for no limit
+        keepalive_timeout (float): Seconds an idle connection is kept open for reuse
+        dns_cache_ttl (int): Seconds a resolved address is cached
+        max_in_flight (int): Most requests waiting on the server at once
+        rate_limit (float): Sustained requests per second
+        burst (int): Requests allowed above the sustained rate
+        burst_window (float): Seconds the burst pool takes to refill
+        lane_weights (dict[Priority, int]): Share of the rate budget each scheduler lane gets per round
+        max_lane_wait (float): Seconds a request may wait before it is served ahead of its lane
+        retry_budget (RetryBudget): Retries allowed across every core
+        cache_size (int): Most GET responses kept in the response cache
+        short_ttl (float): Seconds short lived responses such as markets stay cached
+    """
+
+    def __init__(self,
+                 pool_size: int = 10,
+                 keepalive_timeout: float = 60.0,
+                 dns_cache_ttl: int = 600,
+                 max_in_flight: int = 4,
+                 rate_limit: float = RATE_LIMIT_PER_SECOND,
+                 burst: int = RATE_LIMIT_BURST,
+                 burst_window: float = RATE_LIMIT_BURST_WINDOW,
+                 lane_weights: dict[Priority, int] | None = None,
+                 max_lane_wait: float = 10.0,
+                 retry_budget: RetryBudget | None = None,
+                 cache_size: int = 4096,
+                 short_ttl: float = 30.0) -> None:
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.max_in_flight = max_in_flight
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.burst_window = burst_window
+        self.lane_weights = lane_weights
+        self.max_lane_wait = max_lane_wait
+        self.retry_budget = retry_budget or RetryBudget()
+        self.response_cache = ResponseCache(max_entries=cache_size, short_ttl=short_ttl)
+        self.clock = ServerClock()
+        self._resources: WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources] = WeakKeyDictionary()
+
+    def _current(self) -> _LoopResources:
+        loop = asyncio.get_running_loop()
+        resources = self._resources.get(loop)
+        if resources is None:
+            resources = self._resources[loop] = _LoopResources(self)
+        return resources
+
+    @property
+    def rate_limiter(self) -> AsyncRateLimiter:
+        """The rate limiter shared on the running event loop"""
+        return self._current().rate_limiter
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """The request scheduler shared on the running event loop"""
+        return self._current().scheduler
+
+    @property
+    def single_flight(self) -> SingleFlight:
+        """The GET requests in flight on the running event loop, shared between cores"""
+        return self._current().single_flight
+
+    @property
+    def timers(self) -> TimerService:
+        """The arrival and cooldown timers of the running event loop"""
+        return self._current().timers
+
+    def _connector(self) -> TCPConnector:
+        return TCPConnector(
+            limit=self.pool_size,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+
+    async def acquire(self) -> ClientSession:
+        """Borrow the shared session, opening it if nobody holds it yet"""
+        resources = self._current()
+        if resources.session is None or resources.session.closed:
+            logger.debug(f"SessionPool | acquire | opening session | {self.pool_size =:}")
+            resources.session = ClientSession(connector=self._connector())
+        resources.users += 1
+        return resources.session
+
+    async def release(self) -> None:
+        """Hand the shared session back, the last user to leave closes it"""
+        resources = self._current()
+        resources.users = max(resources.users - 1, 0)
+        if resources.users == 0:
+            await self.close()
+
+    async def close(self) -> None:
+        """Close the session and stop the scheduler and timers of the running event loop"""
+        resources = self._current()
+        await resources.scheduler.close()
+        await resources.timers.close()
+        if resources.session is not None:
+            logger.debug("SessionPool | close | closing session")
+            await resources.session.close()
+            resources.session = None
+        resources.users = 0
+
+
+# the pool every SpaceMerchantCore uses unless it is given its own
+default_pool = SessionPool()
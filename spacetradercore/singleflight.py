@@ -0,0 +1,59 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+def request_key(key: str, endpoint: str, params: dict) -> tuple:
+    """A hashable identity for a request, equal for requests that would get the same response
+
+    Args:
+        key (str): The API key the request is sent with
+        endpoint (str): The endpoint of the request
+        params (dict): The query parameters of the request
+    """
+    return (
+        key,
+        endpoint,
+        tuple(sorted((name, tuple(value) if isinstance(value, list) else value) for name, value in params.items())),
+    )
+
+
+class SingleFlight:
+    """Shares one in-flight call between every caller asking for the same key
+
+    A caller that arrives while a call for its key is running waits for that call and gets the same result instead
+    of starting its own. The call is shielded, so a caller giving up does not cancel it for the others. Results are
+    shared objects and should be treated as read only.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.saved = 0
+
+    def _land(self, key: Hashable, flight: asyncio.Future) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # mark the error as retrieved when every caller already gave up on it
+            flight.exception()
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``call`` unless a call for ``key`` is already in flight, then wait for its result
+
+        Args:
+            key (Hashable): Identifies calls that produce the same result
+            call (Callable): Starts the call when nothing is in flight for the key
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(call())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+            self.calls += 1
+        else:
+            self.saved += 1
+        return await asyncio.shield(flight)
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        return len(self._flights)
@@ -1,85 +1,422 @@
+import asyncio
+import math
+import re
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+
 from aiohttp import ClientSession
 
+from spacetradercore.batch import BatchResult, as_completed
+from spacetradercore.cache import Freshness, ResponseCache
+from spacetradercore.clock import ServerClock
+from spacetradercore.decoding import Decoder, decode_body, loads, record_decoder
+from spacetradercore.errors import SpaceTradersError
+from spacetradercore.identity import IdentityMap
 from spacetradercore.rate_limit import AsyncRateLimiter
-from spacetradercore.constants import SPACETRADER_BASE_URL
+from spacetradercore.retry import DEFAULT_RETRY_POLICIES, RetryPolicy
+from spacetradercore.scheduler import Priority, RequestScheduler, current_lane
+from spacetradercore.session import SessionPool, default_pool
+from spacetradercore.singleflight import SingleFlight, request_key
+from spacetradercore.store import UniverseStore
+from spacetradercore.symbols import system_symbol
+from spacetradercore.timers import TimerService
+from spacetradercore.constants import SPACETRADER_BASE_URL, MAX_PAGE_SIZE
 
 from loguru import logger
 
 
 class SpaceMerchantCore:
-    """A class to interact with the SpaceTraders API"""
+    """A class to interact with the SpaceTraders API
+
+    Response bodies are read as bytes and decoded by ``decoder``, the fastest JSON library installed unless
+    another one is given. Reads given a record ``model`` are decoded straight into it by ``record_decoder``.
+    Models parsed for this core share its ``identity_map``, one live object per symbol. Every market read with
+    trade goods is handed to the ``market_listeners``.
+    """
 
     _headers = {
         "Content-Type": "application/json",
     }
 
-    def __init__(self, key: str = ""):
+    session: ClientSession
+
+    def __init__(self,
+                 key: str = "",
+                 pool: SessionPool | None = None,
+                 store: UniverseStore | None = None,
+                 decoder: Decoder = loads,
+                 record_decoder: Callable[[type], Decoder] = record_decoder):
         self.key = key
-        self.rate_limiter = AsyncRateLimiter(2, 1)
+        self.decoder = decoder
+        self.record_decoder = record_decoder
+        self.identity_map = IdentityMap()
+        self.pool = pool or default_pool
+        self.store = store
+        self._headers = dict(self._headers)
+        self.retry_policies = dict(DEFAULT_RETRY_POLICIES)
+        self._endpoint_retry_policies: list[tuple[str, re.Pattern, RetryPolicy]] = []
+        # called with every market read that lists trade goods, e.g. to keep a price history
+        self.market_listeners: list[Callable[[dict], None]] = []
+
+    @property
+    def rate_limiter(self) -> AsyncRateLimiter:
+        """The rate limiter shared through the session pool"""
+        return self.pool.rate_limiter
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """The request scheduler shared through the session pool"""
+        return self.pool.scheduler
+
+    @property
+    def single_flight(self) -> SingleFlight:
+        """The GET requests in flight, shared through the session pool"""
+        return self.pool.single_flight
+
+    @property
+    def clock(self) -> ServerClock:
+        """The estimate of the server's clock, shared through the session pool"""
+        return self.pool.clock
+
+    @property
+    def timers(self) -> TimerService:
+        """The arrival and cooldown timers, shared through the session pool"""
+        return self.pool.timers
+
+    @property
+    def cache(self) -> ResponseCache:
+        """The GET response cache shared through the session pool"""
+        return self.pool.response_cache
 
     async def __aenter__(self) -> "SpaceMerchantCore":
-        # create a new session
+        # borrow the shared session
         logger.debug("SpaceMerchantCore | __aenter__")
         self._headers["Authorization"] = f"Bearer {self.key}"
-        self.session = ClientSession()
+        self.session = await self.pool.acquire()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        # close the session
+        # hand the session back
         await self.close()
 
     async def close(self):
-        """Close the session"""
-        await self.session.close()
+        """Hand the session back to the pool, which closes it once no core uses it"""
+        await self.pool.release()
+
+    def set_retry_policy(self, method: str, endpoint: str, policy: RetryPolicy) -> None:
+        """Retry requests to matching endpoints with their own policy
+
+        Args:
+            method (str): The HTTP method the policy applies to
+            endpoint (str): A regular expression the whole endpoint must match, e.g. ``my/ships/[^/]+/purchase``
+            policy (RetryPolicy): The policy to use
+        """
+        self._endpoint_retry_policies.insert(0, (method.upper(), re.compile(endpoint), policy))
+
+    def retry_policy(self, method: str, endpoint: str) -> RetryPolicy:
+        """The retry policy of a request, endpoint policies win over the policy of the method"""
+        for policy_method, pattern, policy in self._endpoint_retry_policies:
+            if policy_method == method and pattern.fullmatch(endpoint):
+                return policy
+        return self.retry_policies[method]
+
+    async def _send(
+        self, method: str, endpoint: str, priority: Priority, decoder: Decoder | None = None, **kwargs
+    ) -> tuple[int, dict]:
+        """Send a request once through the request scheduler and decode the response
+
+        Error responses are always decoded by the core's ``decoder``, a typed ``decoder`` only reads successes.
+        """
+        async with self.scheduler.throttle(priority):
+            async with self.session.request(
+                method, SPACETRADER_BASE_URL + endpoint, headers=self._headers, **kwargs
+            ) as response:
+                await self.rate_limiter.update(response.headers)
+                self.clock.observe(response.headers.get("Date"))
+                if decoder is None or response.status >= 400:
+                    decoder = self.decoder
+                return response.status, decode_body(await response.read(), decoder, response.status)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str = "",
+        priority: Priority = Priority.NORMAL,
+        decoder: Decoder | None = None,
+        **kwargs,
+    ) -> dict:
+        """Send a request to the SpaceTraders API, retrying failures its retry policy allows
+
+        The rate limit headers of every response are handed to the limiter. A 429 pauses the limiter until the
+        server is ready again. Every attempt waits for its own slot in the scheduler, and retries other than
+        429s are paid for from the pool's retry budget.
+
+        Args:
+            method (str): The HTTP method of the request
+            endpoint (str): The endpoint to send the request to
+            priority (Priority): The scheduler lane the request waits in, unless a ``lane`` block forces another
+            decoder (Decoder): Decodes successful responses, the core's ``decoder`` by default
 
-    async def _post(self, endpoint: str = "", data: dict = {}) -> dict:
+        Raises:
+            SpaceTradersError: The server kept answering with a 429 or a server error
+        """
+        forced_lane = current_lane.get()
+        if forced_lane is not None:
+            priority = forced_lane
+        policy = self.retry_policy(method, endpoint)
+        budget = self.pool.retry_budget
+        budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                status, body = await self._send(method, endpoint, priority, decoder, **kwargs)
+            except Exception as e:
+                if attempt >= policy.max_attempts or not policy.retries_error(e) or not budget.withdraw():
+                    raise
+                delay = policy.backoff(attempt)
+                logger.warning(f"SpaceMerchantCore | _request | {method} {endpoint} | {attempt =:} | {delay =:.2f} | "
+                               f"{e!r}")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if status == 429:
+                error = body.get("error", {}).get("data", {}) if isinstance(body, dict) else {}
+                retry_after = error.get("retryAfter")
+                if retry_after:
+                    self.rate_limiter.pause(float(retry_after))
+                logger.warning(f"SpaceMerchantCore | _request | rate limited | {method} {endpoint} | {attempt =:} | "
+                               f"{retry_after =:}")
+                if attempt >= policy.max_attempts:
+                    raise SpaceTradersError(status, body)
+                attempt += 1
+                continue
+
+            if status >= 500:
+                if attempt >= policy.max_attempts or not policy.retries_status(status) or not budget.withdraw():
+                    raise SpaceTradersError(status, body)
+                delay = policy.backoff(attempt)
+                logger.warning(f"SpaceMerchantCore | _request | {method} {endpoint} | {status =:} | {attempt =:} | "
+                               f"{delay =:.2f}")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            return body
+
+    async def _post(self, endpoint: str = "", data: dict = {}, priority: Priority = Priority.CRITICAL) -> dict:
         """Send a POST request to the SpaceTraders API
 
         Args:
             url (str): The URL to send the request to
             data (dict): The data to send with the request
+            priority (Priority): The scheduler lane, ship actions are critical by default
         """
-        async with self.session.post(
-            SPACETRADER_BASE_URL + endpoint, headers=self._headers, json=data
-        ) as response:
-            return await response.json()
+        return await self._request("POST", endpoint, priority, json=data)
 
-    async def _get(self, endpoint: str = "", params: dict = {}) -> dict:
+    async def _get(
+        self,
+        endpoint: str = "",
+        params: dict = {},
+        priority: Priority = Priority.NORMAL,
+        freshness: Freshness = Freshness.NEVER,
+        model: type | None = None,
+    ) -> dict:
         """Send a GET request to the SpaceTraders API
 
+        Responses are served from the cache while their freshness class allows. Identical GET requests that are
+        in flight at the same time share one HTTP call and its response.
+
         Args:
             url (str): The URL to send the request to
+            priority (Priority): The scheduler lane the request waits in
+            freshness (Freshness): How long the response may be cached
+            model (type): A record type to decode a successful response into instead of a dict
         """
-        async with self.rate_limiter.throttle():
-            async with self.session.get(
-                SPACETRADER_BASE_URL + endpoint, headers=self._headers, params=params
-            ) as response:
-                return await response.json()
+        key = request_key(self.key, endpoint, params)
+        decoder = None
+        if model is not None:
+            # typed and plain reads of an endpoint decode differently, they share neither calls nor cache entries
+            key = (*key, model)
+            decoder = self.record_decoder(model)
+        if freshness is not Freshness.NEVER:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        response = await self.single_flight.do(
+            key, lambda: self._request("GET", endpoint, priority, decoder, params=params)
+        )
+        if freshness is not Freshness.NEVER and not (isinstance(response, dict) and "error" in response):
+            self.cache.put(key, freshness, response)
+        return response
 
-    async def _patch(self, endpoint: str = "", data: dict = {}) -> dict:
+    async def _patch(self, endpoint: str = "", data: dict = {}, priority: Priority = Priority.CRITICAL) -> dict:
         """Send a PUT request to the SpaceTraders API
 
         Args:
             endpoint (str): The endpoint to send the request to
             data (dict): The data to send with the request
+            priority (Priority): The scheduler lane the request waits in
         """
-        async with self.rate_limiter.throttle():
-            async with self.session.patch(
-                SPACETRADER_BASE_URL + endpoint, headers=self._headers, json=data
-            ) as response:
-                return await response.json()
+        return await self._request("PATCH", endpoint, priority, json=data)
 
-    async def _delete(self, endpoint: str = "") -> dict:
+    async def _delete(self, endpoint: str = "", priority: Priority = Priority.CRITICAL) -> dict:
         """Send a DELETE request to the SpaceTraders API
 
         Args:
             endpoint (str): The URL to send the request to
+            priority (Priority): The scheduler lane the request waits in
         """
-        async with self.rate_limiter.throttle():
-            async with self.session.delete(
-                SPACETRADER_BASE_URL + endpoint, headers=self._headers
-            ) as response:
-                return await response.json()
+        return await self._request("DELETE", endpoint, priority)
+
+    async def paginate(
+        self, method: Callable[..., Awaitable[dict]], *args, limit: int = MAX_PAGE_SIZE, **kwargs
+    ) -> list[dict]:
+        """Fetch every item of a paginated list endpoint
+
+        The first page tells how many items there are. The remaining pages are then requested concurrently, the
+        scheduler keeps the burst within the rate limit, and the items are merged in page order.
+
+        Args:
+            method (Callable): A list method of this class that accepts ``limit`` and ``page``
+            limit (int): The page size, defaults to the largest the API allows
+
+        Returns:
+            list[dict]: The items of every page
+
+        Raises:
+            SpaceTradersError: A page came back with an error, partial listings are never returned
+        """
+        first = await method(*args, limit=limit, page=1, **kwargs)
+        items = list(self._page_items(first))
+        total = self._page_total(first, len(items))
+        pages = math.ceil(total / limit)
+        logger.debug(f"SpaceMerchantCore | paginate | {method.__name__} | {total =:} | {pages =:}")
+        if pages > 1:
+            responses = await asyncio.gather(
+                *(method(*args, limit=limit, page=page, **kwargs) for page in range(2, pages + 1))
+            )
+            for response in responses:
+                items.extend(self._page_items(response))
+        return items
+
+    @staticmethod
+    def _page_items(response: dict) -> list[dict]:
+        """The items of a page, raising on an error body rather than reading it as an empty page"""
+        if not isinstance(response, dict):
+            # a typed page, errors are never decoded into records
+            return response.data
+        if "error" in response:
+            raise SpaceTradersError(response["error"].get("code", 0), response)
+        return response.get("data", [])
+
+    @staticmethod
+    def _page_total(response: dict, default: int) -> int:
+        """The number of items over every page of a listing"""
+        if not isinstance(response, dict):
+            return response.meta.total
+        return response.get("meta", {}).get("total", default)
+
+    async def iter_pages(
+        self, method: Callable[..., Awaitable[dict]], *args, limit: int = MAX_PAGE_SIZE, **kwargs
+    ) -> AsyncIterator[dict]:
+        """Yield the items of a paginated list endpoint one at a time
+
+        The next page is requested in the background while the items of the current one are consumed, so only
+        two pages are ever held in memory.
+
+        Args:
+            method (Callable): A list method of this class that accepts ``limit`` and ``page``
+            limit (int): The page size, defaults to the largest the API allows
+        """
+        page = 1
+        pending = asyncio.ensure_future(method(*args, limit=limit, page=page, **kwargs))
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
+                items = self._page_items(response)
+                if items and page * limit < self._page_total(response, 0):
+                    page += 1
+                    pending = asyncio.ensure_future(method(*args, limit=limit, page=page, **kwargs))
+                for item in items:
+                    yield item
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def batch(
+        self,
+        method: Callable[[str, str], Awaitable[dict]],
+        waypoint_symbols: Iterable[str],
+        window: int | None = None,
+    ) -> AsyncIterator[BatchResult]:
+        """Call a per-waypoint read for many waypoints, yielding results as they finish
+
+        Requests are started a window at a time and wait in the scheduler like any other, so a batch runs as fast
+        as the rate limit allows without crowding out other lanes. A failed waypoint is yielded with its error and
+        the rest of the batch carries on.
+
+        Args:
+            method (Callable): A method of this class taking a system and a waypoint symbol, e.g. ``get_market``
+            waypoint_symbols (Iterable[str]): The waypoints to read
+            window (int): Most requests started at once, twice the pool's in flight limit by default
+        """
+        window = window or 2 * self.pool.max_in_flight
+        calls = (
+            (symbol, lambda symbol=symbol: method(system_symbol(symbol), symbol)) for symbol in waypoint_symbols
+        )
+        return as_completed(calls, window)
+
+    def get_markets(self, waypoint_symbols: Iterable[str], window: int | None = None) -> AsyncIterator[BatchResult]:
+        """Read the markets of many waypoints, yielding them as they arrive"""
+        return self.batch(self.get_market, waypoint_symbols, window)
+
+    def get_shipyards(self, waypoint_symbols: Iterable[str], window: int | None = None) -> AsyncIterator[BatchResult]:
+        """Read the shipyards of many waypoints, yielding them as they arrive"""
+        return self.batch(self.get_shipyard, waypoint_symbols, window)
+
+    def get_waypoints(self, waypoint_symbols: Iterable[str], window: int | None = None) -> AsyncIterator[BatchResult]:
+        """Read many waypoints, yielding them as they arrive"""
+        return self.batch(self.get_waypoint, waypoint_symbols, window)
+
+    def iter_agents(self) -> AsyncIterator[dict]:
+        """Stream every public agent"""
+        return self.iter_pages(self.list_agents)
+
+    def iter_contracts(self) -> AsyncIterator[dict]:
+        """Stream every contract of the current agent"""
+        return self.iter_pages(self.list_contracts)
+
+    def iter_factions(self) -> AsyncIterator[dict]:
+        """Stream every faction"""
+        return self.iter_pages(self.get_factions)
+
+    def iter_ships(self, model: type | None = None) -> AsyncIterator[dict]:
+        """Stream every ship of the current agent
+
+        Args:
+            model (type): A record type to decode each page into, see ``list_ships``
+        """
+        return self.iter_pages(self.list_ships, model=model)
+
+    def iter_systems(self) -> AsyncIterator[dict]:
+        """Stream every system in the universe"""
+        return self.iter_pages(self.list_systems)
+
+    def iter_waypoints_in_system(
+        self, system_symbol: str, traits: list[str] = [], type: str = "", model: type | None = None
+    ) -> AsyncIterator[dict]:
+        """Stream the waypoints of a system
+
+        Args:
+            system_symbol (str): The symbol of the system to get waypoints
+            traits (list[str]): Only waypoints with these traits
+            type (str): Only waypoints of this type
+            model (type): A record type to decode each page into, see ``list_waypoints_in_system``
+        """
+        return self.iter_pages(
+            self.list_waypoints_in_system, system_symbol, traits=traits, type=type, model=model
+        )
 
     async def register(self, callsign: str, faction: str = "COSMIC", email: str = ""):
         """Register a new user with the SpaceTrader API
@@ -93,8 +430,17 @@ class SpaceMerchantCore:
         return await self._post(endpoint="register", data=data)
 
     async def status(self):
-        """Get the status of the SpaceTrader API"""
-        return await self._get("")
+        """Get the status of the SpaceTrader API
+
+        A new reset date drops every cached response that was only valid until the reset, and binds the universe
+        store to the new reset.
+        """
+        response = await self._get("")
+        reset_date = response.get("resetDate")
+        self.cache.observe_reset(reset_date)
+        if self.store is not None and reset_date:
+            self.store.bind(reset_date)
+        return response
 
     async def get_agent(self):
         """Get the user's information"""
@@ -105,7 +451,7 @@ class SpaceMerchantCore:
     async def list_agents(self, limit: int = 20, page: int = 1):
         """Get the list of agents"""
         params = {"limit": limit, "page": page}
-        return await self._get(endpoint="agents", params=params)
+        return await self._get(endpoint="agents", params=params, priority=Priority.BACKGROUND)
 
     async def get_public_agent(self, agent_symbol: str):
         """Get the public information of an agent
@@ -113,7 +459,9 @@ class SpaceMerchantCore:
         Args:
             agent_symbol (str): The symbol of the agent to get the information of
         """
-        return await self._get(endpoint="agents", params={"agentSymbol": agent_symbol})
+        return await self._get(
+            endpoint="agents", params={"agentSymbol": agent_symbol}, priority=Priority.BACKGROUND
+        )
 
     async def list_contracts(self, limit: int = 20, page: int = 1):
         """Get the list of contracts
@@ -183,7 +531,9 @@ class SpaceMerchantCore:
             page (int): The page of factions to get
         """
         params = {"limit": limit, "page": page}
-        return await self._get(endpoint="factions", params=params)
+        return await self._get(
+            endpoint="factions", params=params, priority=Priority.BACKGROUND, freshness=Freshness.STATIC
+        )
 
     async def get_faction(self, faction_symbol: str) -> dict:
         """Get the information of a faction
@@ -194,14 +544,17 @@ class SpaceMerchantCore:
         Returns:
             dict: The information of the faction
         """
-        return await self._get(endpoint=f"factions/{faction_symbol}")
+        return await self._get(
+            endpoint=f"factions/{faction_symbol}", priority=Priority.BACKGROUND, freshness=Freshness.STATIC
+        )
 
-    async def list_ships(self, limit: int = 20, page: int = 1) -> dict:
+    async def list_ships(self, limit: int = 20, page: int = 1, model: type | None = None) -> dict:
         """Get the list of ships
 
         Args:
             limit (int): The number of ships to get
             page (int): The page of ships to get
+            model (type): A record type to decode the page into, e.g. a page of typed ships, a dict otherwise
 
         Returns:
             dict: The list of ships
@@ -209,7 +562,7 @@ class SpaceMerchantCore:
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to get the list of ships")
         params = {"limit": limit, "page": page}
-        return await self._get(endpoint="my/ships", params=params)
+        return await self._get(endpoint="my/ships", params=params, model=model)
 
     async def get_ship(self, ship_symbol: str) -> dict:
         """Get the information of a ship
@@ -222,7 +575,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to get the ship information")
-        return await self._get(endpoint=f"ships/{ship_symbol}")
+        return await self._get(endpoint=f"my/ships/{ship_symbol}")
 
     async def purchase_ship(self, ship_type: str, waypoint_symbol: str) -> dict:
         """Purchase a ship
@@ -250,7 +603,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to get the ship cargo")
-        return await self._get(endpoint=f"ships/{ship_symbol}/cargo")
+        return await self._get(endpoint=f"my/ships/{ship_symbol}/cargo")
 
     async def orbit_ship(self, ship_symbol: str) -> dict:
         """Orbit a ship
@@ -264,7 +617,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to orbit a ship")
-        return await self._post(endpoint=f"ships/{ship_symbol}/orbit")
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/orbit")
 
     async def ship_refine(self, ship_symbol: str, data: dict) -> dict:
         """Refine a ship
@@ -278,7 +631,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to refine a ship")
-        return await self._post(endpoint=f"ships/{ship_symbol}", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/refine", data=data)
 
     async def create_chart(self, ship_symbol: str) -> dict:
         """Create a chart
@@ -291,7 +644,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to create a chart")
-        return await self._post(endpoint=f"ships/{ship_symbol}/chart")
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/chart")
 
     async def get_ship_cooldown(self, ship_symbol: str) -> dict:
         """Get the cooldown of a ship
@@ -304,7 +657,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to get the ship cooldown")
-        return await self._get(endpoint=f"ships/{ship_symbol}/cooldown")
+        return await self._get(endpoint=f"my/ships/{ship_symbol}/cooldown")
 
     async def dock_ship(self, ship_symbol: str) -> dict:
         """Dock a ship
@@ -317,7 +670,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to dock a ship")
-        return await self._post(endpoint=f"ships/{ship_symbol}/dock")
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/dock")
 
     async def create_survey(self, ship_symbol: str) -> dict:
         """Create a survey
@@ -330,7 +683,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to create a survey")
-        return await self._post(endpoint=f"ships/{ship_symbol}/survey")
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/survey")
 
     async def extract_resources(self, ship_symbol: str, data: dict) -> dict:
         """Extract resources
@@ -344,7 +697,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to extract resources")
-        return await self._post(endpoint=f"ships/{ship_symbol}/extract", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/extract", data=data)
 
     async def siphon_resources(self, ship_symbol: str) -> dict:
         """Siphon resources
@@ -357,7 +710,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to siphon resources")
-        return await self._post(endpoint=f"ships/{ship_symbol}/siphon")
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/siphon")
 
     async def extract_resources_with_survey(
         self, ship_symbol: str, data: dict
@@ -375,7 +728,7 @@ class SpaceMerchantCore:
             raise ValueError(
                 "You must set the API key to extract resources with survey"
             )
-        return await self._post(endpoint=f"ships/{ship_symbol}/survey/extract", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/survey/extract", data=data)
 
     async def jettison_cargo(self, ship_symbol: str, data: dict) -> dict:
         """Jettison cargo
@@ -389,7 +742,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to jettison cargo")
-        return await self._post(endpoint=f"ships/{ship_symbol}/jettison", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/jettison", data=data)
 
     async def jump_ship(self, ship_symbol: str, data: dict) -> dict:
         """Jump ship
@@ -403,7 +756,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to jump ship")
-        return await self._post(endpoint=f"ships/{ship_symbol}/jump", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/jump", data=data)
 
     async def navigate_ship(self, ship_symbol: str, data: dict) -> dict:
         """Navigate ship
@@ -419,7 +772,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to navigate ship")
         if not data.get("waypointSymbol"):
             raise ValueError("You must set the waypointSymbol to navigate ship")
-        return await self._post(endpoint=f"ships/{ship_symbol}/navigate", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/navigate", data=data)
 
     async def patch_ship_nav(self, ship_symbol: str, data: dict) -> dict:
         """Patch ship navigation
@@ -435,7 +788,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to patch ship navigation")
         if not data.get("flightMode"):
             raise ValueError("You must set the flight mode to patch ship navigation")
-        return await self._patch(endpoint=f"ships/{ship_symbol}/navigate", data=data)
+        return await self._patch(endpoint=f"my/ships/{ship_symbol}/navigate", data=data)
 
     async def get_ship_nav(self, ship_symbol: str) -> dict:
         """Get ship navigation
@@ -448,7 +801,7 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to get ship navigation")
-        return await self._get(endpoint=f"ships/{ship_symbol}/nav")
+        return await self._get(endpoint=f"my/ships/{ship_symbol}/nav")
 
     async def warp_ship(self, ship_symbol: str, data: dict) -> dict:
         """
@@ -464,7 +817,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to warp ship")
         if not data.get("waypointSymbol"):
             raise ValueError("You must set the destination to warp ship")
-        return await self._post(endpoint=f"ships/{ship_symbol}/warp", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/warp", data=data)
 
     async def sell_cargo(self, ship_symbol: str, data: dict) -> dict:
         """Sell cargo
@@ -478,9 +831,9 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to sell cargo")
-        if not data.get("symbol") or not data.get("quantity"):
+        if not data.get("symbol") or not data.get("units"):
             raise ValueError("You must set the good and quantity to sell cargo")
-        return await self._post(endpoint=f"ships/{ship_symbol}/sell", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/sell", data=data)
 
     async def scan_system(self, ship_symbol: str) -> dict:
         """Scan system
@@ -495,7 +848,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to scan system")
         if not ship_symbol:
             raise ValueError("You must set the ship symbol to scan system")
-        return await self._post(endpoint=f"ships/{ship_symbol}/scan")
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/scan")
 
     async def scan_waypoints(self, ship_symbol: str) -> dict:
         """Scan waypoints
@@ -510,7 +863,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to scan waypoints")
         if not ship_symbol:
             raise ValueError("You must set the ship symbol to scan waypoints")
-        return await self._post(endpoint=f"ships/{ship_symbol}/scan/waypoints")
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/scan/waypoints")
 
     async def refuel_ship(self, ship_symbol: str, data: dict) -> dict:
         """Refuel ship
@@ -524,13 +877,12 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to refuel ship")
-        if not data.get("units") or not data.get("fromCargo"):
-            raise ValueError("You must set the fuel to refuel ship")
-        if type(data.get("units")) != int and type(data.get("fromCargo")) != bool:
+        # without units the tank is filled, without fromCargo the fuel is bought at the market
+        if not isinstance(data.get("units", 0), int) or not isinstance(data.get("fromCargo", False), bool):
             raise ValueError(
                 "You must set units as an integer and fromCargo as a boolean"
             )
-        return await self._post(endpoint=f"ships/{ship_symbol}/refuel", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/refuel", data=data)
 
     async def purchase_cargo(self, ship_symbol: str, data: dict) -> dict:
         """Purchase cargo
@@ -544,9 +896,9 @@ class SpaceMerchantCore:
         """
         if not self._headers.get("Authorization"):
             raise ValueError("You must set the API key to purchase cargo")
-        if not data.get("symbol") or not data.get("quantity"):
+        if not data.get("symbol") or not data.get("units"):
             raise ValueError("You must set the good and quantity to purchase cargo")
-        return await self._post(endpoint=f"ships/{ship_symbol}/purchase", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/purchase", data=data)
 
     async def transfer_cargo(self, ship_symbol: str, data: dict) -> dict:
         """Transfer cargo
@@ -562,7 +914,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to transfer cargo")
         if not data.get("tradeSymbol") or not data.get("units"):
             raise ValueError("You must set the good and quantity to transfer cargo")
-        return await self._post(endpoint=f"ships/{ship_symbol}/transfer", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/transfer", data=data)
 
     async def negotiate_contract(self, ship_symbol: str) -> dict:
         """Negotiate contract
@@ -577,7 +929,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to negotiate contract")
         if not ship_symbol:
             raise ValueError("You must set the ship symbol to negotiate contract")
-        return await self._post(endpoint=f"ships/{ship_symbol}/negotiate")
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/negotiate")
 
     async def get_mounts(self, ship_symbol: str) -> dict:
         """Get mounts
@@ -592,7 +944,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to get mounts")
         if not ship_symbol:
             raise ValueError("You must set the ship symbol to get mounts")
-        return await self._get(endpoint=f"ships/{ship_symbol}/mounts")
+        return await self._get(endpoint=f"my/ships/{ship_symbol}/mounts")
 
     async def install_mount(self, ship_symbol: str, data: dict) -> dict:
         """Install mount
@@ -608,7 +960,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to install mount")
         if not data.get("symbol"):
             raise ValueError("You must set the mount to install mount")
-        return await self._post(endpoint=f"ships/{ship_symbol}/mounts", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/mounts", data=data)
 
     async def remove_mount(self, ship_symbol: str, data: dict) -> dict:
         """Remove mount
@@ -624,7 +976,7 @@ class SpaceMerchantCore:
             raise ValueError("You must set the API key to remove mount")
         if not data.get("symbol"):
             raise ValueError("You must set the mount to remove mount")
-        return await self._post(endpoint=f"ships/{ship_symbol}/mounts", data=data)
+        return await self._post(endpoint=f"my/ships/{ship_symbol}/mounts", data=data)
 
     async def list_systems(self, limit: int = 20, page: int = 1) -> dict:
         """List systems
@@ -636,7 +988,9 @@ class SpaceMerchantCore:
         Returns:
             Coroutine: The list of systems
         """
-        return await self._get(endpoint="systems", params={"limit": limit, "page": page})
+        return await self._get(
+            endpoint="systems", params={"limit": limit, "page": page}, priority=Priority.BACKGROUND
+        )
 
     async def get_system(self, system_symbol: str) -> dict:
         """Get system
@@ -647,7 +1001,7 @@ class SpaceMerchantCore:
         Returns:
             Coroutine: The information of the system
         """
-        return await self._get(endpoint=f"systems/{system_symbol}")
+        return await self._get(endpoint=f"systems/{system_symbol}", freshness=Freshness.STATIC)
 
     async def list_waypoints_in_system(
         self,
@@ -656,6 +1010,7 @@ class SpaceMerchantCore:
         page: int = 1,
         traits: list[str] = [],
         type: str = "",
+        model: type | None = None,
     ) -> dict:
         """List waypoints in system
 
@@ -663,6 +1018,7 @@ class SpaceMerchantCore:
             system_symbol (str): The symbol of the system to get waypoints
             limit (int): The number of waypoints to get
             page (int): The page of waypoints to get
+            model (type): A record type to decode the page into, e.g. a page of typed waypoints, a dict otherwise
 
         Returns:
             Coroutine: The list of waypoints
@@ -670,6 +1026,8 @@ class SpaceMerchantCore:
         return await self._get(
             endpoint=f"systems/{system_symbol}/waypoints",
             params={"limit": limit, "page": page, "type": type, "traits": traits},
+            priority=Priority.BACKGROUND,
+            model=model,
         )
 
     async def get_waypoint(self, system_symbol: str, waypoint_symbol: str) -> dict:
@@ -683,7 +1041,7 @@ class SpaceMerchantCore:
             Coroutine: The information of the waypoint
         """
         return await self._get(
-            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}"
+            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}", freshness=Freshness.STATIC
         )
 
     async def get_market(self, system_symbol: str, waypoint_symbol: str) -> dict:
@@ -696,9 +1054,14 @@ class SpaceMerchantCore:
         Returns:
             Coroutine: The information of the market
         """
-        return await self._get(
-            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}/market"
+        response = await self._get(
+            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}/market", freshness=Freshness.SHORT
         )
+        market = response.get("data")
+        if market and market.get("tradeGoods"):
+            for listener in self.market_listeners:
+                listener(market)
+        return response
 
     async def get_shipyard(self, system_symbol: str, waypoint_symbol: str) -> dict:
         """Get shipyard
@@ -711,22 +1074,29 @@ class SpaceMerchantCore:
             Coroutine: The information of the shipyard
         """
         return await self._get(
-            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}/shipyard"
+            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}/shipyard", freshness=Freshness.SHORT
         )
 
-    async def get_jumpgate(self, system_symbol: str, waypoint_symbol: str) -> dict:
-        """Get jumpgate
+    async def get_jumpgate(self, system_symbol: str, waypoint_symbol: str, force: bool = False) -> dict:
+        """Get jumpgate, from the universe store when it holds the gate
 
         Args:
             system_symbol (str): The symbol of the system to get jumpgate
             waypoint_symbol (str): The symbol of the waypoint to get jumpgate
+            force (bool): Ask the server even when the store holds the gate
 
         Returns:
             Coroutine: The information of the jumpgate
         """
-        return await self._get(
-            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}/jump-gate"
+        data = self.store.get_jumpgate(waypoint_symbol) if self.store and not force else None
+        if data is not None:
+            return {"data": data}
+        response = await self._get(
+            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}/jump-gate", freshness=Freshness.STATIC
         )
+        if self.store and "data" in response:
+            self.store.put_jumpgate(waypoint_symbol, response["data"])
+        return response
 
     async def get_construction_site(
         self, system_symbol: str, waypoint_symbol: str
@@ -741,7 +1111,8 @@ class SpaceMerchantCore:
             Coroutine: The information of the construction site
         """
         return await self._get(
-            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}/construction"
+            endpoint=f"systems/{system_symbol}/waypoints/{waypoint_symbol}/construction",
+            freshness=Freshness.SHORT,
         )
 
     async def supply_construction_site(
@@ -0,0 +1,244 @@
+import json
+import sqlite3
+from typing import Callable, Iterable, Iterator
+
+from loguru import logger
+
+from spacetradercore.symbols import system_symbol
+
+SYSTEM = "system"
+WAYPOINT = "waypoint"
+FACTION = "faction"
+JUMPGATE = "jumpgate"
+MARKET = "market"
+SHIPYARD = "shipyard"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    parent TEXT NOT NULL DEFAULT '',
+    reset_date TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (kind, symbol)
+);
+CREATE INDEX IF NOT EXISTS entries_by_parent ON entries (kind, parent);
+CREATE TABLE IF NOT EXISTS listings (
+    kind TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    reset_date TEXT NOT NULL,
+    PRIMARY KEY (kind, parent)
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    task TEXT NOT NULL,
+    key TEXT NOT NULL,
+    reset_date TEXT NOT NULL,
+    PRIMARY KEY (task, key)
+);
+"""
+
+
+class UniverseStore:
+    """SQLite store of the parts of the universe that only change when the server resets
+
+    Every row is tagged with the reset date it was fetched under. Binding the store to the server's current reset
+    date deletes rows from earlier resets, so a reset invalidates everything at once. Until the store is bound it
+    neither returns nor keeps anything.
+
+    A listing records that every child of a parent was stored, e.g. all waypoints of a system, so a partial set
+    is never mistaken for the whole. Checkpoints record the finished steps of long running tasks such as a crawl.
+
+    Args:
+        path (str): The database file, ``:memory:`` keeps it in memory
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.reset_date: str | None = None
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def bind(self, reset_date: str) -> None:
+        """Use the store for the given server reset, dropping everything stored under another reset
+
+        Args:
+            reset_date (str): The ``resetDate`` reported by the server status
+        """
+        if reset_date == self.reset_date:
+            return None
+        with self._db:
+            deleted = self._db.execute("DELETE FROM entries WHERE reset_date != ?", (reset_date,)).rowcount
+            self._db.execute("DELETE FROM listings WHERE reset_date != ?", (reset_date,))
+            self._db.execute("DELETE FROM checkpoints WHERE reset_date != ?", (reset_date,))
+        logger.debug(f"UniverseStore | bind | {reset_date =:} | {deleted =:}")
+        self.reset_date = reset_date
+        return None
+
+    @property
+    def bound(self) -> bool:
+        return self.reset_date is not None
+
+    def get(self, kind: str, symbol: str) -> dict | None:
+        """The stored payload of one entry"""
+        if not self.bound:
+            return None
+        row = self._db.execute(
+            "SELECT payload FROM entries WHERE kind = ? AND symbol = ? AND reset_date = ?",
+            (kind, symbol, self.reset_date),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, kind: str, symbol: str, payload: dict, parent: str = "") -> None:
+        """Store the payload of one entry"""
+        self.put_many(kind, [(symbol, parent, payload)])
+
+    def put_many(self, kind: str, entries: Iterable[tuple[str, str, dict]]) -> None:
+        """Store many entries of one kind at once
+
+        Args:
+            kind (str): The kind of the entries
+            entries (Iterable[tuple[str, str, dict]]): The symbol, parent and payload of every entry
+        """
+        if not self.bound:
+            return None
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (kind, symbol, parent, reset_date, payload) VALUES (?, ?, ?, ?, ?)",
+                ((kind, symbol, parent, self.reset_date, json.dumps(payload)) for symbol, parent, payload in entries),
+            )
+        return None
+
+    def listing(self, kind: str, parent: str = "") -> list[dict] | None:
+        """Every stored child of a parent, None unless the whole listing was stored"""
+        if not self.bound:
+            return None
+        complete = self._db.execute(
+            "SELECT 1 FROM listings WHERE kind = ? AND parent = ? AND reset_date = ?",
+            (kind, parent, self.reset_date),
+        ).fetchone()
+        if not complete:
+            return None
+        rows = self._db.execute(
+            "SELECT payload FROM entries WHERE kind = ? AND parent = ? AND reset_date = ? ORDER BY symbol",
+            (kind, parent, self.reset_date),
+        )
+        return [json.loads(payload) for payload, in rows]
+
+    def put_listing(
+        self, kind: str, payloads: list[dict], parent: str = "", symbol: Callable[[dict], str] = lambda p: p["symbol"]
+    ) -> None:
+        """Store every child of a parent and remember that the listing is complete
+
+        Args:
+            kind (str): The kind of the children
+            payloads (list[dict]): Every child of the parent
+            parent (str): The symbol of the parent, empty for top level listings
+            symbol (Callable): Reads the symbol of a child
+        """
+        if not self.bound:
+            return None
+        self.put_many(kind, ((symbol(payload), parent, payload) for payload in payloads))
+        self.complete_listing(kind, parent)
+        return None
+
+    def complete_listing(self, kind: str, parent: str = "") -> None:
+        """Remember that every child of a parent is stored"""
+        if not self.bound:
+            return None
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO listings (kind, parent, reset_date) VALUES (?, ?, ?)",
+                (kind, parent, self.reset_date),
+            )
+        return None
+
+    def has(self, kind: str, symbol: str) -> bool:
+        """Whether an entry is stored under the current reset"""
+        if not self.bound:
+            return False
+        return self._db.execute(
+            "SELECT 1 FROM entries WHERE kind = ? AND symbol = ? AND reset_date = ?", (kind, symbol, self.reset_date)
+        ).fetchone() is not None
+
+    def has_listing(self, kind: str, parent: str = "") -> bool:
+        """Whether every child of a parent is stored under the current reset"""
+        if not self.bound:
+            return False
+        return self._db.execute(
+            "SELECT 1 FROM listings WHERE kind = ? AND parent = ? AND reset_date = ?", (kind, parent, self.reset_date)
+        ).fetchone() is not None
+
+    def entries(self, kind: str) -> Iterator[dict]:
+        """Stream the payload of every entry of a kind, one row at a time"""
+        if not self.bound:
+            return
+        rows = self._db.execute(
+            "SELECT payload FROM entries WHERE kind = ? AND reset_date = ? ORDER BY symbol", (kind, self.reset_date)
+        )
+        for payload, in rows:
+            yield json.loads(payload)
+
+    def symbols(self, kind: str) -> list[str]:
+        """The symbol of every entry of a kind"""
+        if not self.bound:
+            return []
+        rows = self._db.execute(
+            "SELECT symbol FROM entries WHERE kind = ? AND reset_date = ? ORDER BY symbol", (kind, self.reset_date)
+        )
+        return [symbol for symbol, in rows]
+
+    def mark_done(self, task: str, key: str) -> None:
+        """Checkpoint one finished step of a long running task"""
+        if not self.bound:
+            return None
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (task, key, reset_date) VALUES (?, ?, ?)",
+                (task, key, self.reset_date),
+            )
+        return None
+
+    def done(self, task: str) -> set[str]:
+        """The checkpointed steps of a task"""
+        if not self.bound:
+            return set()
+        rows = self._db.execute(
+            "SELECT key FROM checkpoints WHERE task = ? AND reset_date = ?", (task, self.reset_date)
+        )
+        return {key for key, in rows}
+
+    def get_system(self, symbol: str) -> dict | None:
+        return self.get(SYSTEM, symbol)
+
+    def put_system(self, payload: dict) -> None:
+        self.put(SYSTEM, payload["symbol"], payload)
+
+    def get_waypoints(self, system_symbol: str) -> list[dict] | None:
+        return self.listing(WAYPOINT, system_symbol)
+
+    def put_waypoints(self, system_symbol: str, payloads: list[dict]) -> None:
+        self.put_listing(WAYPOINT, payloads, parent=system_symbol)
+
+    def get_factions(self) -> list[dict] | None:
+        return self.listing(FACTION)
+
+    def put_factions(self, payloads: list[dict]) -> None:
+        self.put_listing(FACTION, payloads)
+
+    def get_jumpgate(self, waypoint_symbol: str) -> dict | None:
+        return self.get(JUMPGATE, waypoint_symbol)
+
+    def put_jumpgate(self, waypoint_symbol: str, payload: dict) -> None:
+        self.put(JUMPGATE, waypoint_symbol, payload, parent=system_symbol(waypoint_symbol))
+
+    def count(self, kind: str) -> int:
+        """Number of entries of a kind stored under the current reset"""
+        if not self.bound:
+            return 0
+        return self._db.execute(
+            "SELECT COUNT(*) FROM entries WHERE kind = ? AND reset_date = ?", (kind, self.reset_date)
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
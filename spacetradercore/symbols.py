@@ -0,0 +1,99 @@
+from array import array
+
+SECTOR = 0
+SYSTEM = 1
+WAYPOINT = 2
+
+# id of the missing parent of a sector
+NO_PARENT = -1
+
+
+def parse_symbol(symbol: str) -> tuple[str, str, str]:
+    """Split a symbol into its sector, system and waypoint symbols, e.g. ``X1-AB12-C34``
+
+    Parts below the level of the symbol are empty, ``X1-AB12`` parses to ``("X1", "X1-AB12", "")``.
+
+    Raises:
+        ValueError: The symbol has no parts or more than three
+    """
+    parts = symbol.split("-")
+    if not symbol or len(parts) > 3:
+        raise ValueError(f"{symbol!r} is not a sector, system or waypoint symbol")
+    sector = parts[0]
+    system = f"{sector}-{parts[1]}" if len(parts) > 1 else ""
+    return sector, system, symbol if len(parts) == 3 else ""
+
+
+def system_symbol(symbol: str) -> str:
+    """The symbol of the system a waypoint or system symbol belongs to"""
+    return parse_symbol(symbol)[1]
+
+
+def sector_symbol(symbol: str) -> str:
+    """The symbol of the sector a symbol belongs to"""
+    return parse_symbol(symbol)[0]
+
+
+class SymbolTable:
+    """Maps sector, system and waypoint symbols to small integer ids and back
+
+    A symbol is parsed once, when it first gets an id, and its system and sector get ids of their own, so parents
+    are found with array lookups. Ids are dense and start at 0, so they can index lists and arrays directly.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._symbols: list[str] = []
+        self._levels = array("b")
+        self._systems = array("i")
+        self._sectors = array("i")
+
+    def id(self, symbol: str) -> int:
+        """The id of a symbol, a new one the first time the symbol is seen"""
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is not None:
+            return symbol_id
+
+        sector, system, waypoint = parse_symbol(symbol)
+        sector_id = self.id(sector) if symbol != sector else NO_PARENT
+        system_id = self.id(system) if waypoint else NO_PARENT
+        symbol_id = self._ids[symbol] = len(self._symbols)
+        self._symbols.append(symbol)
+        self._levels.append(WAYPOINT if waypoint else SYSTEM if system else SECTOR)
+        self._systems.append(system_id if waypoint else symbol_id if system else NO_PARENT)
+        self._sectors.append(sector_id if sector_id != NO_PARENT else symbol_id)
+        return symbol_id
+
+    def get(self, symbol: str) -> int | None:
+        """The id of a symbol, None if it never got one"""
+        return self._ids.get(symbol)
+
+    def symbol(self, symbol_id: int) -> str:
+        """The symbol of an id"""
+        return self._symbols[symbol_id]
+
+    def level(self, symbol_id: int) -> int:
+        """Whether the id is of a ``SECTOR``, ``SYSTEM`` or ``WAYPOINT``"""
+        return self._levels[symbol_id]
+
+    def system_of(self, symbol_id: int) -> int:
+        """The id of the system of a waypoint or system id, ``NO_PARENT`` for sectors"""
+        return self._systems[symbol_id]
+
+    def sector_of(self, symbol_id: int) -> int:
+        """The id of the sector of any id"""
+        return self._sectors[symbol_id]
+
+    def ids(self, symbols: list[str]) -> list[int]:
+        """The ids of many symbols at once"""
+        return [self.id(symbol) for symbol in symbols]
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._ids
+
+
+# the table shared by every index, planner and cache of the process, so their ids agree
+symbol_table = SymbolTable()
@@ -0,0 +1,116 @@
+import asyncio
+import heapq
+import itertools
+from datetime import datetime, timedelta
+
+from loguru import logger
+
+from spacetradercore.clock import ServerClock
+
+
+class TimerService:
+    """Resumes waiting coroutines when the server reaches their deadline, e.g. an arrival or a cooldown expiry
+
+    Deadlines are server times kept in one heap, and a single driver sleeps until the earliest of them. The
+    wait is measured with the server clock when the driver wakes, so changes to the skew estimate apply to
+    timers already registered. Waiters can be tagged with a key, such as a ship symbol, to be looked up or
+    cancelled. The driver only runs while timers are pending. Every timer fires ``margin`` seconds after its
+    deadline, a ship woken early would still be in transit or cooling down on the server.
+
+    Args:
+        clock (ServerClock): The estimate of the server's clock
+        margin (float): Seconds added to every deadline
+    """
+
+    def __init__(self, clock: ServerClock, margin: float = 0.25) -> None:
+        if margin < 0:
+            raise ValueError('margin must be a positive number or zero')
+        self.clock = clock
+        self.margin = margin
+        self._heap: list[tuple[datetime, int, str | None, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._wake = asyncio.Event()
+        self._driver: asyncio.Task | None = None
+
+    def _discard_done(self) -> None:
+        """Drop timers at the top of the heap whose waiter was cancelled"""
+        while self._heap and self._heap[0][3].done():
+            heapq.heappop(self._heap)
+
+    def _delay(self, deadline: datetime) -> float:
+        return self.clock.delay(deadline + timedelta(seconds=self.margin))
+
+    async def _drive(self) -> None:
+        try:
+            while True:
+                self._discard_done()
+                if not self._heap:
+                    return
+                delay = self._delay(self._heap[0][0])
+                if delay <= 0:
+                    heapq.heappop(self._heap)[3].set_result(None)
+                    continue
+                self._wake.clear()
+                try:
+                    # an earlier timer registered meanwhile wakes the driver up
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._driver = None
+
+    async def sleep_until(self, deadline: datetime, key: str | None = None) -> None:
+        """Wait until the server reaches a time
+
+        Args:
+            deadline (datetime): The server time to wake up at, timezone aware
+            key (str): Tags the timer, e.g. with the symbol of the ship it waits for
+        """
+        if self._delay(deadline) <= 0:
+            return
+        future = asyncio.get_running_loop().create_future()
+        entry = (deadline, next(self._order), key, future)
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            self._wake.set()
+        if self._driver is None:
+            self._driver = asyncio.create_task(self._drive())
+        logger.debug(f"TimerService | sleep_until | {key =:} | {deadline =:}")
+        await future
+
+    async def sleep(self, seconds: float, key: str | None = None) -> None:
+        """Wait a number of seconds, e.g. the ``remainingSeconds`` of a cooldown"""
+        await self.sleep_until(self.clock.now() + timedelta(seconds=seconds), key)
+
+    def next_wake(self, key: str) -> datetime | None:
+        """The earliest pending deadline with a key, None when it has none"""
+        return min((deadline for deadline, _, other, future in self._heap if other == key and not future.done()),
+                   default=None)
+
+    def cancel(self, key: str) -> int:
+        """Cancel every pending timer with a key, their waiters get ``CancelledError``
+
+        Returns:
+            int: The number of timers cancelled
+        """
+        cancelled = 0
+        for _, _, other, future in self._heap:
+            if other == key and not future.done():
+                future.cancel()
+                cancelled += 1
+        return cancelled
+
+    def __len__(self) -> int:
+        return sum(not future.done() for *_, future in self._heap)
+
+    async def close(self) -> None:
+        """Stop the driver, pending waiters are cancelled"""
+        driver = self._driver
+        if driver is not None:
+            driver.cancel()
+            try:
+                await driver
+            except asyncio.CancelledError:
+                pass
+        while self._heap:
+            heapq.heappop(self._heap)[3].cancel()
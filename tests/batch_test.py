@@ -0,0 +1,54 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from spacetradercore.batch import as_completed
+from spacetradercore.errors import SpaceTradersError
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+
+
+class TestBatch(IsolatedAsyncioTestCase):
+
+    async def test_results_in_completion_order_within_window(self):
+        running = 0
+        peak = 0
+
+        def call(delay: float, response: dict):
+            async def fetch():
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(delay)
+                running -= 1
+                return response
+            return fetch
+
+        calls = [
+            ("slow", call(0.05, {"data": {"symbol": "slow"}})),
+            ("fast", call(0.01, {"data": {"symbol": "fast"}})),
+            ("refused", call(0.02, {"error": {"code": 404, "message": "no market"}})),
+            ("last", call(0.0, {"data": {"symbol": "last"}})),
+        ]
+        results = [result async for result in as_completed(calls, window=2)]
+
+        self.assertEqual([result.key for result in results], ["fast", "refused", "last", "slow"])
+        self.assertEqual(peak, 2)
+        refused = results[1]
+        self.assertFalse(refused.ok)
+        self.assertIsInstance(refused.error, SpaceTradersError)
+        self.assertEqual(results[0].data, {"symbol": "fast"})
+
+    async def test_core_batch_derives_systems_and_survives_errors(self):
+        core = SpaceMerchantCore(key="token", pool=SessionPool())
+        seen = []
+
+        async def get_market(system_symbol: str, waypoint_symbol: str) -> dict:
+            seen.append((system_symbol, waypoint_symbol))
+            if waypoint_symbol.endswith("2"):
+                raise ConnectionError("reset")
+            return {"data": {"symbol": waypoint_symbol}}
+
+        results = {result.key: result async for result in core.batch(get_market, ["X1-A-1", "X1-A-2", "X1-B-3"])}
+        self.assertEqual(sorted(seen), [("X1-A", "X1-A-1"), ("X1-A", "X1-A-2"), ("X1-B", "X1-B-3")])
+        self.assertIsInstance(results["X1-A-2"].error, ConnectionError)
+        self.assertEqual(results["X1-B-3"].data, {"symbol": "X1-B-3"})
@@ -0,0 +1,41 @@
+import time
+from unittest import TestCase
+
+from spacetradercore.cache import Freshness, ResponseCache
+
+
+class TestResponseCache(TestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", Freshness.STATIC, {"data": "a"})
+        cache.put("b", Freshness.STATIC, {"data": "b"})
+        cache.get("a")
+        cache.put("c", Freshness.STATIC, {"data": "c"})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"data": "a"})
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "evictions": 1, "size": 2})
+
+    def test_short_entries_expire(self):
+        cache = ResponseCache(short_ttl=0.01)
+        cache.put("market", Freshness.SHORT, {"data": {}})
+        cache.put("system", Freshness.STATIC, {"data": {}})
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("market"))
+        self.assertIsNotNone(cache.get("system"))
+
+    def test_never_entries_are_not_stored(self):
+        cache = ResponseCache()
+        cache.put("agent", Freshness.NEVER, {"data": {}})
+        self.assertEqual(len(cache), 0)
+
+    def test_reset_only_drops_static_entries(self):
+        cache = ResponseCache()
+        cache.observe_reset("2024-01-28")
+        cache.put("market", Freshness.SHORT, {"data": {}})
+        cache.put("system", Freshness.STATIC, {"data": {}})
+        cache.observe_reset("2024-01-28")
+        self.assertEqual(len(cache), 2)
+        cache.observe_reset("2024-02-11")
+        self.assertIsNone(cache.get("system"))
+        self.assertIsNotNone(cache.get("market"))
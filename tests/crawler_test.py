@@ -0,0 +1,117 @@
+from unittest import IsolatedAsyncioTestCase
+
+from spacetradercore.crawler import GalaxyCrawler
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from spacetradercore.scheduler import Priority, current_lane
+from spacetradercore.store import JUMPGATE, MARKET, SHIPYARD, SYSTEM, WAYPOINT, UniverseStore
+
+WAYPOINTS = {
+    "X1-A": [
+        {"symbol": "X1-A-1", "systemSymbol": "X1-A", "type": "PLANET",
+         "traits": [{"symbol": "MARKETPLACE"}, {"symbol": "SHIPYARD"}]},
+        {"symbol": "X1-A-2", "systemSymbol": "X1-A", "type": "JUMP_GATE", "traits": []},
+    ],
+    "X1-B": [{"symbol": "X1-B-1", "systemSymbol": "X1-B", "type": "MOON", "traits": [{"symbol": "MARKETPLACE"}]}],
+}
+
+
+class FakeRequester:
+    """Answers the crawl endpoints from WAYPOINTS and records every call"""
+
+    def __init__(self, failing: set[str] | None = None):
+        self.failing = failing or set()
+        self.calls: list[tuple] = []
+        self.lanes: set[Priority | None] = set()
+
+    def _record(self, *call):
+        self.calls.append(call)
+        self.lanes.add(current_lane.get())
+
+    async def list_systems(self, limit: int = 20, page: int = 1) -> dict:
+        self._record("list_systems", page)
+        systems = [{"symbol": symbol, "sectorSymbol": "X1"} for symbol in WAYPOINTS]
+        return {"data": systems, "meta": {"total": len(systems), "page": page, "limit": limit}}
+
+    async def list_waypoints_in_system(self, system_symbol: str, limit: int = 20, page: int = 1) -> dict:
+        return {"data": WAYPOINTS[system_symbol], "meta": {"total": len(WAYPOINTS[system_symbol])}}
+
+    async def paginate(self, method, *args, **kwargs) -> list[dict]:
+        self._record("waypoints", *args)
+        return (await method(*args))["data"]
+
+    async def _detail(self, kind: str, waypoint_symbol: str) -> dict:
+        self._record(kind, waypoint_symbol)
+        if waypoint_symbol in self.failing:
+            return {"error": {"code": 404, "message": "not found"}}
+        return {"data": {"symbol": waypoint_symbol}}
+
+    async def get_market(self, system_symbol: str, waypoint_symbol: str) -> dict:
+        return await self._detail(MARKET, waypoint_symbol)
+
+    async def get_shipyard(self, system_symbol: str, waypoint_symbol: str) -> dict:
+        return await self._detail(SHIPYARD, waypoint_symbol)
+
+    async def get_jumpgate(self, system_symbol: str, waypoint_symbol: str) -> dict:
+        return await self._detail(JUMPGATE, waypoint_symbol)
+
+
+class PagingRequester(FakeRequester):
+    """Lists waypoints through the real ``paginate``, the systems in ``failing`` answer with an error"""
+
+    paginate = SpaceMerchantCore.paginate
+    _page_items = staticmethod(SpaceMerchantCore._page_items)
+    _page_total = staticmethod(SpaceMerchantCore._page_total)
+
+    async def list_waypoints_in_system(self, system_symbol: str, limit: int = 20, page: int = 1) -> dict:
+        self._record("waypoints", system_symbol)
+        if system_symbol in self.failing:
+            return {"error": {"code": 400, "message": "bad request"}}
+        return await super().list_waypoints_in_system(system_symbol, limit, page)
+
+
+class TestGalaxyCrawler(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.store = UniverseStore(":memory:")
+        self.store.bind("2024-01-01")
+
+    def tearDown(self):
+        self.store.close()
+
+    async def test_crawl_stores_every_kind_in_the_background_lane(self):
+        requester = FakeRequester()
+        markets = []
+        await GalaxyCrawler(requester, self.store, concurrency=2, on_market=markets.append).run()
+
+        self.assertEqual(self.store.count(SYSTEM), 2)
+        self.assertEqual(self.store.count(WAYPOINT), 3)
+        self.assertEqual(self.store.count(MARKET), 2)
+        self.assertTrue(self.store.has(SHIPYARD, "X1-A-1"))
+        self.assertTrue(self.store.has(JUMPGATE, "X1-A-2"))
+        self.assertEqual(sorted(market["symbol"] for market in markets), ["X1-A-1", "X1-B-1"])
+        self.assertEqual(requester.lanes, {Priority.BACKGROUND})
+
+    async def test_resumed_crawl_only_fetches_what_failed(self):
+        first = FakeRequester(failing={"X1-B-1"})
+        await GalaxyCrawler(first, self.store).run()
+        self.assertFalse(self.store.has(MARKET, "X1-B-1"))
+
+        second = FakeRequester()
+        await GalaxyCrawler(second, self.store).run()
+        self.assertEqual(second.calls, [(MARKET, "X1-B-1")])
+        self.assertTrue(self.store.has(MARKET, "X1-B-1"))
+
+    async def test_crawl_needs_a_bound_store(self):
+        with self.assertRaises(ValueError):
+            await GalaxyCrawler(FakeRequester(), UniverseStore(":memory:")).run()
+
+    async def test_failed_waypoint_page_is_crawled_again(self):
+        await GalaxyCrawler(PagingRequester(failing={"X1-B"}), self.store).run()
+        self.assertTrue(self.store.has_listing(WAYPOINT, "X1-A"))
+        self.assertFalse(self.store.has_listing(WAYPOINT, "X1-B"))
+
+        second = PagingRequester()
+        await GalaxyCrawler(second, self.store).run()
+        self.assertIn(("waypoints", "X1-B"), second.calls)
+        self.assertTrue(self.store.has_listing(WAYPOINT, "X1-B"))
+        self.assertEqual(self.store.count(WAYPOINT), 3)
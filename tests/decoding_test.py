@@ -0,0 +1,87 @@
+import json
+from unittest import TestCase, skipUnless
+
+from spacetradercore.decoding import PageMeta, Record, _record_builder, convert, decode_body, msgspec, record_decoder
+from spacetradercore.errors import SpaceTradersError
+
+
+class Route(Record):
+    departure_time: str
+    arrival: str
+
+
+class Nav(Record):
+    waypoint_symbol: str
+    route: Route
+    flight_mode: str = "CRUISE"
+    tags: list[str] = []
+
+
+class NavPage(Record):
+    data: list[Nav]
+    meta: PageMeta
+
+
+PAGE = json.dumps({
+    "data": [
+        {"waypointSymbol": "X1-A-1", "flightMode": "DRIFT", "status": "DOCKED",
+         "route": {"departureTime": "2024-01-28T18:00:00Z", "arrival": "2024-01-28T18:01:00Z"}},
+        {"waypointSymbol": "X1-A-2", "route": {"departureTime": "2024-01-28T18:00:00Z", "arrival": ""}},
+    ],
+    "meta": {"total": 2, "page": 1, "limit": 20},
+}).encode()
+
+
+class TestDecodeBody(TestCase):
+
+    def test_decodes_with_installed_backend(self):
+        self.assertEqual(decode_body(b'{"data": {"symbol": "AGENT"}}'), {"data": {"symbol": "AGENT"}})
+
+    def test_empty_bodies_decode_to_empty_dict(self):
+        self.assertEqual(decode_body(b""), {})
+        self.assertEqual(decode_body(b"", status=502), {})
+
+    def test_html_error_decodes_to_error_body(self):
+        body = decode_body(b"<html>502 Bad Gateway</html>", status=502)
+        self.assertEqual(body["error"], {"code": 502, "message": "<html>502 Bad Gateway</html>"})
+
+    def test_malformed_success_raises(self):
+        with self.assertRaises(SpaceTradersError) as raised:
+            decode_body(b'{"data": {"sym', status=200)
+        self.assertEqual(raised.exception.status, 200)
+
+    def test_custom_decoder(self):
+        self.assertEqual(decode_body(b'{"a": 1}', decoder=lambda raw: {"raw": json.loads(raw)}), {"raw": {"a": 1}})
+
+
+class TestRecords(TestCase):
+
+    def test_bodies_decode_into_records(self):
+        page = record_decoder(NavPage)(PAGE)
+        self.assertIsInstance(page.data[0], Nav)
+        self.assertEqual(page.data[0].route.departure_time, "2024-01-28T18:00:00Z")
+        self.assertEqual((page.data[0].flight_mode, page.data[1].flight_mode), ("DRIFT", "CRUISE"))
+        self.assertEqual(page.meta.total, 2)
+        self.assertFalse(hasattr(page.data[0], "__dict__"))
+
+    @skipUnless(msgspec, "msgspec is not installed")
+    def test_msgspec_decodes_records_as_structs(self):
+        page = record_decoder(NavPage)(PAGE)
+        self.assertIsInstance(page, msgspec.Struct)
+        # the stdlib path builds the same records from the decoded dicts
+        self.assertEqual(_record_builder(NavPage)(json.loads(PAGE)), page)
+
+    def test_defaults_are_not_shared(self):
+        route = {"departureTime": "", "arrival": ""}
+        first = convert({"waypointSymbol": "A", "route": route}, Nav)
+        second = convert({"waypointSymbol": "B", "route": route}, Nav)
+        first.tags.append("SCANNED")
+        self.assertEqual(second.tags, [])
+
+    def test_bodies_that_do_not_fit_raise(self):
+        with self.assertRaises(ValueError):
+            record_decoder(NavPage)(b'{"data": [{"route": {}}], "meta": {"total": 1}}')
+        with self.assertRaises(ValueError):
+            convert({"waypointSymbol": "X1-A-1"}, Nav)
+        with self.assertRaises(SpaceTradersError):
+            decode_body(b'{"data": []}', record_decoder(NavPage))
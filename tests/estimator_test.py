@@ -0,0 +1,80 @@
+import random
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+import numpy as np
+
+from spacemerchants.models.estimator import TravelEstimator
+from spacemerchants.models.route import fuel_cost, travel_time
+from spacemerchants.models.ship import Navigation, Ship
+from spacemerchants.models.waypoint_table import WaypointTable
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from tests.ship_test import ship
+
+NOW = datetime(2024, 1, 28, 18, 0, tzinfo=timezone.utc)
+
+
+def waypoint(symbol: str, x: float, y: float) -> dict:
+    return {"symbol": symbol, "systemSymbol": "X1-A", "type": "PLANET", "x": x, "y": y}
+
+
+class TestTravelEstimator(TestCase):
+
+    def setUp(self):
+        self.table = WaypointTable([waypoint("X1-A-1", 0, 0), waypoint("X1-A-2", 30, 40), waypoint("X1-A-3", 300, 0)])
+        self.estimator = TravelEstimator(self.table)
+
+    def test_matrix_matches_the_scalar_formulas(self):
+        docked = Ship.from_dict(None, ship("AGENT-1"))
+        moving = Ship.from_dict(None, {**ship("AGENT-2", "IN_TRANSIT"),
+                                       "engine": {**ship("AGENT-2")["engine"], "speed": 10}})
+        moving.navigation.arrival_time = NOW + timedelta(seconds=20)
+
+        estimate = self.estimator.estimate([docked, moving], ["X1-A-2", "X1-A-3"], now=NOW)
+        self.assertEqual(estimate.seconds.shape, (2, 2))
+        self.assertEqual(estimate.seconds[0].tolist(), [travel_time(50, "CRUISE", 30), travel_time(300, "CRUISE", 30)])
+        self.assertEqual(estimate.seconds[1, 0], travel_time(50, "CRUISE", 10) + 20)
+        self.assertEqual(estimate.fuel[0].tolist(), [fuel_cost(50, "CRUISE"), fuel_cost(300, "CRUISE")])
+        # 100 units in the tank do not cover 300
+        self.assertEqual(estimate.reachable.tolist(), [[True, False], [True, False]])
+        self.assertEqual(estimate.fastest().tolist(), [0, -1])
+
+    def test_remaining_time_is_measured_on_the_server_clock(self):
+        core = SpaceMerchantCore(key="token", pool=SessionPool())
+        core.clock.offset = 600.0  # the server runs ten minutes ahead
+        moving = Ship.from_dict(core, ship("AGENT-1", "IN_TRANSIT"))
+        moving.navigation.arrival_time = datetime.now(timezone.utc) + timedelta(seconds=900)
+
+        for estimator in (TravelEstimator(self.table, core), self.estimator):
+            remaining = estimator.estimate([moving], ["X1-A-1"]).seconds[0, 0] - travel_time(0, "CRUISE", 30)
+            self.assertAlmostEqual(remaining, 300, delta=1)
+
+    def test_residual_of_a_recorded_navigation(self):
+        departure = NOW
+        arrival = departure + timedelta(seconds=travel_time(300, "BURN", 30))
+        navigation = Navigation.from_dict({
+            "systemSymbol": "X1-A", "waypointSymbol": "X1-A-3", "status": "IN_TRANSIT", "flightMode": "BURN",
+            "route": {"origin": {"symbol": "X1-A-1"}, "destination": {"symbol": "X1-A-3"},
+                      "departureTime": departure.isoformat(), "arrival": arrival.isoformat()},
+        })
+        self.assertEqual(self.estimator.residual(navigation, 30), 0)
+        self.assertEqual(self.estimator.residual(navigation, 10), travel_time(300, "BURN", 30)
+                         - travel_time(300, "BURN", 10))
+
+    def test_fleet_by_destination_matrix(self):
+        generator = random.Random(5)
+        table = WaypointTable([waypoint(f"X1-A-{index}", generator.uniform(-800, 800), generator.uniform(-800, 800))
+                               for index in range(200)])
+        ships = [Ship.from_dict(None, {**ship(f"AGENT-{index}"),
+                                       "nav": {**ship("AGENT")["nav"], "waypointSymbol": f"X1-A-{index}"}})
+                 for index in range(50)]
+        estimator = TravelEstimator(table)
+        destinations = table.symbols.tolist()
+        estimate = estimator.estimate(ships, destinations, now=NOW)
+        self.assertTrue(np.all(estimate.seconds[np.arange(50), np.arange(50)] == travel_time(0, "CRUISE", 30)))
+        self.assertEqual(estimate.seconds.shape, (50, 200))
+        for row, column in [(3, 170), (49, 0), (17, 123)]:
+            distance = float(np.hypot(table.x[row] - table.x[column], table.y[row] - table.y[column]))
+            self.assertEqual(estimate.seconds[row, column], travel_time(distance, "CRUISE", 30))
+            self.assertEqual(estimate.fuel[row, column], fuel_cost(distance, "CRUISE"))
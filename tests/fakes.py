@@ -0,0 +1,40 @@
+import json
+
+
+class FakeResponse:
+    """Stands in for an aiohttp response inside ``async with session.request(...)``"""
+
+    def __init__(self, body: dict, status: int = 200, headers: dict | None = None):
+        self.body = body
+        self.status = status
+        self.headers = headers or {}
+
+    async def json(self, **kwargs):
+        return self.body
+
+    async def read(self) -> bytes:
+        return json.dumps(self.body).encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+
+class FakeSession:
+    """Replays canned responses or errors in order and records every request it is asked to send"""
+
+    def __init__(self, responses: list[FakeResponse | Exception]):
+        self.responses = list(responses)
+        self.requests: list[tuple[str, str, dict]] = []
+
+    def request(self, method: str, url: str, **kwargs) -> FakeResponse:
+        self.requests.append((method, url, kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def close(self):
+        return None
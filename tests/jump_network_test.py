@@ -0,0 +1,63 @@
+import math
+import random
+from unittest import TestCase
+
+from spacemerchants.models.jump_network import JumpNetwork, jump_cooldown, max_warp_distance, warp_time
+from spacetradercore.symbols import symbol_table
+
+
+def gate(system: str, *connections: str) -> dict:
+    return {"symbol": f"{system}-GATE", "connections": [f"{other}-GATE" for other in connections]}
+
+
+class TestJumpNetwork(TestCase):
+
+    def setUp(self):
+        self.network = JumpNetwork()
+        for symbol, x, y in [("X1-A", 0, 0), ("X1-B", 1000, 0), ("X1-C", 2000, 0), ("X1-D", 1000, 1000),
+                             ("X1-E", 2100, 50)]:
+            self.network.add_system({"symbol": symbol, "x": x, "y": y})
+        self.network.add_jumpgate(gate("X1-A", "X1-B", "X1-D"))
+        self.network.add_jumpgate(gate("X1-B", "X1-C"))
+        self.network.add_jumpgate(gate("X1-D", "X1-C"))
+
+    def test_jumps_take_the_fastest_path(self):
+        route = self.network.shortest_path("X1-A", "X1-C")
+        self.assertEqual([(hop.kind, hop.origin, hop.destination) for hop in route.hops],
+                         [("JUMP", "X1-A", "X1-B"), ("JUMP", "X1-B", "X1-C")])
+        self.assertAlmostEqual(route.seconds, 2 * jump_cooldown(1000))
+        # connections work both ways even when only one gate lists them
+        self.assertEqual(self.network.shortest_path("X1-C", "X1-A").seconds, route.seconds)
+        self.assertIsNone(self.network.shortest_path("X1-A", "X1-E"))
+
+    def test_gates_under_construction_are_left_out(self):
+        self.network.add_construction_site({"symbol": "X1-B-GATE", "isComplete": False})
+        route = self.network.shortest_path("X1-A", "X1-C")
+        self.assertEqual([hop.destination for hop in route.hops], ["X1-D", "X1-C"])
+
+        self.network.add_construction_site({"symbol": "X1-B-GATE", "isComplete": True})
+        self.assertEqual([hop.destination for hop in self.network.shortest_path("X1-A", "X1-C").hops],
+                         ["X1-B", "X1-C"])
+
+    def test_warps_reach_systems_without_gates(self):
+        route = self.network.shortest_path("X1-A", "X1-E", warp_range=200, speed=30)
+        self.assertEqual([(hop.kind, hop.destination) for hop in route.hops],
+                         [("JUMP", "X1-B"), ("JUMP", "X1-C"), ("WARP", "X1-E")])
+        self.assertAlmostEqual(route.seconds, 2 * jump_cooldown(1000) + warp_time(math.hypot(100, 50), "CRUISE", 30))
+        self.assertEqual(max_warp_distance(400, "BURN"), 200)
+        self.assertEqual(max_warp_distance(400, "DRIFT"), math.inf)
+
+    def test_landmarks_match_plain_dijkstra_on_a_random_graph(self):
+        generator = random.Random(3)
+        network = JumpNetwork(landmarks=4)
+        systems = [f"X1-R{index}" for index in range(300)]
+        for symbol in systems:
+            network.add_system({"symbol": symbol, "x": generator.uniform(0, 5000), "y": generator.uniform(0, 5000)})
+        for symbol in systems:
+            network.add_jumpgate(gate(symbol, *generator.sample(systems, 3)))
+        for _ in range(20):
+            origin, destination = generator.sample(systems, 2)
+            plain = network._dijkstra(symbol_table.id(origin)).get(symbol_table.id(destination))
+            route = network.shortest_path(origin, destination)
+            self.assertAlmostEqual(route.seconds, plain)
+            self.assertIs(network.shortest_path(origin, destination), route)
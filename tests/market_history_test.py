@@ -0,0 +1,86 @@
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import numpy as np
+
+from spacemerchants.models.market_history import MarketHistory
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from tests.fakes import FakeResponse, FakeSession
+
+START = datetime(2024, 1, 28, 18, 0, tzinfo=timezone.utc)
+
+
+def market(symbol: str, *goods: tuple[str, int, int]) -> dict:
+    return {"symbol": symbol, "tradeGoods": [
+        {"symbol": good, "type": "EXCHANGE", "tradeVolume": 60, "supply": "MODERATE", "activity": "WEAK",
+         "purchasePrice": purchase, "sellPrice": sell}
+        for good, purchase, sell in goods
+    ]}
+
+
+class TestMarketHistory(TestCase):
+
+    def setUp(self):
+        self.history = MarketHistory()
+        for minute in range(100):
+            observed = START + timedelta(minutes=minute)
+            self.history.record(market("X1-A-1", ("FUEL", 70 + minute, 68 + minute), ("IRON", 30, 25)), observed)
+            self.history.record(market("X1-A-2", ("FUEL", 90 - minute % 5, 85)), observed + timedelta(seconds=30))
+
+    def test_latest_window_and_staleness(self):
+        self.assertEqual(len(self.history), 300)
+        self.assertEqual(self.history.record({"symbol": "X1-A-3", "tradeGoods": []}), 0)
+
+        latest = self.history.latest("FUEL", "X1-A-1")
+        self.assertEqual((latest.purchase_price, latest.time, latest.supply),
+                         (169, START + timedelta(minutes=99), "MODERATE"))
+        self.assertEqual(self.history.latest("FUEL").waypoint, "X1-A-2")
+        self.assertIsNone(self.history.latest("FUEL", "X1-B-1"))
+        self.assertEqual({waypoint: point.purchase_price
+                          for waypoint, point in self.history.latest_prices("FUEL").items()},
+                         {"X1-A-1": 169, "X1-A-2": 86})
+
+        series = self.history.window("FUEL", START + timedelta(minutes=10), START + timedelta(minutes=19),
+                                     waypoint="X1-A-1")
+        self.assertEqual(series.purchase_price.tolist(), list(range(80, 90)))
+        self.assertEqual(len(self.history.window("FUEL", START, START + timedelta(minutes=1)).time), 3)
+        self.assertEqual(len(self.history.window("GOLD", START).time), 0)
+
+        now = START + timedelta(minutes=100)
+        self.assertEqual(self.history.staleness("X1-A-1", now=now), 60)
+        self.assertEqual(self.history.staleness("X1-A-2", "IRON", now=now), float("inf"))
+
+    def test_save_and_memory_map(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.history.save(directory)
+            loaded = MarketHistory.load(directory)
+            self.assertIsInstance(loaded._series["FUEL"]["time"], np.memmap)
+            self.assertEqual(loaded.latest_prices("FUEL"), self.history.latest_prices("FUEL"))
+
+            # appending copies the mapped columns, saving again replaces the files under the map
+            loaded.record(market("X1-A-1", ("FUEL", 1, 1)), START + timedelta(days=1))
+            loaded.save()
+            self.assertEqual(MarketHistory.load(directory).latest("FUEL").purchase_price, 1)
+            self.assertEqual(len(MarketHistory.load(directory, mmap=False)), 301)
+
+
+class TestMarketReads(IsolatedAsyncioTestCase):
+
+    async def test_every_market_read_is_recorded_once(self):
+        core = SpaceMerchantCore(key="token", pool=SessionPool())
+        history = MarketHistory()
+        history.attach(core)
+        core.session = FakeSession([
+            FakeResponse({"data": market("X1-A-1", ("FUEL", 70, 68), ("IRON", 30, 25))}),
+            FakeResponse({"data": {"symbol": "X1-A-2", "exports": [], "imports": []}}),
+        ])
+        await core.get_market("X1-A", "X1-A-1")
+        # served from the response cache, the same observation
+        await core.get_market("X1-A", "X1-A-1")
+        # no ship at the market, no prices
+        await core.get_market("X1-A", "X1-A-2")
+        self.assertEqual(len(core.session.requests), 2)
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history.latest("FUEL").purchase_price, 70)
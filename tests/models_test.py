@@ -0,0 +1,105 @@
+import gc
+from unittest import TestCase
+
+from spacemerchants.models.ship import Cargo, InventoryItem, Navigation
+from spacemerchants.models.system import System
+from spacemerchants.models.waypoint import Trait, Waypoint
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+
+MARKETPLACE = {"symbol": "MARKETPLACE", "name": "Marketplace", "description": "A thriving center of commerce."}
+
+
+def waypoint_data(symbol: str, traits: list[dict]) -> dict:
+    return {"symbol": symbol, "type": "PLANET", "system": "X1-A", "x": 1, "y": 2,
+            "orbitals": [{"symbol": f"{symbol}-M"}], "traits": traits,
+            "chart": {"waypointSymbol": symbol, "submittedBy": "COSMIC", "submittedOn": "2024-01-28T18:00:00+00:00"}}
+
+
+class TestModels(TestCase):
+
+    def test_models_have_no_instance_dict(self):
+        waypoint = Waypoint.from_dict(None, waypoint_data("X1-A-1", [MARKETPLACE]))
+        self.assertFalse(hasattr(waypoint, "__dict__"))
+        with self.assertRaises(AttributeError):
+            waypoint.colour = "red"
+
+    def test_waypoint_records_are_typed_and_traits_shared(self):
+        first = Waypoint.from_dict(None, waypoint_data("X1-A-1", [MARKETPLACE]))
+        second = Waypoint.from_dict(None, waypoint_data("X1-A-2", [dict(MARKETPLACE)]))
+        self.assertEqual(first.traits, (Trait("MARKETPLACE", "Marketplace", "A thriving center of commerce."),))
+        self.assertIs(first.traits[0], second.traits[0])
+        self.assertTrue(first.has_trait("MARKETPLACE"))
+        self.assertFalse(first.has_trait("SHIPYARD"))
+        self.assertEqual(first.orbitals, ["X1-A-1-M"])
+        self.assertEqual(first.chart.submitted_by, "COSMIC")
+
+    def test_instances_do_not_share_lists(self):
+        first = System.from_dict(None, {"symbol": "X1-A", "sectorSymbol": "X1", "type": "RED_STAR", "x": 0, "y": 0,
+                                        "factions": [{"symbol": "COSMIC"}]})
+        second = System.from_dict(None, {"symbol": "X1-B", "sectorSymbol": "X1", "type": "RED_STAR", "x": 0, "y": 0})
+        self.assertEqual([faction.symbol for faction in first.factions], ["COSMIC"])
+        self.assertEqual(second.factions, [])
+
+    def test_cargo_inventory_items(self):
+        cargo = Cargo.from_dict({"capacity": 40, "units": 7, "inventory": [
+            {"symbol": "IRON_ORE", "name": "Iron Ore", "description": "", "units": 5},
+            {"symbol": "ICE_WATER", "name": "Ice Water", "description": "", "units": 2},
+        ]})
+        self.assertEqual(cargo.inventory[0], InventoryItem("IRON_ORE", "Iron Ore", "", 5))
+        self.assertEqual(cargo.units_of("ICE_WATER"), 2)
+        self.assertEqual(cargo.units_of("FUEL"), 0)
+
+    def test_navigation_route_direction(self):
+        navigation = Navigation.from_dict({
+            "flightMode": "CRUISE", "status": "IN_TRANSIT", "systemSymbol": "X1-A", "waypointSymbol": "X1-A-2",
+            "route": {"origin": {"symbol": "X1-A-1"}, "destination": {"symbol": "X1-A-2"},
+                      "departureTime": "2024-01-28T18:00:00+00:00", "arrival": "2024-01-28T18:01:00+00:00"},
+        })
+        self.assertEqual(navigation.departure_location, "X1-A-1")
+        self.assertEqual(navigation.arrival_location, "X1-A-2")
+
+    def test_lazy_waypoint_builds_components_on_first_access(self):
+        data = waypoint_data("X1-A-1", [MARKETPLACE])
+        waypoint = Waypoint.from_dict(None, data, lazy=True)
+        self.assertFalse(hasattr(waypoint, "_traits"))
+        self.assertTrue(waypoint.has_trait("MARKETPLACE"))
+        self.assertIs(waypoint.traits, waypoint.traits)
+        self.assertEqual(waypoint.orbitals, ["X1-A-1-M"])
+
+        eager = Waypoint.from_dict(None, data)
+        self.assertIsNone(eager._data)
+        self.assertEqual(eager.traits, waypoint.traits)
+
+    def test_assigning_a_lazy_attribute_replaces_it(self):
+        waypoint = Waypoint.from_dict(None, waypoint_data("X1-A-1", [MARKETPLACE]), lazy=True)
+        waypoint.traits = ()
+        self.assertFalse(waypoint.has_trait("MARKETPLACE"))
+
+
+class TestIdentityMap(TestCase):
+
+    def setUp(self):
+        self.requester = SpaceMerchantCore(key="token", pool=SessionPool())
+
+    def test_parsing_again_refreshes_the_live_waypoint(self):
+        first = Waypoint.from_dict(self.requester, waypoint_data("X1-A-1", [MARKETPLACE]))
+        second = Waypoint.from_dict(self.requester, waypoint_data("X1-A-1", [{"symbol": "SHIPYARD"}]))
+        self.assertIs(first, second)
+        self.assertTrue(first.has_trait("SHIPYARD"))
+        self.assertFalse(first.has_trait("MARKETPLACE"))
+
+    def test_system_summaries_keep_waypoint_details(self):
+        waypoint = Waypoint.from_dict(self.requester, waypoint_data("X1-A-1", [MARKETPLACE]))
+        system = System.from_dict(self.requester, {
+            "symbol": "X1-A", "sectorSymbol": "X1", "type": "RED_STAR", "x": 0, "y": 0,
+            "waypoints": [{"symbol": "X1-A-1", "type": "PLANET", "x": 3, "y": 4, "orbitals": []}],
+        })
+        self.assertIs(system._waypoints[0], waypoint)
+        self.assertEqual((waypoint.x, waypoint.y), (3, 4))
+        self.assertTrue(waypoint.has_trait("MARKETPLACE"))
+
+    def test_unused_objects_leave_the_map(self):
+        Waypoint.from_dict(self.requester, waypoint_data("X1-A-1", []))
+        gc.collect()
+        self.assertEqual(len(self.requester.identity_map), 0)
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import IsolatedAsyncioTestCase
+
+from spacetradercore.rate_limit import AsyncRateLimiter
+
+
+class TestAsyncRateLimiter(IsolatedAsyncioTestCase):
+
+    async def test_burst_is_spent_after_sustained_tokens(self):
+        limiter = AsyncRateLimiter(20, 1, burst=3, burst_window=60)
+        start = time.monotonic()
+        for _ in range(23):
+            await limiter.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+
+        await limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.045)
+
+    async def test_sustained_rate_without_burst(self):
+        limiter = AsyncRateLimiter(20, 1)
+        start = time.monotonic()
+        for _ in range(25):
+            await limiter.acquire()
+        # 20 tokens are available up front, the remaining 5 arrive every 50ms
+        self.assertGreaterEqual(time.monotonic() - start, 0.24)
+
+    async def test_throttle_limits_concurrency(self):
+        running = 0
+        peak = 0
+
+        async def worker(limiter: AsyncRateLimiter):
+            nonlocal running, peak
+            async with limiter.throttle():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        async with AsyncRateLimiter(100, 2) as limiter:
+            await asyncio.gather(*(worker(limiter) for _ in range(6)))
+        self.assertEqual(peak, 2)
+
+    def test_rejects_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            AsyncRateLimiter(0, 1)
+        with self.assertRaises(ValueError):
+            AsyncRateLimiter(2, 0)
+        with self.assertRaises(ValueError):
+            AsyncRateLimiter(2, 1, burst=-1)
+
+    async def test_update_pauses_until_reset(self):
+        limiter = AsyncRateLimiter(100, 1, burst=10)
+        reset = (datetime.now(timezone.utc) + timedelta(milliseconds=100)).isoformat()
+        await limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})
+        start = time.monotonic()
+        await limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    async def test_update_follows_retry_after_and_server_limits(self):
+        limiter = AsyncRateLimiter(2, 1, burst=30)
+        await limiter.update({"x-ratelimit-limit-per-second": "4", "x-ratelimit-limit-burst": "10",
+                              "retry-after": "0.05"})
+        self.assertEqual(limiter.rate_limit, 4)
+        self.assertEqual(limiter.burst, 10)
+        start = time.monotonic()
+        await limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
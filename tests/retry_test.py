@@ -0,0 +1,85 @@
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock
+
+from aiohttp import ClientConnectorError, ServerDisconnectedError
+
+from spacetradercore.errors import SpaceTradersError
+from spacetradercore.retry import RetryBudget, RetryPolicy
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from tests.fakes import FakeResponse, FakeSession
+
+SERVER_ERROR = {"error": {"code": 503, "message": "unavailable"}}
+
+
+def refused() -> ClientConnectorError:
+    return ClientConnectorError(MagicMock(), OSError(111, "Connection refused"))
+
+
+class TestRetries(IsolatedAsyncioTestCase):
+
+    def core(self, responses: list, budget: RetryBudget | None = None) -> SpaceMerchantCore:
+        core = SpaceMerchantCore(key="token", pool=SessionPool(retry_budget=budget))
+        core._headers = {**core._headers, "Authorization": "Bearer token"}
+        core.session = FakeSession(responses)
+        core.retry_policies = {
+            "GET": RetryPolicy(max_attempts=3, base_delay=0.001),
+            "POST": RetryPolicy(max_attempts=3, base_delay=0.001, idempotent=False),
+        }
+        return core
+
+    async def test_get_retries_server_errors_and_transport_errors(self):
+        core = self.core([FakeResponse(SERVER_ERROR, status=503), ServerDisconnectedError(),
+                          FakeResponse({"data": {"symbol": "X1-A1"}})])
+        response = await core.get_system("X1-A1")
+        self.assertEqual(response, {"data": {"symbol": "X1-A1"}})
+        self.assertEqual(len(core.session.requests), 3)
+
+    async def test_get_raises_once_attempts_run_out(self):
+        core = self.core([FakeResponse(SERVER_ERROR, status=503)] * 3)
+        with self.assertRaises(SpaceTradersError) as raised:
+            await core.get_system("X1-A1")
+        self.assertEqual(raised.exception.status, 503)
+        self.assertEqual(len(core.session.requests), 3)
+
+    async def test_post_is_not_repeated_after_it_may_have_been_sent(self):
+        core = self.core([FakeResponse(SERVER_ERROR, status=503)])
+        with self.assertRaises(SpaceTradersError):
+            await core.orbit_ship("SHIP-1")
+        core = self.core([ServerDisconnectedError()])
+        with self.assertRaises(ServerDisconnectedError):
+            await core.orbit_ship("SHIP-1")
+
+    async def test_post_retries_when_the_connection_was_never_made(self):
+        core = self.core([refused(), FakeResponse({"data": {"nav": {}}})])
+        self.assertEqual(await core.orbit_ship("SHIP-1"), {"data": {"nav": {}}})
+
+    async def test_endpoint_policy_overrides_method_policy(self):
+        core = self.core([refused(), FakeResponse({"data": {}})])
+        core.set_retry_policy("POST", r"my/ships/[^/]+/orbit", RetryPolicy(max_attempts=1))
+        with self.assertRaises(ClientConnectorError):
+            await core.orbit_ship("SHIP-1")
+
+    async def test_exhausted_budget_stops_retries(self):
+        core = self.core([FakeResponse(SERVER_ERROR, status=503)], budget=RetryBudget(ratio=0, reserve=0))
+        with self.assertRaises(SpaceTradersError):
+            await core.get_system("X1-A1")
+        self.assertEqual(core.pool.retry_budget.denied, 1)
+
+
+class TestRetryPolicy(TestCase):
+
+    def test_backoff_is_jittered_below_the_ceiling(self):
+        policy = RetryPolicy(base_delay=1, max_delay=3)
+        for attempt, ceiling in [(1, 1), (2, 2), (3, 3), (6, 3)]:
+            for _ in range(20):
+                self.assertLessEqual(policy.backoff(attempt), ceiling)
+
+    def test_budget_refills_with_requests(self):
+        budget = RetryBudget(ratio=0.5, reserve=0, max_tokens=1)
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+import numpy as np
+
+from spacemerchants.models.route import RoutePlanner, fuel_cost, travel_time
+
+
+class TestRoutePlanner(TestCase):
+
+    def planner(self, **kwargs) -> RoutePlanner:
+        # a line of waypoints, A and C sell fuel
+        symbols = ["X1-A-A", "X1-A-B", "X1-A-C", "X1-A-D"]
+        x = np.array([0.0, 100.0, 150.0, 300.0])
+        return RoutePlanner(symbols, x, np.zeros(4), fuel_stations=["X1-A-A", "X1-A-C"], **kwargs)
+
+    def test_formulas(self):
+        self.assertEqual(travel_time(100, "CRUISE", 30), 98)
+        self.assertEqual(travel_time(100, "BURN", 30), 57)
+        self.assertEqual(travel_time(0, "DRIFT", 10), 40)
+        self.assertEqual([fuel_cost(100.4, mode) for mode in ("CRUISE", "STEALTH", "BURN", "DRIFT")],
+                         [100, 100, 200, 1])
+        self.assertEqual(fuel_cost(0, "BURN"), 0)
+
+    def test_burns_when_fuel_allows_and_refuels_on_the_way(self):
+        planner = self.planner()
+        direct = planner.plan("X1-A-A", "X1-A-D", speed=30, fuel=600, capacity=600)
+        self.assertEqual([(leg.destination, leg.flight_mode) for leg in direct.legs], [("X1-A-D", "BURN")])
+
+        # 300 units with a 200 tank: cruise to the station at C, refuel, cruise on
+        route = planner.plan("X1-A-A", "X1-A-D", speed=30, fuel=200, capacity=200)
+        self.assertEqual([(leg.destination, leg.flight_mode) for leg in route.legs],
+                         [("X1-A-C", "CRUISE"), ("X1-A-D", "CRUISE")])
+        self.assertEqual(route.stops, ["X1-A-C"])
+        self.assertEqual(route.fuel, 300)
+        self.assertEqual(route.seconds, sum(leg.seconds for leg in route.legs) + 5.0)
+
+    def test_drifts_rather_than_strands_and_gives_up_without_fuel(self):
+        planner = self.planner()
+        route = planner.plan("X1-A-B", "X1-A-D", speed=30, fuel=10, capacity=200)
+        # drifting the short way to the station beats drifting all the way
+        self.assertEqual([(leg.destination, leg.flight_mode) for leg in route.legs],
+                         [("X1-A-C", "DRIFT"), ("X1-A-D", "CRUISE")])
+        self.assertIsNone(planner.plan("X1-A-B", "X1-A-D", speed=30, fuel=0, capacity=200))
+        self.assertEqual(planner.plan("X1-A-B", "X1-A-D", speed=30, fuel=0, capacity=0).legs[0].flight_mode, "BURN")
+
+    def test_refuels_at_a_station_origin_before_leaving(self):
+        planner = self.planner()
+        for fuel in (0, 1):
+            route = planner.plan("X1-A-A", "X1-A-C", speed=30, fuel=fuel, capacity=200)
+            self.assertTrue(route.refuel_first)
+            self.assertEqual([(leg.destination, leg.flight_mode) for leg in route.legs], [("X1-A-C", "CRUISE")])
+            self.assertEqual(route.stops, ["X1-A-A"])
+            self.assertEqual(route.seconds, route.legs[0].seconds + 5.0)
+        # with enough fuel the ship leaves without stopping
+        self.assertFalse(planner.plan("X1-A-A", "X1-A-C", speed=30, fuel=200, capacity=200).refuel_first)
+
+    def test_routes_across_a_system_stay_within_the_tank(self):
+        generator = np.random.default_rng(3)
+        symbols = [f"X1-A-{index}" for index in range(100)]
+        planner = RoutePlanner(symbols, generator.uniform(-400, 400, 100), generator.uniform(-400, 400, 100),
+                               fuel_stations=symbols[::5])
+        route = planner.plan(symbols[1], symbols[99], speed=30, fuel=100, capacity=400)
+        self.assertEqual(route.legs[0].origin, symbols[1])
+        self.assertEqual(route.legs[-1].destination, symbols[99])
+        self.assertLessEqual(route.legs[0].fuel, 100)
+        self.assertTrue(all(leg.fuel <= 400 for leg in route.legs))
+        self.assertTrue(set(route.stops) <= set(symbols[::5]))
@@ -0,0 +1,54 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from spacetradercore.rate_limit import AsyncRateLimiter
+from spacetradercore.scheduler import Priority, RequestScheduler
+
+
+class TestRequestScheduler(IsolatedAsyncioTestCase):
+
+    async def run_requests(self, scheduler: RequestScheduler, lanes: list[Priority]) -> list[str]:
+        served = []
+
+        async def request(name: str, lane: Priority):
+            async with scheduler.throttle(lane):
+                served.append(name)
+
+        await asyncio.gather(*(request(f"{lane.name}-{i}", lane) for i, lane in enumerate(lanes)))
+        return served
+
+    async def test_lanes_are_served_by_weight(self):
+        scheduler = RequestScheduler(
+            AsyncRateLimiter(1000, 1), weights={Priority.CRITICAL: 2, Priority.BACKGROUND: 1}
+        )
+        lanes = [Priority.BACKGROUND] * 3 + [Priority.CRITICAL] * 3
+        served = await self.run_requests(scheduler, lanes)
+        self.assertEqual([name.split("-")[0] for name in served],
+                         ["CRITICAL", "CRITICAL", "BACKGROUND", "CRITICAL", "BACKGROUND", "BACKGROUND"])
+
+    async def test_waiters_past_max_wait_are_served_first(self):
+        scheduler = RequestScheduler(AsyncRateLimiter(1000, 1), max_wait=0)
+        lanes = [Priority.BACKGROUND, Priority.NORMAL, Priority.CRITICAL]
+        served = await self.run_requests(scheduler, lanes)
+        self.assertEqual(served, ["BACKGROUND-0", "NORMAL-1", "CRITICAL-2"])
+
+    async def test_cancelled_waiter_gives_up_its_place(self):
+        limiter = AsyncRateLimiter(1000, 1)
+        scheduler = RequestScheduler(limiter)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.throttle(Priority.CRITICAL):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(self.run_requests(scheduler, [Priority.NORMAL]))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        release.set()
+        await holder
+        served = await self.run_requests(scheduler, [Priority.BACKGROUND])
+        self.assertEqual(served, ["BACKGROUND-0"])
+        self.assertFalse(limiter.semaphore.locked())
+        self.assertEqual(sum(scheduler.queued().values()), 0)
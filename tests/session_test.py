@@ -0,0 +1,27 @@
+from unittest import IsolatedAsyncioTestCase
+
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+
+
+class TestSessionPool(IsolatedAsyncioTestCase):
+
+    async def test_cores_share_session_and_rate_budget(self):
+        pool = SessionPool(pool_size=5, keepalive_timeout=15)
+        async with SpaceMerchantCore(key="first", pool=pool) as first:
+            async with SpaceMerchantCore(key="second", pool=pool) as second:
+                self.assertIs(first.session, second.session)
+                self.assertIs(first.rate_limiter, second.rate_limiter)
+                self.assertIs(first.scheduler, second.scheduler)
+                self.assertEqual(first.session.connector.limit, 5)
+                self.assertNotEqual(first._headers["Authorization"], second._headers["Authorization"])
+            self.assertFalse(first.session.closed)
+        self.assertTrue(first.session.closed)
+
+    async def test_session_reopens_after_last_user_leaves(self):
+        pool = SessionPool()
+        async with SpaceMerchantCore(pool=pool) as core:
+            closed_session = core.session
+        async with SpaceMerchantCore(pool=pool) as core:
+            self.assertIsNot(core.session, closed_session)
+            self.assertFalse(core.session.closed)
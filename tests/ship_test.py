@@ -0,0 +1,103 @@
+from unittest import IsolatedAsyncioTestCase
+
+from spacemerchants.models.agent import Agent
+from spacemerchants.models.ship import Ship
+from spacetradercore.errors import SpaceTradersError
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from tests.fakes import FakeResponse, FakeSession
+
+PART = {"symbol": "PART", "name": "Part", "description": "", "condition": 100, "requirements": {}}
+
+
+def nav(status: str, waypoint: str = "X1-A-1") -> dict:
+    return {"systemSymbol": "X1-A", "waypointSymbol": waypoint, "status": status, "flightMode": "CRUISE",
+            "route": {"origin": {"symbol": "X1-A-1"}, "destination": {"symbol": waypoint},
+                      "departureTime": "2024-01-28T18:00:00+00:00", "arrival": "2024-01-28T18:01:00+00:00"}}
+
+
+def cargo(*items: tuple[str, int]) -> dict:
+    inventory = [{"symbol": symbol, "name": symbol.title(), "description": "", "units": units}
+                 for symbol, units in items]
+    return {"capacity": 40, "units": sum(units for _, units in items), "inventory": inventory}
+
+
+def ship(symbol: str, status: str = "DOCKED") -> dict:
+    return {
+        "symbol": symbol, "registration": {"name": symbol, "factionSymbol": "COSMIC", "role": "HAULER"},
+        "nav": nav(status), "crew": {"capacity": 0, "current": 0, "morale": 100, "required": 0, "rotation": "STRICT",
+                                     "wages": 0},
+        "engine": {**PART, "speed": 30}, "reactor": {**PART, "powerOutput": 30},
+        "frame": {**PART, "fuelCapacity": 400, "moduleSlots": 3, "mountingPoints": 2},
+        "fuel": {"capacity": 400, "current": 100, "consumed": {}}, "modules": [], "mounts": [],
+        "cargo": cargo(("IRON_ORE", 10)),
+    }
+
+
+AGENT = {"accountId": "1", "symbol": "AGENT", "headquarters": "X1-A-1", "credits": 1000,
+         "startingFaction": "COSMIC", "shipCount": 2}
+
+
+class TestShipActions(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.requester = SpaceMerchantCore(key="token", pool=SessionPool())
+        self.requester._headers = {**self.requester._headers, "Authorization": "Bearer token"}
+
+    def respond(self, *bodies: dict):
+        self.requester.session = FakeSession([FakeResponse(body) for body in bodies])
+
+    async def test_sell_updates_cargo_and_live_agent(self):
+        agent = await Agent.from_dict(self.requester, AGENT)
+        hauler = Ship.from_dict(self.requester, ship("AGENT-1"))
+        self.respond({"data": {"agent": {**AGENT, "credits": 1500}, "cargo": cargo(("IRON_ORE", 4)),
+                               "transaction": {"units": 6, "totalPrice": 500}}})
+
+        transaction = (await hauler.sell("IRON_ORE", 6))["transaction"]
+        self.assertEqual(transaction["totalPrice"], 500)
+        self.assertEqual(hauler.cargo.units_of("IRON_ORE"), 4)
+        self.assertEqual(agent.credits, 1500)
+        self.assertEqual(self.requester.session.requests[0][1][-len("my/ships/AGENT-1/sell"):],
+                         "my/ships/AGENT-1/sell")
+
+    async def test_navigate_reads_nav_and_fuel_from_response_data(self):
+        hauler = Ship.from_dict(self.requester, ship("AGENT-1", status="IN_ORBIT"))
+        self.respond({"data": {"nav": nav("IN_TRANSIT", "X1-A-2"),
+                               "fuel": {"capacity": 400, "current": 80, "consumed": {}}}})
+        navigation = await hauler.navigate("X1-A-2")
+        self.assertEqual(navigation.status, "IN_TRANSIT")
+        self.assertEqual(navigation.arrival_location, "X1-A-2")
+        self.assertEqual(hauler.fuel.current, 80)
+
+    async def test_transfer_updates_the_live_receiver(self):
+        sender = Ship.from_dict(self.requester, ship("AGENT-1"))
+        receiver = Ship.from_dict(self.requester, ship("AGENT-2"))
+        self.respond({"data": {"cargo": cargo(("IRON_ORE", 7))}})
+        await sender.transfer("IRON_ORE", 3, "AGENT-2")
+        self.assertEqual(sender.cargo.units_of("IRON_ORE"), 7)
+        self.assertEqual(receiver.cargo.units_of("IRON_ORE"), 13)
+        self.assertEqual(receiver.cargo.units, 13)
+
+    async def test_refused_action_raises_and_keeps_state(self):
+        hauler = Ship.from_dict(self.requester, ship("AGENT-1"))
+        self.respond({"error": {"code": 4214, "message": "ship is docked"}})
+        with self.assertRaises(SpaceTradersError):
+            await hauler.jettison("IRON_ORE", 1)
+        self.assertEqual(hauler.cargo.units_of("IRON_ORE"), 10)
+
+
+class TestFleetRefresh(IsolatedAsyncioTestCase):
+
+    async def test_ship_pages_decode_into_lazy_ships(self):
+        requester = SpaceMerchantCore(key="token", pool=SessionPool())
+        requester._headers = {**requester._headers, "Authorization": "Bearer token"}
+        requester.session = FakeSession([FakeResponse({"data": [ship("AGENT-1"), ship("AGENT-2", "IN_TRANSIT")],
+                                                       "meta": {"total": 2, "page": 1, "limit": 20}})])
+        hauler, probe = await Agent(requester).get_ships(lazy=True)
+        self.assertIs(Ship.from_dict(requester, ship("AGENT-1")), hauler)
+        self.assertEqual((probe.name, probe.role, probe.navigation.status), ("AGENT-2", "HAULER", "IN_TRANSIT"))
+        # timestamps stay text until they are read
+        self.assertFalse(hasattr(probe.navigation, "_arrival_time"))
+        self.assertEqual(probe.navigation.arrival_time.minute, 1)
+        self.assertEqual(probe.engine.speed, 30)
+        self.assertIsNone(probe.cooldown.expiration)
@@ -0,0 +1,153 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from spacetradercore.decoding import PageMeta, Record
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from tests.fakes import FakeResponse, FakeSession
+
+
+class Item(Record):
+    symbol: str
+
+
+class ItemPage(Record):
+    data: list[Item]
+    meta: PageMeta
+
+
+class TestSpaceMerchantCore(IsolatedAsyncioTestCase):
+
+    def core(self, responses: list[FakeResponse]) -> SpaceMerchantCore:
+        core = SpaceMerchantCore(key="token", pool=SessionPool())
+        core._headers = {**core._headers, "Authorization": "Bearer token"}
+        core.session = FakeSession(responses)
+        return core
+
+    async def test_rate_limit_headers_reach_limiter(self):
+        core = self.core([
+            FakeResponse({"data": {}}, headers={"x-ratelimit-limit-per-second": "3", "x-ratelimit-remaining": "7"}),
+        ])
+        await core.get_agent()
+        self.assertEqual(core.rate_limiter.rate_limit, 3)
+        self.assertLessEqual(core.rate_limiter._burst_tokens, 7)
+
+    async def test_rate_limited_request_is_sent_again(self):
+        limited = {"error": {"code": 429, "message": "rate limited", "data": {"retryAfter": 0.01}}}
+        core = self.core([
+            FakeResponse(limited, status=429, headers={"retry-after": "0.01"}),
+            FakeResponse({"data": {"symbol": "AGENT"}}),
+        ])
+        response = await core.get_agent()
+        self.assertEqual(response, {"data": {"symbol": "AGENT"}})
+        self.assertEqual(len(core.session.requests), 2)
+
+    async def test_post_goes_through_limiter(self):
+        core = self.core([FakeResponse({"data": {}}, headers={"retry-after": "0.05"})])
+        await core.orbit_ship("SHIP-1")
+        self.assertGreater(core.rate_limiter._paused_until, 0)
+
+    async def test_paginate_merges_pages_in_order(self):
+        core = SpaceMerchantCore(key="token")
+        pages_requested = []
+
+        async def list_items(limit: int = 20, page: int = 1) -> dict:
+            pages_requested.append(page)
+            # later pages answer first, the merge must still follow page order
+            await asyncio.sleep(0.01 * (4 - page))
+            start = (page - 1) * limit
+            return {"data": list(range(start, min(start + limit, 45))), "meta": {"total": 45, "page": page}}
+
+        items = await core.paginate(list_items)
+        self.assertEqual(items, list(range(45)))
+        self.assertEqual(sorted(pages_requested), [1, 2, 3])
+
+    async def test_paginate_requests_largest_pages(self):
+        core = self.core([
+            FakeResponse({"data": [{"symbol": "A"}], "meta": {"total": 21, "page": 1, "limit": 20}}),
+            FakeResponse({"data": [{"symbol": "B"}], "meta": {"total": 21, "page": 2, "limit": 20}}),
+        ])
+        items = await core.paginate(core.list_ships)
+        self.assertEqual(items, [{"symbol": "A"}, {"symbol": "B"}])
+        self.assertEqual([kwargs["params"] for _, _, kwargs in core.session.requests],
+                         [{"limit": 20, "page": 1}, {"limit": 20, "page": 2}])
+
+    async def test_typed_pages_are_decoded_into_records(self):
+        error = {"error": {"code": 4000, "message": "cooldown"}}
+        core = self.core([
+            FakeResponse({"data": [{"symbol": "A"}], "meta": {"total": 21, "page": 1, "limit": 20}}),
+            FakeResponse({"data": [{"symbol": "B"}], "meta": {"total": 21, "page": 2, "limit": 20}}),
+            FakeResponse(error, status=409),
+        ])
+        items = await core.paginate(core.list_ships, model=ItemPage)
+        self.assertEqual(items, [Item(symbol="A"), Item(symbol="B")])
+        # errors are never typed
+        self.assertEqual(await core.list_ships(model=ItemPage), error)
+
+    async def test_iter_pages_prefetches_next_page(self):
+        core = SpaceMerchantCore(key="token")
+        pages_requested = []
+
+        async def list_items(limit: int = 20, page: int = 1) -> dict:
+            pages_requested.append(page)
+            start = (page - 1) * limit
+            return {"data": list(range(start, min(start + limit, 25))), "meta": {"total": 25, "page": page}}
+
+        stream = core.iter_pages(list_items, limit=10)
+        self.assertEqual(await anext(stream), 0)
+        await asyncio.sleep(0)
+        self.assertEqual(pages_requested, [1, 2])
+        self.assertEqual([item async for item in stream], list(range(1, 25)))
+        self.assertEqual(pages_requested, [1, 2, 3])
+
+    async def test_identical_gets_share_one_request(self):
+        core = self.core([FakeResponse({"data": {"symbol": "X1-A1-B2"}}), FakeResponse({"data": {"symbol": "B3"}})])
+        first, second, other = await asyncio.gather(
+            core.get_market("X1-A1", "X1-A1-B2"),
+            core.get_market("X1-A1", "X1-A1-B2"),
+            core.get_market("X1-A1", "X1-A1-B3"),
+        )
+        self.assertIs(first, second)
+        self.assertEqual(other, {"data": {"symbol": "B3"}})
+        self.assertEqual(len(core.session.requests), 2)
+        self.assertEqual(core.single_flight.saved, 1)
+        self.assertEqual(core.single_flight.in_flight(), 0)
+
+    async def test_static_and_short_lived_responses_are_cached(self):
+        core = self.core([
+            FakeResponse({"data": {"symbol": "X1-A1"}}),
+            FakeResponse({"data": {"symbol": "X1-A1-B2"}}),
+            FakeResponse({"data": {"symbol": "X1-A1-B2"}}),
+            FakeResponse({"data": {}}),
+            FakeResponse({"data": {}}),
+        ])
+        core.cache.short_ttl = 0.01
+        await core.get_system("X1-A1")
+        await core.get_system("X1-A1")
+        await core.get_market("X1-A1", "X1-A1-B2")
+        await asyncio.sleep(0.02)
+        await core.get_market("X1-A1", "X1-A1-B2")
+        await core.get_agent()
+        await core.get_agent()
+        self.assertEqual(len(core.session.requests), 5)
+        self.assertEqual(core.cache.hits, 1)
+
+    async def test_new_reset_date_drops_static_responses(self):
+        core = self.core([
+            FakeResponse({"resetDate": "2024-01-28"}),
+            FakeResponse({"data": {"symbol": "X1-A1"}}),
+            FakeResponse({"resetDate": "2024-02-11"}),
+            FakeResponse({"data": {"symbol": "X1-A1"}}),
+        ])
+        await core.status()
+        await core.get_system("X1-A1")
+        await core.status()
+        await core.get_system("X1-A1")
+        self.assertEqual(len(core.session.requests), 4)
+
+    async def test_responses_go_through_the_core_decoder(self):
+        core = self.core([FakeResponse({"data": {"symbol": "AGENT"}})])
+        decoded = []
+        core.decoder = lambda raw: decoded.append(raw) or {"data": {}}
+        await core.get_agent()
+        self.assertEqual(decoded, [b'{"data": {"symbol": "AGENT"}}'])
@@ -0,0 +1,86 @@
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from spacemerchants.models.system import System
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from spacetradercore.store import WAYPOINT, UniverseStore
+from tests.fakes import FakeResponse, FakeSession
+
+SYSTEM = {"symbol": "X1-A1", "sectorSymbol": "X1", "type": "RED_STAR", "x": 3, "y": -4, "waypoints": [],
+          "factions": []}
+WAYPOINTS = [
+    {"symbol": "X1-A1-B2", "type": "PLANET", "systemSymbol": "X1-A1", "x": 1, "y": 1, "orbitals": []},
+    {"symbol": "X1-A1-C3", "type": "MOON", "systemSymbol": "X1-A1", "x": 1, "y": 1, "orbitals": []},
+]
+
+
+class TestUniverseStore(TestCase):
+
+    def test_unbound_store_keeps_nothing(self):
+        store = UniverseStore(":memory:")
+        store.put_system(SYSTEM)
+        store.bind("2024-01-28")
+        self.assertIsNone(store.get_system("X1-A1"))
+
+    def test_entries_survive_reopening_until_the_server_resets(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "universe.db")
+            store = UniverseStore(path)
+            store.bind("2024-01-28")
+            store.put_system(SYSTEM)
+            store.put_waypoints("X1-A1", WAYPOINTS)
+            store.close()
+
+            store = UniverseStore(path)
+            store.bind("2024-01-28")
+            self.assertEqual(store.get_system("X1-A1"), SYSTEM)
+            self.assertEqual(store.get_waypoints("X1-A1"), WAYPOINTS)
+            store.bind("2024-02-11")
+            self.assertIsNone(store.get_system("X1-A1"))
+            self.assertIsNone(store.get_waypoints("X1-A1"))
+            store.close()
+
+    def test_partial_listing_is_not_served(self):
+        store = UniverseStore(":memory:")
+        store.bind("2024-01-28")
+        store.put(WAYPOINT, "X1-A1-B2", WAYPOINTS[0], parent="X1-A1")
+        self.assertIsNone(store.get_waypoints("X1-A1"))
+
+
+class TestStoreBackedModels(IsolatedAsyncioTestCase):
+
+    async def test_system_is_read_from_the_store_before_the_network(self):
+        store = UniverseStore(":memory:")
+        core = SpaceMerchantCore(key="token", pool=SessionPool(), store=store)
+        core.session = FakeSession([
+            FakeResponse({"resetDate": "2024-01-28"}),
+            FakeResponse({"data": SYSTEM}),
+            FakeResponse({"data": WAYPOINTS, "meta": {"total": 2}}),
+        ])
+        await core.status()
+        system = await System.get(core, "X1-A1")
+        await system.waypoints(force=True)
+
+        core.pool.response_cache.invalidate()
+        system = await System.get(core, "X1-A1")
+        waypoints = await system.waypoints()
+        self.assertEqual([waypoint.symbol for waypoint in waypoints], ["X1-A1-B2", "X1-A1-C3"])
+        self.assertEqual(len(core.session.requests), 3)
+
+    async def test_jumpgate_is_read_from_the_store_before_the_network(self):
+        store = UniverseStore(":memory:")
+        core = SpaceMerchantCore(key="token", pool=SessionPool(), store=store)
+        gate = {"symbol": "X1-A1-B2", "connections": ["X1-C3-D4"]}
+        core.session = FakeSession([
+            FakeResponse({"resetDate": "2024-01-28"}),
+            FakeResponse({"data": gate}),
+        ])
+        await core.status()
+        self.assertEqual(await core.get_jumpgate("X1-A1", "X1-A1-B2"), {"data": gate})
+
+        core.pool.response_cache.invalidate()
+        self.assertEqual(store.get_jumpgate("X1-A1-B2"), gate)
+        self.assertEqual(await core.get_jumpgate("X1-A1", "X1-A1-B2"), {"data": gate})
+        self.assertEqual(len(core.session.requests), 2)
@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from spacetradercore.symbols import NO_PARENT, SECTOR, SYSTEM, WAYPOINT, SymbolTable, parse_symbol, system_symbol
+
+
+class TestSymbols(TestCase):
+
+    def test_parse_symbol(self):
+        self.assertEqual(parse_symbol("X1-AB12-C34"), ("X1", "X1-AB12", "X1-AB12-C34"))
+        self.assertEqual(parse_symbol("X1-AB12"), ("X1", "X1-AB12", ""))
+        self.assertEqual(system_symbol("X1-AB12-C34D"), "X1-AB12")
+        with self.assertRaises(ValueError):
+            parse_symbol("X1-AB12-C34-D")
+
+    def test_ids_round_trip_and_share_parents(self):
+        table = SymbolTable()
+        first = table.id("X1-AB12-C34")
+        second = table.id("X1-AB12-D56")
+        self.assertEqual(table.id("X1-AB12-C34"), first)
+        self.assertEqual(table.symbol(second), "X1-AB12-D56")
+        self.assertEqual(table.system_of(first), table.system_of(second))
+        self.assertEqual(table.symbol(table.system_of(first)), "X1-AB12")
+        self.assertEqual(table.symbol(table.sector_of(first)), "X1")
+        self.assertEqual([table.level(table.id(symbol)) for symbol in ("X1", "X1-AB12", "X1-AB12-C34")],
+                         [SECTOR, SYSTEM, WAYPOINT])
+        self.assertEqual(table.system_of(table.get("X1")), NO_PARENT)
+        self.assertEqual(len(table), 4)
+        self.assertIsNone(table.get("X2"))
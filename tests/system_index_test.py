@@ -0,0 +1,39 @@
+import math
+import random
+from unittest import TestCase
+
+from spacemerchants.models.system_index import SystemIndex
+
+
+class TestSystemIndex(TestCase):
+
+    def setUp(self):
+        generator = random.Random(7)
+        self.points = {f"X1-{index}": (generator.uniform(-5000, 5000), generator.uniform(-5000, 5000))
+                       for index in range(2000)}
+        self.index = SystemIndex(cell_size=400)
+        for symbol, (x, y) in self.points.items():
+            self.index.add(symbol, x, y)
+
+    def brute_force(self, x: float, y: float) -> list[tuple[str, float]]:
+        return sorted(((symbol, math.hypot(px - x, py - y)) for symbol, (px, py) in self.points.items()),
+                      key=lambda item: item[1])
+
+    def test_nearest_and_within_match_brute_force(self):
+        for x, y in [(0, 0), (4990, -4990), (12000, 300)]:
+            expected = self.brute_force(x, y)
+            self.assertEqual([symbol for symbol, _ in self.index.nearest(x, y, k=7)],
+                             [symbol for symbol, _ in expected[:7]])
+            self.assertEqual([symbol for symbol, _ in self.index.within(x, y, 900)],
+                             [symbol for symbol, distance in expected if distance <= 900])
+
+    def test_box_and_incremental_updates(self):
+        inside = sorted(symbol for symbol, (x, y) in self.points.items() if -300 <= x <= 700 and 0 <= y <= 250)
+        self.assertEqual(sorted(self.index.box(-300, 0, 700, 250)), inside)
+
+        self.index.add("X1-0", 10001, 10001)
+        self.index.add_payload({"symbol": "X1-NEW", "x": 10000, "y": 10000})
+        self.assertEqual(len(self.index), 2001)
+        self.assertEqual([symbol for symbol, _ in self.index.nearest(10000, 10000, k=2)], ["X1-NEW", "X1-0"])
+        self.index.remove("X1-NEW")
+        self.assertNotIn("X1-NEW", self.index)
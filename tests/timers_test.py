@@ -0,0 +1,92 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from spacemerchants.models.ship import Ship
+from spacetradercore.clock import ServerClock
+from spacetradercore.session import SessionPool
+from spacetradercore.spacemerchantcore import SpaceMerchantCore
+from spacetradercore.timers import TimerService
+from tests.fakes import FakeResponse, FakeSession
+from tests.ship_test import ship
+
+
+class TestServerClock(TestCase):
+
+    def test_offset_is_the_tightest_sample(self):
+        clock = ServerClock()
+        server = datetime(2024, 1, 28, 18, 0, 10, tzinfo=timezone.utc)
+        received = datetime(2024, 1, 28, 18, 0, 0, tzinfo=timezone.utc).timestamp()
+        clock.observe(format_datetime(server, usegmt=True), received)
+        clock.observe(format_datetime(server, usegmt=True), received + 0.3)  # a slower response
+        clock.observe("not a date", received)
+        clock.observe(None)
+        self.assertAlmostEqual(clock.offset, 10)
+        self.assertAlmostEqual(clock.delay(datetime.now(timezone.utc) + timedelta(seconds=20)), 10, places=1)
+        self.assertEqual(clock.delay(datetime.now(timezone.utc)), 0)
+
+    def test_no_skew_gives_no_offset(self):
+        clock = ServerClock()
+        for delay in (0.0, 0.05, 0.2):
+            received = datetime(2024, 1, 28, 18, 0, 0, tzinfo=timezone.utc).timestamp() + delay
+            clock.observe(format_datetime(datetime(2024, 1, 28, 18, 0, 0, tzinfo=timezone.utc), usegmt=True),
+                          received)
+        self.assertEqual(clock.offset, 0)
+
+
+class TestTimerService(IsolatedAsyncioTestCase):
+
+    async def test_waiters_wake_in_deadline_order(self):
+        timers = TimerService(ServerClock(), margin=0)
+        now = datetime.now(timezone.utc)
+        woken = []
+
+        async def wait(name: str, seconds: float):
+            await timers.sleep_until(now + timedelta(seconds=seconds), key=name)
+            woken.append(name)
+
+        tasks = [asyncio.create_task(wait("late", 0.06)), asyncio.create_task(wait("cancelled", 0.04))]
+        await asyncio.sleep(0)
+        # an earlier timer registered while the driver sleeps
+        tasks.append(asyncio.create_task(wait("early", 0.02)))
+        await asyncio.sleep(0)
+        self.assertEqual(len(timers), 3)
+        self.assertEqual(timers.next_wake("late"), now + timedelta(seconds=0.06))
+        self.assertEqual(timers.cancel("cancelled"), 1)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.assertEqual(woken, ["early", "late"])
+        self.assertEqual(len(timers), 0)
+
+    async def test_skew_moves_the_wake_up(self):
+        clock = ServerClock()
+        clock.offset = 0.05  # the server is ahead, its deadline comes sooner
+        timers = TimerService(clock, margin=0)
+        start = time.monotonic()
+        await timers.sleep_until(datetime.now(timezone.utc) + timedelta(seconds=0.08))
+        self.assertLess(time.monotonic() - start, 0.06)
+        await timers.close()
+
+    async def test_timers_fire_late_not_early(self):
+        timers = TimerService(ServerClock(), margin=0.05)
+        deadline = datetime.now(timezone.utc) + timedelta(seconds=0.02)
+        await timers.sleep_until(deadline)
+        self.assertGreaterEqual(datetime.now(timezone.utc), deadline + timedelta(seconds=0.05))
+
+
+class TestShipTimers(IsolatedAsyncioTestCase):
+
+    async def test_arrival_without_polling(self):
+        requester = SpaceMerchantCore(key="token", pool=SessionPool())
+        server = datetime.now(timezone.utc) + timedelta(seconds=3600)
+        requester.session = FakeSession([FakeResponse({"data": {}}, headers={"Date": format_datetime(server, True)})])
+        await requester._get("my/agent")
+        # the server runs an hour ahead, so an arrival an hour from now locally is due already
+        self.assertGreater(requester.clock.offset, 3599)
+
+        hauler = Ship.from_dict(requester, ship("AGENT-1", "IN_TRANSIT"))
+        hauler.navigation.arrival_time = datetime.now(timezone.utc) + timedelta(seconds=3599)
+        navigation = await asyncio.wait_for(hauler.wait_for_arrival(), 1)
+        self.assertEqual(navigation.status, "IN_ORBIT")
+        self.assertEqual(len(requester.session.requests), 1)
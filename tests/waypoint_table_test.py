@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+import numpy as np
+
+from spacemerchants.models.waypoint import Waypoint
+from spacemerchants.models.waypoint_table import WaypointTable
+
+
+def waypoint(symbol: str, type: str, x: int, y: int, *traits: str) -> dict:
+    return {"symbol": symbol, "systemSymbol": symbol.rsplit("-", 1)[0], "type": type, "x": x, "y": y,
+            "traits": [{"symbol": trait} for trait in traits]}
+
+
+class TestWaypointTable(TestCase):
+
+    def setUp(self):
+        # enough filler traits to spill into a second bitmask word
+        filler = [f"TRAIT_{index}" for index in range(70)]
+        self.table = WaypointTable([
+            waypoint("X1-A-1", "PLANET", 0, 0, "MARKETPLACE", *filler),
+            waypoint("X1-A-2", "ASTEROID", 30, 40, "COMMON_METAL_DEPOSITS"),
+            waypoint("X1-A-3", "ASTEROID", 100, 0, "COMMON_METAL_DEPOSITS", "MARKETPLACE"),
+            waypoint("X1-A-4", "MOON", -6, 8, "MARKETPLACE", "SHIPYARD"),
+            waypoint("X1-B-1", "ASTEROID", 1, 1, "MARKETPLACE"),
+        ])
+
+    def test_filter_by_type_traits_and_system(self):
+        self.assertEqual(self.table.trait_bits.shape[1], 2)
+        self.assertEqual(self.table.select(type="ASTEROID", system="X1-A"), ["X1-A-2", "X1-A-3"])
+        self.assertEqual(self.table.select(traits=["MARKETPLACE", "SHIPYARD"]), ["X1-A-4"])
+        self.assertEqual(self.table.select(traits=["TRAIT_69"]), ["X1-A-1"])
+        self.assertEqual(self.table.select(any_traits=["SHIPYARD", "COMMON_METAL_DEPOSITS"]),
+                         ["X1-A-2", "X1-A-3", "X1-A-4"])
+        self.assertFalse(self.table.filter(traits=["UNKNOWN"]).any())
+
+    def test_within_and_nearest(self):
+        self.assertEqual(self.table.within(0, 0, 80, type="ASTEROID", system="X1-A"), [("X1-A-2", 50.0)])
+        self.assertEqual(self.table.nearest(0, 0, k=2, traits=["MARKETPLACE"], system="X1-A"),
+                         [("X1-A-1", 0.0), ("X1-A-4", 10.0)])
+        self.assertEqual(self.table.nearest(0, 0, k=1, type="GAS_GIANT"), [])
+
+    def test_from_waypoint_models(self):
+        models = [Waypoint.from_dict(None, {**data, "system": data["systemSymbol"]}) for data in [
+            waypoint("X1-C-1", "PLANET", 3, 4, "SHIPYARD"),
+            waypoint("X1-C-2", "MOON", 0, 0),
+        ]]
+        table = WaypointTable.from_waypoints(models)
+        self.assertEqual(table.select(traits=["SHIPYARD"]), ["X1-C-1"])
+        np.testing.assert_allclose(table.distances(*table.position("X1-C-2")), [5.0, 0.0])